@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Derive an Arrow schema for every table_array of the FormQAR-054 schema.
+
+Each table (Tables 1–11, the Table 7 harm/problem rows, the MDR and legacy
+device tables, ...) becomes one relational dataset. Its schema is emitted
+as JSON so it can ship in the template pack without depending on pyarrow;
+parquet_shred.py turns it into `pyarrow.Schema` objects.
+
+Every dataset starts with the same key columns:
+
+  document          identifier of the source payload (file:line or path)
+  row               position of the row in its table
+  product_family    /form/document_control/product_or_product_family
+  period            data collection period, "<start_date>_<end_date>"
+
+followed by one column per row property. Type specs are small JSON
+objects: {"id": "string" | "int64" | "float64" | "bool"}, enums become
+{"id": "dictionary", "values": [...]} (int8 indices, schema enum order),
+arrays {"id": "list", "item": spec} and nested objects
+{"id": "struct", "fields": [...]}.
+"""
+
+KEY_COLUMNS = [
+    {"name": "document", "type": {"id": "string"}, "nullable": False},
+    {"name": "row", "type": {"id": "int32"}, "nullable": False},
+    {"name": "product_family", "type": {"id": "string"}, "nullable": False},
+    {"name": "period", "type": {"id": "string"}, "nullable": False},
+]
+PARTITION_COLUMNS = ("product_family", "period")
+PRODUCT_FAMILY_POINTER = "/form/document_control/product_or_product_family"
+PERIOD_POINTER = "/psur_cover_page/document_information/data_collection_period"
+
+
+def _types(node):
+    t = node.get("type", "object")
+    return t if isinstance(t, list) else [t]
+
+
+def type_spec(node):
+    """Arrow type spec for a flat schema node."""
+    if "enum" in node and all(isinstance(e, str) for e in node["enum"]):
+        return {"id": "dictionary", "values": list(node["enum"])}
+    if "const" in node and isinstance(node["const"], str):
+        return {"id": "string"}
+    kinds = set(_types(node)) - {"null"}
+    if "properties" in node:
+        return {"id": "struct", "fields": [column(name, child) for name, child in node["properties"].items()]}
+    if kinds == {"array"}:
+        return {"id": "list", "item": type_spec(node.get("items", {}))}
+    if kinds == {"integer"}:
+        return {"id": "int64"}
+    if kinds <= {"integer", "number"} and kinds:
+        return {"id": "float64"}
+    if kinds == {"boolean"}:
+        return {"id": "bool"}
+    return {"id": "string"}
+
+
+def column(name, node):
+    return {"name": name, "type": type_spec(node), "nullable": True}
+
+
+def dataset_name(pointer):
+    """Short, stable dataset name: section letter plus the path below the section."""
+    tokens = pointer.strip("/").split("/")
+    section = tokens[1].split("_", 1)[0]
+    rest = [t for t in tokens[2:] if t != "rows"]
+    return f"{section}_" + "__".join(rest)
+
+
+def _tables(node, pointer, found):
+    if "array" in _types(node) and "properties" in node.get("items", {}):
+        found.append((pointer, node))
+        return
+    for name, child in node.get("properties", {}).items():
+        _tables(child, f"{pointer}/{name}", found)
+
+
+def build_arrow_schemas(flat):
+    """Return {"meta", "keyColumns", "partitioning", "datasets"} for a flat template variant."""
+    found = []
+    for key in flat["sectionOrder"]:
+        _tables(flat["sections"][key], f"/sections/{key}", found)
+
+    datasets = {}
+    for pointer, node in found:
+        name = dataset_name(pointer)
+        if name in datasets:
+            raise ValueError(f"Dataset name collision: {name} ({pointer})")
+        items = node["items"]
+        datasets[name] = {
+            "pointer": pointer,
+            "required": list(items.get("required", [])),
+            "fields": KEY_COLUMNS + [column(n, child) for n, child in items["properties"].items()],
+        }
+
+    meta = {k: flat["meta"][k] for k in ("id", "revision")}
+    return {
+        "meta": {**meta, "source": "template.json"},
+        "keyColumns": [c["name"] for c in KEY_COLUMNS],
+        "partitioning": {
+            "columns": list(PARTITION_COLUMNS),
+            "flavor": "hive",
+            "sources": {"product_family": PRODUCT_FAMILY_POINTER, "period": PERIOD_POINTER},
+        },
+        "datasets": datasets,
+    }
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Build per-client template packs in parallel.
+
+Every clients/<clientId>/client.json may carry a `templateOverrides` block:
+
+    "templateOverrides": {
+      "theme": {"word_form_fidelity": {"fontSizePt": 11}},
+      "typography_lock": {"fontFamily": "Calibri"},
+      "prefill_rows": {"B.associated_documents": ["PMS Plan", "PSUR"]}
+    }
+
+`theme` is deep-merged into the theme block. `typography_lock` is merged into
+layout.typography_lock, and the same font keys in theme.word_form_fidelity
+are set to match so that the lock and the theme agree. `prefill_rows`
+replaces the prefill rows of the named layout tables.
+
+The schema is built once and shared with a process pool that builds one
+client per task. Each client's pack (template.json plus template_pack/, in
+the same layout as the project root) is written to a fresh version
+directory; build/clients/<clientId> is a symlink that is switched to it
+with one atomic rename, so readers always see either the old or the new
+complete pack, never a missing or half-written one. A client whose
+schema, generator and overrides are unchanged since its last build is
+skipped. Client ids must match [A-Za-z0-9_-]+.
+
+Usage:
+    python scripts/build_client_templates.py
+    python scripts/build_client_templates.py --clients clients --out build/clients --workers 8 --force
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+import generate_template_json as gen
+
+CLIENTS_DIR = os.path.join(gen.project_root, "clients")
+OUT_DIR = os.path.join(gen.project_root, "build", "clients")
+KEY_FILE = ".build_key"
+TYPOGRAPHY_KEYS = ("fontFamily", "fontSizePt", "lineHeight")
+CLIENT_ID_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+_schema = None
+
+
+def _deep_merge(base, override):
+    out = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = _deep_merge(out[key], value)
+        else:
+            out[key] = copy.deepcopy(value)
+    return out
+
+
+def apply_client_overrides(template, overrides):
+    """Return a copy of `template` with a client's theme, typography lock and prefill-row overrides applied."""
+    unknown = set(overrides) - {"theme", "typography_lock", "prefill_rows"}
+    if unknown:
+        raise ValueError(f"Unknown template override(s): {', '.join(sorted(unknown))}")
+    theme = _deep_merge(template["theme"], overrides.get("theme", {}))
+    layout = copy.deepcopy(template["layout"])
+
+    lock = overrides.get("typography_lock")
+    if lock:
+        layout["typography_lock"] = {**layout["typography_lock"], **lock}
+        fidelity = theme["word_form_fidelity"]
+        theme["word_form_fidelity"] = {**fidelity, **{k: lock[k] for k in TYPOGRAPHY_KEYS if k in lock}}
+
+    for table_key, rows in overrides.get("prefill_rows", {}).items():
+        if table_key not in layout["tables"]:
+            raise ValueError(f"prefill_rows override for unknown layout table {table_key!r}")
+        layout["tables"][table_key]["prefill_rows"] = list(rows)
+
+    return {**template, "layout": layout, "theme": theme}
+
+
+def discover_clients(clients_dir):
+    """[(clientId, config)] for every clients/<id>/client.json, in id order."""
+    found = []
+    sources = {}
+    for name in sorted(os.listdir(clients_dir)):
+        path = os.path.join(clients_dir, name, "client.json")
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+            client_id = config.get("clientId", name)
+            # The id names the output directory, so it must not be able to leave out_dir.
+            if not isinstance(client_id, str) or not CLIENT_ID_RE.fullmatch(client_id):
+                raise ValueError(f"{path}: clientId {client_id!r} must match [A-Za-z0-9_-]+")
+            # Two clients with one id would build into the same out_dir/<id>.
+            if client_id in sources:
+                raise ValueError(f"{path}: clientId {client_id!r} is already used by {sources[client_id]}")
+            sources[client_id] = path
+            found.append((client_id, config))
+    return found
+
+
+def client_build_key(base_key, overrides):
+    h = hashlib.sha256(base_key.encode("ascii"))
+    with open(os.path.abspath(__file__), "rb") as f:
+        h.update(f.read())
+    h.update(json.dumps(overrides, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _read_key(client_dir):
+    try:
+        with open(os.path.join(client_dir, KEY_FILE), encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _swap_in(version_dir, target):
+    """Point the `target` symlink at the fully written `version_dir` in one atomic rename.
+
+    The previous version directory is removed only after the switch, so
+    `target` always resolves to a complete pack.
+    """
+    link = f"{version_dir}.link"
+    os.symlink(os.path.basename(version_dir), link, target_is_directory=True)
+    previous = os.path.realpath(target) if os.path.islink(target) else None
+    if os.path.isdir(target) and not os.path.islink(target):
+        # A real directory cannot be atomically replaced by a symlink: packs built before
+        # versioned directories are renamed aside once.
+        retired = f"{version_dir}.old"
+        os.replace(target, retired)
+        os.replace(link, target)
+        shutil.rmtree(retired)
+        return
+    os.replace(link, target)
+    if previous and os.path.dirname(previous) == os.path.dirname(os.path.realpath(version_dir)):
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def _init_worker(schema):
+    global _schema
+    _schema = schema
+
+
+def build_client(task):
+    """Worker: build one client's pack into out_dir/<clientId>; return (clientId, status, ms)."""
+    client_id, overrides, key, out_dir = task
+    started = time.perf_counter()
+    template = apply_client_overrides(gen.build_template(_schema), overrides)
+    artifacts = gen.build_artifacts(template)
+
+    target = os.path.join(out_dir, client_id)
+    staging = tempfile.mkdtemp(prefix=f".{client_id}.", dir=out_dir)
+    os.chmod(staging, 0o755)
+    try:
+        for rel_path, text in artifacts.items():
+            path = os.path.join(staging, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(text.encode("utf-8") if isinstance(text, str) else text)
+        with open(os.path.join(staging, KEY_FILE), "w", encoding="utf-8") as f:
+            f.write(key + "\n")
+        _swap_in(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return client_id, "built", (time.perf_counter() - started) * 1000
+
+
+def build_all(clients_dir=CLIENTS_DIR, out_dir=OUT_DIR, workers=None, force=False):
+    """Build every client in `clients_dir`; return [(clientId, status, ms)]."""
+    base_key = gen.compute_cache_key()
+    os.makedirs(out_dir, exist_ok=True)
+    tasks, results = [], []
+    for client_id, config in discover_clients(clients_dir):
+        overrides = config.get("templateOverrides", {})
+        key = client_build_key(base_key, overrides)
+        if not force and _read_key(os.path.join(out_dir, client_id)) == key:
+            results.append((client_id, "up to date", 0.0))
+        else:
+            tasks.append((client_id, overrides, key, out_dir))
+    if tasks:
+        schema = gen.load_schema()
+        with multiprocessing.Pool(min(workers or os.cpu_count(), len(tasks)), _init_worker, (schema,)) as pool:
+            results += pool.imap_unordered(build_client, tasks)
+    return sorted(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build per-client template packs in parallel")
+    parser.add_argument("--clients", default=CLIENTS_DIR, help="Directory of <clientId>/client.json configs")
+    parser.add_argument("--out", default=OUT_DIR, help="Output directory (one pack per client)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild clients even if unchanged")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        results = build_all(args.clients, args.out, args.workers, args.force)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    for client_id, status, ms in results:
+        print(f"  {client_id}: {status}" + (f" [{ms:.0f} ms]" if status == "built" else ""))
+    built = sum(status == "built" for _, status, _ in results)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"Built {built} of {len(results)} client template pack(s) in {elapsed_ms:.0f} ms -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
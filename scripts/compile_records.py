@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Generate compact `__slots__` record classes for FormQAR-054 payloads.
+
+Post-processing tools that hold a portfolio of filled forms as nested
+dicts pay for a hash table per object and per table row. This emits a
+module with:
+
+  - one `__slots__` class per object node of the schema (form, cover
+    page, every section and nested block), and
+  - one column-store class per table_array: each column is a single list,
+    `array.array` (integer / float columns) or packed string instead of
+    one dict per row.
+
+Enum values are mapped onto one shared string per enum member, so
+repeated values such as NOT_SELECTED are stored once, and a string column
+is packed into a single string plus an offsets array. `Payload.from_dict()` and
+`.to_dict()` convert losslessly: absent properties stay absent, unknown
+keys are kept aside and restored, and values of the wrong shape are
+stored as-is. Indexing a table (`table[i]`) decodes only that row.
+
+Usage:
+    python scripts/compile_records.py                      # write build/template/formqar054_records.py
+    python scripts/compile_records.py --bench 50 --rows 200   # memory of dicts vs records
+
+Programmatic use:
+    from compile_records import load_compiled_records
+    records = load_compiled_records()
+    form = records.Payload.from_dict(payload)
+    assert form.to_dict() == payload
+"""
+
+import argparse
+import gc
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+import types
+
+from flatten_schema import flatten_template
+from generate_template_json import build_template, project_root
+
+DEFAULT_OUT = os.path.join(project_root, "build", "template", "formqar054_records.py")
+
+RUNTIME_PRELUDE = '''\
+import sys
+import zlib
+from array import array
+
+_MISSING = object()
+_INT_NULL = -(1 << 63)
+_INTERN_MAX = 64
+_COMPRESS_MIN = 4096
+_TEXT_CACHE_SIZE = 16
+# id(_Strings) -> (_Strings, decompressed text) for the most recently indexed compressed columns
+_text_cache = {}
+
+
+class _Record:
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+
+class _Table:
+    __slots__ = ()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        """One row (or a list of rows for a slice), decoding only the rows asked for."""
+        if type(index) is slice:
+            return [self._row(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("table row index out of range")
+        return self._row(index)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __repr__(self):
+        return f"{type(self).__name__}(<{self._length} rows>)"
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.to_list() == other.to_list()
+
+    def to_dict(self):
+        return self.to_list()
+
+    def column(self, name):
+        """One column as a plain list (_MISSING where a row lacks the key)."""
+        return _unpack(getattr(self, name))
+
+
+def _dump(value):
+    return value.to_dict() if isinstance(value, (_Record, _Table)) else value
+
+
+def _load(cls, value):
+    return cls.from_dict(value) if type(value) is dict else value
+
+
+def _load_table(cls, value):
+    if type(value) is list and all(type(row) is dict for row in value):
+        return cls.from_rows(value)
+    return value
+
+
+def _enum(members, value):
+    return members.get(value, value) if type(value) is str else value
+
+
+class _Strings:
+    """A string column packed into one (zlib-compressed, when large) text plus end offsets."""
+
+    __slots__ = ("data", "ends")
+
+    def __init__(self, col):
+        text = "".join(col)
+        ends, end = [], 0
+        for v in col:
+            end += len(v)
+            ends.append(end)
+        self.ends = array("I" if end < (1 << 32) else "Q", ends)
+        self.data = zlib.compress(text.encode("utf-8"), 1) if len(text) >= _COMPRESS_MIN else text
+
+    def _text(self, cache=False):
+        data = self.data
+        if type(data) is str:
+            return data
+        if not cache:
+            return zlib.decompress(data).decode("utf-8")
+        entry = _text_cache.get(id(self))
+        if entry is None or entry[0] is not self:
+            if len(_text_cache) >= _TEXT_CACHE_SIZE:
+                del _text_cache[next(iter(_text_cache))]
+            entry = _text_cache[id(self)] = (self, zlib.decompress(data).decode("utf-8"))
+        return entry[1]
+
+    def get(self, i):
+        """Value `i` alone; compressed text is kept for a few recently indexed columns."""
+        ends = self.ends
+        return self._text(cache=True)[ends[i - 1] if i else 0:ends[i]]
+
+    def values(self):
+        text = self._text()
+        start, out = 0, []
+        for end in self.ends:
+            out.append(text[start:end])
+            start = end
+        return out
+
+
+def _pack_str(col):
+    """_Strings when every value is a string; else the list with short strings interned."""
+    if all(type(v) is str for v in col):
+        return _Strings(col)
+    return [sys.intern(v) if type(v) is str and len(v) <= _INTERN_MAX else v for v in col]
+
+
+def _pack_int(col):
+    """array('q') when every value is an int or None (None stored as _INT_NULL); else the list."""
+    if all((type(v) is int and v != _INT_NULL) or v is None for v in col):
+        try:
+            return array("q", [_INT_NULL if v is None else v for v in col])
+        except OverflowError:
+            pass
+    return col
+
+
+def _pack_float(col):
+    """array('d') when every value is a float (not NaN) or None (None stored as NaN); else the list."""
+    if all((type(v) is float and v == v) or v is None for v in col):
+        return array("d", [float("nan") if v is None else v for v in col])
+    return col
+
+
+def _unpack(col):
+    if type(col) is list:
+        return col
+    if type(col) is _Strings:
+        return col.values()
+    if col.typecode == "q":
+        return [None if v == _INT_NULL else v for v in col]
+    return [v if v == v else None for v in col]
+
+
+def _item(col, i):
+    """Value `i` of a packed column, as `_unpack(col)[i]` would give it."""
+    if type(col) is list:
+        return col[i]
+    if type(col) is _Strings:
+        return col.get(i)
+    v = col[i]
+    if col.typecode == "q":
+        return None if v == _INT_NULL else v
+    return v if v == v else None
+
+
+def _store(rows, key, col):
+    for row, value in zip(rows, _unpack(col)):
+        if value is not _MISSING:
+            row[key] = value
+
+
+def _store_dumped(rows, key, col):
+    for row, value in zip(rows, col):
+        if value is not _MISSING:
+            row[key] = _dump(value)
+
+
+def _row_extras(rows, known):
+    extras = {}
+    for i, row in enumerate(rows):
+        if not known.issuperset(row):
+            extras[i] = {k: v for k, v in row.items() if k not in known}
+    return extras or None
+'''
+
+
+def _camel(token):
+    return "".join(part[:1].upper() + part[1:] for part in re.split(r"[^0-9A-Za-z]+", token) if part)
+
+
+def _types(node):
+    t = node.get("type", "object")
+    return t if isinstance(t, list) else [t]
+
+
+def _is_object(node):
+    return "properties" in node
+
+
+def _is_table(node):
+    return "array" in _types(node) and _is_object(node.get("items", {}))
+
+
+class RecordCompiler:
+    """Emit Python source for record classes specialized to one flat template."""
+
+    def __init__(self, flat):
+        self.flat = flat
+        self.constants = []
+        self._const_names = {}
+        self.classes = []
+        self.class_names = []
+        self._names = set()
+
+    def _const(self, prefix, source):
+        if source not in self._const_names:
+            name = f"_{prefix}_{len(self._const_names)}"
+            self._const_names[source] = name
+            self.constants.append(f"{name} = {source}")
+        return self._const_names[source]
+
+    def _class_name(self, pointer, suffix=""):
+        tokens = [t for t in pointer.strip("/").split("/") if t != "*"]
+        if len(tokens) > 1 and tokens[0] == "sections":
+            tokens = tokens[1:]
+        for depth in range(1, len(tokens) + 1):
+            name = "".join(_camel(t) for t in tokens[-depth:]) + suffix
+            if name and name not in self._names:
+                self._names.add(name)
+                return name
+        raise ValueError(f"Cannot name record class for {pointer}")
+
+    def _field(self, name, node, pointer):
+        """(load expression for `v`, needs _dump on the way out) for one property."""
+        if _is_object(node):
+            return f"_load({self.emit_object(node, pointer)}, v)", True
+        if _is_table(node):
+            return f"_load_table({self.emit_table(node, pointer)}, v)", True
+        if "enum" in node and all(isinstance(e, str) for e in node["enum"]):
+            members = self._const("ENUM", "{" + ", ".join(f"{e!r}: {e!r}" for e in node["enum"]) + "}")
+            return f"_enum({members}, v)", False
+        return "v", False
+
+    def emit_object(self, node, pointer, name=None):
+        """Emit a `__slots__` class for an object node; return its name."""
+        name = name or self._class_name(pointer)
+        props = list(node["properties"])
+        known = self._const("KEYS", f"frozenset({props!r})")
+        load, dump = ["        get = d.get"], ["        out = {}"]
+        for prop in props:
+            expr, nested = self._field(prop, node["properties"][prop], f"{pointer}/{prop}")
+            value = "get(" + repr(prop) + ", _MISSING)"
+            if expr == "v":
+                load.append(f"        self.{prop} = {value}")
+            else:
+                load.append(f"        v = {value}")
+                load.append(f"        self.{prop} = _MISSING if v is _MISSING else {expr}")
+            dump.append(f"        v = self.{prop}")
+            dump.append("        if v is not _MISSING:")
+            dump.append(f"            out[{prop!r}] = {'_dump(v)' if nested else 'v'}")
+        slots = tuple(props) + ("_extra",)
+        self.class_names.append(name)
+        self.classes.append("\n".join([
+            f"class {name}(_Record):",
+            f'    """Record for {pointer or "/"}."""',
+            "",
+            f"    __slots__ = {slots!r}",
+            "",
+            "    @classmethod",
+            "    def from_dict(cls, d):",
+            "        self = cls.__new__(cls)",
+            *load,
+            f"        self._extra = None if {known}.issuperset(d) else {{k: v for k, v in d.items() if k not in {known}}}",
+            "        return self",
+            "",
+            "    def to_dict(self):",
+            *dump,
+            "        if self._extra:",
+            "            out.update(self._extra)",
+            "        return out",
+        ]))
+        return name
+
+    def emit_table(self, node, pointer):
+        """Emit a column-store class for a table_array node; return its name."""
+        name = self._class_name(pointer, "Table")
+        items = node["items"]
+        props = list(items["properties"])
+        known = self._const("KEYS", f"frozenset({props!r})")
+        load = ["        self._length = len(rows)"]
+        dump = ["        rows = [{} for _ in range(self._length)]"]
+        row = ["        row = {}"]
+        for prop in props:
+            child = items["properties"][prop]
+            column = f"[r.get({prop!r}, _MISSING) for r in rows]"
+            expr, nested = self._field(prop, child, f"{pointer}/*/{prop}")
+            types_ = set(_types(child)) - {"null"}
+            if expr != "v":
+                load.append(f"        self.{prop} = [_MISSING if v is _MISSING else {expr} for v in {column}]")
+            elif types_ == {"integer"}:
+                load.append(f"        self.{prop} = _pack_int({column})")
+            elif types_ == {"number"}:
+                load.append(f"        self.{prop} = _pack_float({column})")
+            elif types_ == {"string"}:
+                load.append(f"        self.{prop} = _pack_str({column})")
+            else:
+                load.append(f"        self.{prop} = {column}")
+            dump.append(f"        {'_store_dumped' if nested else '_store'}(rows, {prop!r}, self.{prop})")
+            row.append(f"        v = {'self.' + prop + '[i]' if nested else '_item(self.' + prop + ', i)'}")
+            row.append("        if v is not _MISSING:")
+            row.append(f"            row[{prop!r}] = {'_dump(v)' if nested else 'v'}")
+        slots = tuple(props) + ("_length", "_extra")
+        self.class_names.append(name)
+        self.classes.append("\n".join([
+            f"class {name}(_Table):",
+            f'    """Column store for the rows of {pointer}."""',
+            "",
+            f"    __slots__ = {slots!r}",
+            "",
+            "    @classmethod",
+            "    def from_rows(cls, rows):",
+            "        self = cls.__new__(cls)",
+            *load,
+            f"        self._extra = _row_extras(rows, {known})",
+            "        return self",
+            "",
+            "    def to_list(self):",
+            *dump,
+            "        if self._extra:",
+            "            for i, extra in self._extra.items():",
+            "                rows[i].update(extra)",
+            "        return rows",
+            "",
+            "    def _row(self, i):",
+            *row,
+            "        if self._extra and i in self._extra:",
+            "            row.update(self._extra[i])",
+            "        return row",
+        ]))
+        return name
+
+    def compile(self):
+        flat = self.flat
+        sections = {"type": "object", "properties": {k: flat["sections"][k] for k in flat["sectionOrder"]}}
+        root = {
+            "type": "object",
+            "properties": {
+                "form": flat["form"],
+                "psur_cover_page": flat["psur_cover_page"],
+                "sections": sections,
+            },
+        }
+        self._names.add("Payload")
+        self.emit_object(root, "", name="Payload")
+
+    def module_source(self):
+        self.compile()
+        meta = self.flat["meta"]
+        parts = [
+            '"""',
+            "FormQAR-054 record classes generated by scripts/compile_records.py. Do not edit.",
+            "",
+            f"Template: {meta['id']} rev {meta['revision']}",
+            '"""',
+            "",
+            RUNTIME_PRELUDE,
+            "",
+        ]
+        parts += self.constants
+        for cls in self.classes:
+            parts += ["", "", cls]
+        parts += ["", "", "RECORD_CLASSES = {"]
+        parts += [f"    {name!r}: {name}," for name in self.class_names]
+        parts.append("}")
+        return "\n".join(parts) + "\n"
+
+
+def compile_records(template=None):
+    """Return Python source for the record-class module of `template` (default: template.py)."""
+    return RecordCompiler(flatten_template(template or build_template())).module_source()
+
+
+def load_compiled_records(template=None):
+    """Compile the record classes and return them as an in-memory module."""
+    module = types.ModuleType("formqar054_records")
+    exec(compile(compile_records(template), "<formqar054_records>", "exec"), module.__dict__)
+    return module
+
+
+# ── Benchmark ─────────────────────────────────────────────────────
+
+
+def _traced(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size, elapsed
+
+
+def run_benchmark(count, rows):
+    from generate_payload_corpus import PayloadGenerator
+
+    records = load_compiled_records()
+    texts = [json.dumps(p) for p in PayloadGenerator(seed=0, default_rows=rows).iter_payloads(count)]
+
+    dicts, dict_bytes, _ = _traced(lambda: [json.loads(t) for t in texts])
+    del dicts
+    forms, record_bytes, _ = _traced(lambda: [records.Payload.from_dict(json.loads(t)) for t in texts])
+
+    started = time.perf_counter()
+    restored = [form.to_dict() for form in forms]
+    to_dict_s = time.perf_counter() - started
+    mismatches = sum(r != json.loads(t) for r, t in zip(restored, texts))
+    del restored
+    parsed = [json.loads(t) for t in texts]
+    started = time.perf_counter()
+    for payload in parsed:
+        records.Payload.from_dict(payload)
+    from_dict_s = time.perf_counter() - started
+
+    print(f"Corpus: {count} payloads, {rows} rows per table")
+    print(f"Nested dicts:   {dict_bytes / 1e6:8.1f} MB")
+    print(f"Record classes: {record_bytes / 1e6:8.1f} MB ({dict_bytes / record_bytes:.1f}x smaller)")
+    print(f"from_dict: {count / from_dict_s:,.0f} payloads/s   to_dict: {count / to_dict_s:,.0f} payloads/s")
+    print(f"Round-trip mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate __slots__ record classes for FormQAR-054 payloads")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="Output module path")
+    parser.add_argument("--bench", type=int, metavar="N", help="Measure memory of N synthetic payloads instead of writing the module")
+    parser.add_argument("--rows", type=int, default=200, help="Rows per table in the benchmark corpus")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        return run_benchmark(args.bench, args.rows)
+
+    source = compile_records()
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(source)
+    print(f"Generated {args.out} ({source.count(chr(10)):,} lines)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
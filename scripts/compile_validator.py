@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Compile the FormQAR-054 schema into specialized Python validation code.
+
+Instead of walking the schema tree for every payload (schema_validator.py),
+this emits a module with one function per object node of the schema:
+
+  - validate_def_<Name>     one per $defs entry
+  - validate_block_<Key>    one per top-level block (form, psur_cover_page)
+  - validate_section_<Key>  one per section A–M
+  - validate_row_<Path>     one per table_array row type
+
+Everything that is static in the schema is resolved at compile time:
+$ref pointers are inlined, enum/const sets become module constants,
+patterns are precompiled, and the allOf/if/then switches (e.g. the
+ANNUALLY / EVERY_TWO_YEARS frequency switch) become plain `if` branches.
+The generated code reports the same (json_pointer, message) errors as the
+reference validator.
+
+Usage:
+    python scripts/compile_validator.py                      # write build/template/formqar054_validator.py
+    python scripts/compile_validator.py --out path.py
+    python scripts/compile_validator.py --bench 500          # payloads/s vs the reference validator
+
+Programmatic use:
+    from compile_validator import load_compiled_validator
+    validator = load_compiled_validator()
+    errors = validator.validate(payload)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import types
+
+from generate_template_json import load_schema, project_root
+from schema_validator import pointer_join, resolve_ref
+from schema_validator import validate as reference_validate
+
+DEFAULT_OUT = os.path.join(project_root, "build", "template", "formqar054_validator.py")
+
+# Keywords that carry no validation semantics.
+ANNOTATION_KEYWORDS = {"$schema", "$id", "$defs", "title", "description", "default", "ui"}
+SUPPORTED_KEYWORDS = ANNOTATION_KEYWORDS | {
+    "$ref", "type", "enum", "const", "required", "properties", "additionalProperties",
+    "items", "minItems", "maxItems", "minLength", "pattern", "minimum", "maximum",
+    "format", "allOf",
+}
+OBJECT_KEYWORDS = ("required", "properties", "additionalProperties", "allOf")
+
+_TYPE_CHECKS = {
+    "string": "type({v}) is str",
+    "integer": "(type({v}) is int or (type({v}) is float and {v}.is_integer()))",
+    "number": "(type({v}) is int or type({v}) is float)",
+    "boolean": "({v} is True or {v} is False)",
+    "null": "{v} is None",
+    "object": "type({v}) is dict",
+    "array": "type({v}) is list",
+}
+
+RUNTIME_PRELUDE = '''\
+import datetime
+import re
+
+_MISSING = object()
+_DATE_RE = re.compile(r"^\\d{4}-\\d{2}-\\d{2}$")
+
+
+def _is_date(value):
+    if not _DATE_RE.match(value):
+        return False
+    try:
+        datetime.date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _json_equal(a, b):
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    return a == b
+'''
+
+
+def _slug(text):
+    return re.sub(r"[^0-9A-Za-z_]", "_", text)
+
+
+def _msg(var, suffix):
+    """Source for an error message: repr of the offending value plus a static suffix."""
+    return f"repr({var}) + {suffix!r}"
+
+
+def _ptr_literal(token):
+    """Escaped '/token' suffix as it appears in a JSON pointer."""
+    return pointer_join("", token)
+
+
+class SchemaCompiler:
+    """Emit Python source for a validator specialized to one schema."""
+
+    def __init__(self, root):
+        self.root = root
+        self.constants = []          # source lines for module constants
+        self._const_names = {}       # source -> constant name
+        self.functions = []          # generated function sources, in emit order
+        self._fn_names = {}          # id(node) -> function name
+        self._used_names = set()
+        self._queue = []             # (name, node, instance_pointer) pending emission
+        self._var_counter = 0
+        self.def_validators = {}
+        self.block_validators = {}
+        self.section_validators = {}
+        self.table_row_validators = {}
+
+    # ── naming / constants ────────────────────────────────────────
+
+    def _const(self, prefix, value_src):
+        name = self._const_names.get(value_src)
+        if name is None:
+            name = f"_{prefix}_{len(self._const_names)}"
+            self._const_names[value_src] = name
+            self.constants.append(f"{name} = {value_src}")
+        return name
+
+    def _unique(self, name):
+        base, n = name, 2
+        while name in self._used_names:
+            name = f"{base}_{n}"
+            n += 1
+        self._used_names.add(name)
+        return name
+
+    def _fresh_var(self):
+        self._var_counter += 1
+        return f"v{self._var_counter}"
+
+    def _function_for(self, node, instance_pointer, name=None):
+        """Name of the function validating object `node`, queuing it for emission on first use."""
+        key = id(node)
+        if key not in self._fn_names:
+            if name is None:
+                name = "_check" + _slug(instance_pointer.replace("/", "__")) if instance_pointer else "_check_root"
+            name = self._unique(name)
+            self._fn_names[key] = name
+            self._queue.append((name, node, instance_pointer))
+        return self._fn_names[key]
+
+    # ── schema helpers ────────────────────────────────────────────
+
+    def _resolve(self, node):
+        """Inline $ref: merge the target with any sibling keywords."""
+        while "$ref" in node:
+            target = resolve_ref(node["$ref"], self.root)
+            siblings = {k: v for k, v in node.items() if k != "$ref"}
+            node = {**target, **siblings} if siblings else target
+        unknown = set(node) - SUPPORTED_KEYWORDS
+        if unknown:
+            raise ValueError(f"Unsupported schema keywords: {sorted(unknown)}")
+        return node
+
+    @staticmethod
+    def _types(node):
+        t = node.get("type")
+        if t is None:
+            return None
+        return t if isinstance(t, list) else [t]
+
+    @staticmethod
+    def _guard(types_, wanted, var):
+        """Type guard for a keyword group: None if implied by the declared type, False if unreachable."""
+        full = " or ".join(_TYPE_CHECKS[t].format(v=var) for t in sorted(wanted))
+        if types_ is None:
+            return f"({full})"
+        declared = set(types_)
+        if not declared & wanted:
+            return False
+        rest = declared - wanted
+        if not rest:
+            return None
+        if rest == {"null"}:
+            return f"{var} is not None"
+        return f"({full})"
+
+    @staticmethod
+    def _guarded(guard, inner, pad):
+        if guard is False or not inner:
+            return []
+        if guard is None:
+            return inner
+        return [f"{pad}if {guard}:"] + ["    " + line for line in inner]
+
+    # ── code emission ─────────────────────────────────────────────
+
+    def emit_checks(self, node, var, ptr_expr, instance_pointer, indent):
+        """Source lines validating `var` (at pointer `ptr_expr`) against `node`."""
+        node = self._resolve(node)
+        pad = "    " * indent
+        types_ = self._types(node)
+        if types_ is None:
+            return self._emit_body(node, var, ptr_expr, instance_pointer, indent, None)
+
+        check = " or ".join(_TYPE_CHECKS[t].format(v=var) for t in types_)
+        suffix = " is not of type " + ", ".join(repr(t) for t in types_)
+        lines = [f"{pad}if not ({check}):", f"{pad}    errors.append(({ptr_expr}, {_msg(var, suffix)}))"]
+        body = self._emit_body(node, var, ptr_expr, instance_pointer, indent + 1, types_)
+        if body:
+            lines += [f"{pad}else:"] + body
+        return lines
+
+    def _emit_body(self, node, var, ptr_expr, instance_pointer, indent, types_):
+        pad = "    " * indent
+        lines = []
+
+        if "const" in node:
+            const = node["const"]
+            if isinstance(const, bool) or const is None:
+                cond = f"{var} is not {const!r}"
+            elif isinstance(const, str):
+                cond = f"{var} != {const!r}"
+            else:
+                cond = f"not _json_equal({var}, {self._const('CONST', repr(const))})"
+            lines.append(f"{pad}if {cond}:")
+            lines.append(f"{pad}    errors.append(({ptr_expr}, {repr(repr(const) + ' was expected')}))")
+
+        if "enum" in node:
+            enum = node["enum"]
+            if all(isinstance(e, str) for e in enum) and types_ == ["string"]:
+                name = self._const("ENUM", "frozenset(" + repr(enum) + ")")
+                lines.append(f"{pad}if {var} not in {name}:")
+            else:
+                name = self._const("ENUM", repr(enum))
+                lines.append(f"{pad}if not any(_json_equal({var}, e) for e in {name}):")
+            lines.append(f"{pad}    errors.append(({ptr_expr}, {_msg(var, ' is not one of ' + repr(enum))}))")
+
+        inner = []
+        if "minLength" in node:
+            inner.append(f"{pad}if len({var}) < {node['minLength']}:")
+            inner.append(f"{pad}    errors.append(({ptr_expr}, {_msg(var, ' is too short')}))")
+        if "pattern" in node:
+            regex = self._const("RE", f"re.compile({node['pattern']!r})")
+            inner.append(f"{pad}if not {regex}.search({var}):")
+            inner.append(f"{pad}    errors.append(({ptr_expr}, {_msg(var, ' does not match ' + repr(node['pattern']))}))")
+        if node.get("format") == "date":
+            inner.append(f"{pad}if not _is_date({var}):")
+            inner.append(f"{pad}    errors.append(({ptr_expr}, {_msg(var, ' is not a ' + repr('date'))}))")
+        lines += self._guarded(self._guard(types_, {"string"}, var), inner, pad)
+
+        inner = []
+        if "minimum" in node:
+            inner.append(f"{pad}if {var} < {node['minimum']!r}:")
+            inner.append(f"{pad}    errors.append(({ptr_expr}, {_msg(var, ' is less than the minimum of ' + repr(node['minimum']))}))")
+        if "maximum" in node:
+            inner.append(f"{pad}if {var} > {node['maximum']!r}:")
+            inner.append(f"{pad}    errors.append(({ptr_expr}, {_msg(var, ' is greater than the maximum of ' + repr(node['maximum']))}))")
+        lines += self._guarded(self._guard(types_, {"integer", "number"}, var), inner, pad)
+
+        inner = []
+        if "minItems" in node:
+            inner.append(f"{pad}if len({var}) < {node['minItems']}:")
+            inner.append(f"{pad}    errors.append(({ptr_expr}, {_msg(var, ' should have at least ' + str(node['minItems']) + ' items')}))")
+        if "maxItems" in node:
+            inner.append(f"{pad}if len({var}) > {node['maxItems']}:")
+            inner.append(f"{pad}    errors.append(({ptr_expr}, {_msg(var, ' should have at most ' + str(node['maxItems']) + ' items')}))")
+        if "items" in node:
+            idx_var, item_var = self._fresh_var(), self._fresh_var()
+            item_checks = self.emit_checks(
+                node["items"], item_var, f"{ptr_expr} + '/' + str({idx_var})", instance_pointer + "/*", indent + 1
+            )
+            if item_checks:
+                inner.append(f"{pad}for {idx_var}, {item_var} in enumerate({var}):")
+                inner += item_checks
+        lines += self._guarded(self._guard(types_, {"array"}, var), inner, pad)
+
+        if any(k in node for k in OBJECT_KEYWORDS):
+            fn = self._function_for(node, instance_pointer)
+            inner = [f"{pad}{fn}({var}, {ptr_expr}, errors)"]
+            lines += self._guarded(self._guard(types_, {"object"}, var), inner, pad)
+
+        return lines
+
+    def _emit_object_body(self, node, instance_pointer, indent):
+        """Checks for the object keywords of `node` against a `value` already known to be a dict."""
+        pad = "    " * indent
+        body = []
+        for prop in node.get("required", []):
+            body.append(f"{pad}if {prop!r} not in value:")
+            body.append(f"{pad}    errors.append((ptr, {repr(repr(prop) + ' is a required property')}))")
+
+        props = node.get("properties", {})
+        if node.get("additionalProperties") is False:
+            allowed = self._const("PROPS", "frozenset(" + repr(list(props)) + ")")
+            body.append(f"{pad}if not {allowed}.issuperset(value):")
+            body.append(f"{pad}    extras = ', '.join(repr(k) for k in value if k not in {allowed})")
+            body.append(f"{pad}    errors.append((ptr, 'Additional properties are not allowed (' + extras + ' unexpected)'))")
+
+        for prop, subschema in props.items():
+            child_pointer = instance_pointer + _ptr_literal(prop)
+            self._name_child(subschema, child_pointer)
+            var = self._fresh_var()
+            checks = self.emit_checks(subschema, var, f"ptr + {_ptr_literal(prop)!r}", child_pointer, indent + 1)
+            if not checks:
+                continue
+            body.append(f"{pad}{var} = value.get({prop!r}, _MISSING)")
+            body.append(f"{pad}if {var} is not _MISSING:")
+            body += checks
+
+        for clause in node.get("allOf", []):
+            body += self._emit_clause(clause, instance_pointer, indent)
+        return body
+
+    def _emit_object_function(self, name, node, instance_pointer):
+        body = self._emit_object_body(node, instance_pointer, 1) or ["    pass"]
+        return "\n".join([f"def {name}(value, ptr, errors):"] + body)
+
+    def _name_child(self, subschema, instance_pointer):
+        """Pre-register readable names for sections and table rows before they are emitted."""
+        resolved = self._resolve(subschema)
+        parts = instance_pointer.strip("/").split("/")
+        if len(parts) == 1 and "properties" in resolved and "$ref" not in subschema:
+            self._function_for(resolved, instance_pointer, f"validate_block_{_slug(parts[0])}")
+        if len(parts) == 2 and parts[0] == "sections":
+            self._function_for(resolved, instance_pointer, f"validate_section_{_slug(parts[1])}")
+        if resolved.get("type") == "array" and resolved.get("ui", {}).get("widget") == "table":
+            items = resolved.get("items", {})
+            if "properties" in items:
+                row_path = "__".join(parts[1:] if parts[0] == "sections" else parts)
+                self._function_for(items, instance_pointer + "/*", f"validate_row_{_slug(row_path)}")
+
+    def _emit_condition(self, if_schema, instance_pointer):
+        """A boolean expression that is true when `value` matches `if_schema`."""
+        if set(if_schema) <= {"properties", "required"} and all(
+            set(sub) == {"const"} for sub in if_schema.get("properties", {}).values()
+        ):
+            terms = [f"{p!r} in value" for p in if_schema.get("required", [])]
+            for prop, sub in if_schema.get("properties", {}).items():
+                const = sub["const"]
+                if isinstance(const, bool) or const is None:
+                    eq = f"value[{prop!r}] is {const!r}"
+                elif isinstance(const, str):
+                    eq = f"value[{prop!r}] == {const!r}"
+                else:
+                    eq = f"_json_equal(value[{prop!r}], {self._const('CONST', repr(const))})"
+                terms.append(f"({prop!r} not in value or {eq})")
+            return " and ".join(terms) or "True"
+        # General case: run the subschema into a scratch error list.
+        name = self._unique("_if" + _slug(instance_pointer.replace("/", "__")))
+        checks = self.emit_checks(if_schema, "value", "ptr", instance_pointer, 1) or ["    pass"]
+        self.functions.append("\n".join([f"def {name}(value, ptr, errors):"] + checks))
+        return f"_probe({name}, value, ptr)"
+
+    def _emit_branch(self, schema, instance_pointer, indent):
+        resolved = self._resolve(schema)
+        if set(resolved) - ANNOTATION_KEYWORDS <= set(OBJECT_KEYWORDS):
+            return self._emit_object_body(resolved, instance_pointer, indent)
+        return self.emit_checks(resolved, "value", "ptr", instance_pointer, indent)
+
+    def _emit_clause(self, clause, instance_pointer, indent):
+        pad = "    " * indent
+        if "if" not in clause:
+            return self._emit_branch(clause, instance_pointer, indent)
+        cond = self._emit_condition(clause["if"], instance_pointer)
+        then_lines = self._emit_branch(clause["then"], instance_pointer, indent + 1) if "then" in clause else []
+        else_lines = self._emit_branch(clause["else"], instance_pointer, indent + 1) if "else" in clause else []
+        if then_lines:
+            lines = [f"{pad}if {cond}:"] + then_lines
+            if else_lines:
+                lines += [f"{pad}else:"] + else_lines
+            return lines
+        if else_lines:
+            return [f"{pad}if not ({cond}):"] + else_lines
+        return []
+
+    # ── driver ────────────────────────────────────────────────────
+
+    def compile(self):
+        """Emit all functions; return the source of the `validate` entry point."""
+        for def_name, def_schema in self.root.get("$defs", {}).items():
+            if any(k in def_schema for k in OBJECT_KEYWORDS):
+                name = self._function_for(def_schema, "/" + def_name, f"validate_def_{_slug(def_name)}")
+            else:
+                name = self._unique(f"validate_def_{_slug(def_name)}")
+                checks = self.emit_checks(def_schema, "value", "ptr", "/" + def_name, 1) or ["    pass"]
+                self.functions.append("\n".join([f"def {name}(value, ptr, errors):"] + checks))
+            self.def_validators[def_name] = name
+
+        entry_checks = self.emit_checks(self.root, "instance", "''", "", 1)
+
+        emitted = set()
+        while self._queue:
+            name, node, instance_pointer = self._queue.pop(0)
+            if name in emitted:
+                continue
+            emitted.add(name)
+            self.functions.append(self._emit_object_function(name, self._resolve(node), instance_pointer))
+            if name.startswith("validate_section_"):
+                self.section_validators[instance_pointer.rsplit("/", 1)[-1]] = name
+            elif name.startswith("validate_row_"):
+                self.table_row_validators[instance_pointer[: -len("/*")]] = name
+
+        for prop, subschema in self.root.get("properties", {}).items():
+            fn = self._fn_names.get(id(self._resolve(subschema)))
+            if fn:
+                self.block_validators[prop] = fn
+
+        return "\n".join(
+            ["def validate(instance):", '    """Return the list of (json_pointer, message) errors for `instance`."""', "    errors = []"]
+            + entry_checks
+            + ["    return errors"]
+        )
+
+    def module_source(self, schema_sha256):
+        entry = self.compile()
+        parts = [
+            '"""',
+            "FormQAR-054 validator generated by scripts/compile_validator.py. Do not edit.",
+            "",
+            f"Schema SHA-256: {schema_sha256}",
+            '"""',
+            "",
+            RUNTIME_PRELUDE,
+            "",
+            f"SCHEMA_SHA256 = {schema_sha256!r}",
+            "",
+        ]
+        parts += self.constants
+        parts += ["", "", "def _probe(fn, value, ptr):", "    errors = []", "    fn(value, ptr, errors)", "    return not errors"]
+        for fn_src in self.functions:
+            parts += ["", "", fn_src]
+        parts += ["", "", entry, ""]
+        parts.append("DEF_VALIDATORS = {")
+        parts += [f"    {k!r}: {v}," for k, v in self.def_validators.items()]
+        parts.append("}")
+        parts.append("BLOCK_VALIDATORS = {")
+        parts += [f"    {k!r}: {v}," for k, v in self.block_validators.items()]
+        parts.append("}")
+        parts.append("SECTION_VALIDATORS = {")
+        parts += [f"    {k!r}: {v}," for k, v in self.section_validators.items()]
+        parts.append("}")
+        parts.append("TABLE_ROW_VALIDATORS = {")
+        parts += [f"    {k!r}: {v}," for k, v in self.table_row_validators.items()]
+        parts.append("}")
+        return "\n".join(parts) + "\n"
+
+
+def schema_digest(schema):
+    return hashlib.sha256(json.dumps(schema, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def compile_schema(schema):
+    """Return Python source for a validator module specialized to `schema`."""
+    return SchemaCompiler(schema).module_source(schema_digest(schema))
+
+
+def load_compiled_validator(schema=None):
+    """Compile `schema` (default: template.py) and return it as an in-memory module."""
+    if schema is None:
+        schema = load_schema()
+    source = compile_schema(schema)
+    module = types.ModuleType("formqar054_validator")
+    exec(compile(source, "<formqar054_validator>", "exec"), module.__dict__)
+    return module
+
+
+# ── Benchmark ─────────────────────────────────────────────────────
+
+
+def synthetic_corpus(count, rows=20, seed=0):
+    """`count` generated payloads; every fifth one is corrupted so error paths are exercised too."""
+    from generate_payload_corpus import PayloadGenerator
+
+    corpus = []
+    for i, payload in enumerate(PayloadGenerator(seed=seed, default_rows=rows).iter_payloads(count)):
+        if i % 5 == 4:
+            section = payload["sections"]["D_information_on_serious_incidents"]
+            for row in section["table_2_serious_incidents_by_imdrf_annex_a_by_region"][:1]:
+                row["n_current_period"] = -1
+            del payload["sections"]["A_executive_summary"]["benefit_risk_assessment_conclusion"]
+            payload["form"]["unexpected"] = True
+        corpus.append(payload)
+    return corpus
+
+
+def run_benchmark(count, rows):
+    schema = load_schema()
+    started = time.perf_counter()
+    validator = load_compiled_validator(schema)
+    compile_ms = (time.perf_counter() - started) * 1000
+    corpus = synthetic_corpus(count, rows)
+
+    started = time.perf_counter()
+    compiled_results = [validator.validate(p) for p in corpus]
+    compiled_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reference_results = [reference_validate(p, schema) for p in corpus]
+    reference_s = time.perf_counter() - started
+
+    mismatches = sum(sorted(a) != sorted(b) for a, b in zip(compiled_results, reference_results))
+    invalid = sum(bool(r) for r in compiled_results)
+
+    print(f"Corpus: {count} payloads, {rows} rows per table, {invalid} invalid")
+    print(f"Compile: {compile_ms:.1f} ms")
+    print(f"Reference validator: {count / reference_s:,.0f} payloads/s")
+    print(f"Compiled validator:  {count / compiled_s:,.0f} payloads/s ({reference_s / compiled_s:.1f}x)")
+    print(f"Result mismatches:   {mismatches}")
+    return 1 if mismatches else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the template.py schema into a Python validator module")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="Output module path")
+    parser.add_argument("--bench", type=int, metavar="N", help="Benchmark N synthetic payloads instead of writing the module")
+    parser.add_argument("--rows", type=int, default=20, help="Rows per table in the benchmark corpus")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        return run_benchmark(args.bench, args.rows)
+
+    source = compile_schema(load_schema())
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(source)
+    print(f"Generated {args.out} ({source.count(chr(10)):,} lines)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
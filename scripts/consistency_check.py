@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Cross-field numeric consistency checks for filled FormQAR-054 payloads.
+
+JSON Schema validates each value on its own; the invariants auditors catch
+span rows and tables:
+
+  C.table_1.*.percent_sum   percent_of_global_sales (annual) and
+                            percent_of_global_sales_24_month (two-year)
+                            add up to ~100 across the Table 1 rows
+  F.table_7.*.grand_total   Table 7 grand_total counts equal the sum of the
+                            row counts (annual and both two-year periods)
+  D.table_2/3.rate          rate_percent = 100 * n_current_period / exposure,
+                            exposure being the Table 1 sales total of the
+                            current data collection period
+
+Rules are keyed to instance pointers of the schema built by template.py
+(`*` for any row) and are checked against it when the engine is built, so
+a renamed field fails loudly instead of silently skipping a rule.
+
+Documents are checked in batches: every referenced table column is
+gathered once into a flat NumPy array (NaN for null) with the owning
+document and row index alongside, and each rule is a handful of array
+operations over the whole batch (bincount group sums, masked compares).
+
+Usage:
+    python scripts/consistency_check.py corpus.jsonl
+    python scripts/consistency_check.py archive_dir/ --out violations.jsonl --batch-size 5000
+
+Programmatic use:
+    from consistency_check import ConsistencyChecker
+    errors = ConsistencyChecker().check(documents)   # [[(pointer, message), ...] per document]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from generate_template_json import load_schema
+from migrate_payloads import iter_sources
+from schema_diff import field_map
+from schema_validator import pointer_join
+
+SECTION_C = "/sections/C_volume_of_sales_and_population_exposure/table_1_sales_by_region"
+SECTION_D = "/sections/D_information_on_serious_incidents"
+SECTION_F = "/sections/F_product_complaint_types_counts_and_rates/table_7_complaint_rate_and_count"
+
+PERCENT_TOLERANCE = 0.5
+RATE_TOLERANCE = 0.01
+
+# Current-period exposure: whichever Table 1 variant the report uses.
+EXPOSURE_COLUMNS = (
+    f"{SECTION_C}/annual_format/rows/*/current_data_collection_period",
+    f"{SECTION_C}/every_two_years_format/rows/*/total_24_month",
+)
+
+
+def _tokens(pointer):
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _split_column(pointer):
+    """'/t/rows/*/col' -> ('/t/rows', 'col')."""
+    table, _, column = pointer.rpartition("/*/")
+    if not table or "/" in column:
+        raise ValueError(f"{pointer} is not a table column pointer")
+    return table, column
+
+
+class Batch:
+    """A list of documents with their table columns gathered into flat arrays on demand."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self._tables = {}
+        self._columns = {}
+        self._scalars = {}
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _lookup(self, document, tokens):
+        node = document
+        for token in tokens:
+            if not isinstance(node, dict):
+                return None
+            node = node.get(token)
+        return node
+
+    def table(self, pointer):
+        """(doc index, row index, rows) for every dict row of the table at `pointer`."""
+        if pointer not in self._tables:
+            tokens = _tokens(pointer)
+            docs, rows_index, rows = [], [], []
+            for d, document in enumerate(self.documents):
+                table = self._lookup(document, tokens)
+                if type(table) is list:
+                    for r, row in enumerate(table):
+                        if type(row) is dict:
+                            docs.append(d)
+                            rows_index.append(r)
+                            rows.append(row)
+            self._tables[pointer] = (np.array(docs, dtype=np.int64), np.array(rows_index, dtype=np.int64), rows)
+        return self._tables[pointer]
+
+    def column(self, pointer):
+        """(doc index, row index, float values with NaN for null / non-numeric) for a `/table/*/col` pointer."""
+        if pointer not in self._columns:
+            table, name = _split_column(pointer)
+            docs, rows_index, rows = self.table(table)
+            values = np.fromiter(
+                (_number(row.get(name)) for row in rows), dtype=np.float64, count=len(rows)
+            )
+            self._columns[pointer] = (docs, rows_index, values)
+        return self._columns[pointer]
+
+    def scalar(self, pointer):
+        """Float per document (NaN when missing) for a plain field pointer."""
+        if pointer not in self._scalars:
+            tokens = _tokens(pointer)
+            self._scalars[pointer] = np.fromiter(
+                (_number(self._lookup(doc, tokens)) for doc in self.documents),
+                dtype=np.float64,
+                count=len(self.documents),
+            )
+        return self._scalars[pointer]
+
+    def group_sum(self, pointer):
+        """(sum of non-null values, number of non-null values) per document."""
+        docs, _, values = self.column(pointer)
+        present = ~np.isnan(values)
+        n = len(self.documents)
+        sums = np.bincount(docs[present], weights=values[present], minlength=n)
+        counts = np.bincount(docs[present], minlength=n)
+        return sums, counts
+
+
+def _number(value):
+    return float(value) if type(value) in (int, float) else np.nan
+
+
+# ── Rules ─────────────────────────────────────────────────────────
+
+
+class SumRule:
+    """Non-null values of a table column add up to `target` (within `tolerance`) per document."""
+
+    def __init__(self, rule_id, column, target=100.0, tolerance=PERCENT_TOLERANCE):
+        self.id = rule_id
+        self.column = column
+        self.target = target
+        self.tolerance = tolerance
+
+    def pointers(self):
+        return [self.column]
+
+    def check(self, batch):
+        sums, counts = batch.group_sum(self.column)
+        bad = np.flatnonzero((counts > 0) & (np.abs(sums - self.target) > self.tolerance))
+        table, name = _split_column(self.column)
+        for d in bad:
+            yield int(d), table, f"{name} adds up to {sums[d]:.2f} across {counts[d]} row(s), expected {self.target:g}"
+
+
+class TotalRule:
+    """A total field equals the sum of a table column per document."""
+
+    def __init__(self, rule_id, total, column):
+        self.id = rule_id
+        self.total = total
+        self.column = column
+
+    def pointers(self):
+        return [self.total, self.column]
+
+    def check(self, batch):
+        totals = batch.scalar(self.total)
+        sums, _ = batch.group_sum(self.column)
+        bad = np.flatnonzero(~np.isnan(totals) & (totals != sums))
+        name = _split_column(self.column)[1]
+        for d in bad:
+            yield int(d), self.total, f"{totals[d]:g} does not equal the sum of row {name} ({sums[d]:g})"
+
+
+class RateRule:
+    """Row rate (percent) equals 100 * numerator / the document's exposure."""
+
+    def __init__(self, rule_id, rate, numerator, exposure=EXPOSURE_COLUMNS, tolerance=RATE_TOLERANCE):
+        self.id = rule_id
+        self.rate = rate
+        self.numerator = numerator
+        self.exposure = exposure
+        self.tolerance = tolerance
+        if _split_column(rate)[0] != _split_column(numerator)[0]:
+            raise ValueError(f"{rule_id}: rate and numerator must be columns of the same table")
+
+    def pointers(self):
+        return [self.rate, self.numerator, *self.exposure]
+
+    def check(self, batch):
+        exposure = np.zeros(len(batch))
+        for pointer in self.exposure:
+            exposure += batch.group_sum(pointer)[0]
+        docs, rows_index, rates = batch.column(self.rate)
+        counts = batch.column(self.numerator)[2]
+        row_exposure = exposure[docs]
+        checked = ~np.isnan(rates) & ~np.isnan(counts) & (row_exposure > 0)
+        expected = np.full_like(rates, np.nan)
+        np.divide(100.0 * counts, row_exposure, out=expected, where=checked)
+        bad = np.flatnonzero(checked & (np.abs(rates - expected) > self.tolerance))
+        table, name = _split_column(self.rate)
+        for i in bad:
+            yield (
+                int(docs[i]),
+                pointer_join(pointer_join(table, str(rows_index[i])), name),
+                f"{rates[i]:g}% does not match {counts[i]:g} / {row_exposure[i]:g} units = {expected[i]:.4f}%",
+            )
+
+
+RULES = (
+    SumRule("C.table_1.annual.percent_sum", f"{SECTION_C}/annual_format/rows/*/percent_of_global_sales"),
+    SumRule(
+        "C.table_1.every_two_years.percent_sum",
+        f"{SECTION_C}/every_two_years_format/rows/*/percent_of_global_sales_24_month",
+    ),
+    TotalRule(
+        "F.table_7.annual.grand_total",
+        f"{SECTION_F}/annual_format/grand_total/complaint_count",
+        f"{SECTION_F}/annual_format/rows/*/current_12_month_complaint_count",
+    ),
+    TotalRule(
+        "F.table_7.every_two_years.grand_total_period_1",
+        f"{SECTION_F}/every_two_years_format/grand_total/period_1_complaint_count",
+        f"{SECTION_F}/every_two_years_format/rows/*/period_1_complaint_count",
+    ),
+    TotalRule(
+        "F.table_7.every_two_years.grand_total_period_2",
+        f"{SECTION_F}/every_two_years_format/grand_total/period_2_complaint_count",
+        f"{SECTION_F}/every_two_years_format/rows/*/period_2_complaint_count",
+    ),
+    RateRule(
+        "D.table_2.rate",
+        f"{SECTION_D}/table_2_serious_incidents_by_imdrf_annex_a_by_region/*/rate_percent",
+        f"{SECTION_D}/table_2_serious_incidents_by_imdrf_annex_a_by_region/*/n_current_period",
+    ),
+    RateRule(
+        "D.table_3.rate",
+        f"{SECTION_D}/table_3_serious_incidents_by_imdrf_annex_c_investigation_findings_by_region/*/rate_percent",
+        f"{SECTION_D}/table_3_serious_incidents_by_imdrf_annex_c_investigation_findings_by_region/*/n_current_period",
+    ),
+)
+
+
+class ConsistencyChecker:
+    """Evaluate `rules` over batches of documents."""
+
+    def __init__(self, rules=RULES, schema=None):
+        fields = field_map(schema or load_schema())
+        for rule in rules:
+            for pointer in rule.pointers():
+                if pointer not in fields:
+                    raise ValueError(f"Rule {rule.id}: {pointer} is not a field of the schema")
+        self.rules = rules
+
+    def iter_violations(self, documents):
+        """(document index, rule id, pointer, message) for every violated invariant."""
+        batch = Batch(documents)
+        for rule in self.rules:
+            for d, pointer, message in rule.check(batch):
+                yield d, rule.id, pointer, message
+
+    def check(self, documents):
+        """[[(pointer, message), ...] for each document]; messages are prefixed with the rule id."""
+        errors = [[] for _ in documents]
+        for d, rule_id, pointer, message in self.iter_violations(documents):
+            errors[d].append((pointer, f"[{rule_id}] {message}"))
+        return errors
+
+
+def _batches(sources, size):
+    names, documents = [], []
+    for source in sources:
+        for name, text in iter_sources(source):
+            names.append(name)
+            documents.append(json.loads(text))
+            if len(documents) >= size:
+                yield names, documents
+                names, documents = [], []
+    if documents:
+        yield names, documents
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-field numeric consistency checks for PSUR payloads")
+    parser.add_argument("sources", nargs="+", help="JSONL archives or directories of *.json payloads")
+    parser.add_argument("--out", help="Write {source, errors} lines for inconsistent payloads to this JSONL file")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Documents checked per vectorized batch")
+    args = parser.parse_args(argv)
+
+    checker = ConsistencyChecker()
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    per_rule = {rule.id: 0 for rule in checker.rules}
+    documents = failing = 0
+    check_s = 0.0
+    started = time.perf_counter()
+    try:
+        for names, batch in _batches(args.sources, args.batch_size):
+            t0 = time.perf_counter()
+            results = [[] for _ in batch]
+            for d, rule_id, pointer, message in checker.iter_violations(batch):
+                per_rule[rule_id] += 1
+                results[d].append((pointer, f"[{rule_id}] {message}"))
+            check_s += time.perf_counter() - t0
+            documents += len(batch)
+            for name, errors in zip(names, results):
+                if not errors:
+                    continue
+                failing += 1
+                if out:
+                    out.write(json.dumps({"source": name, "errors": errors}, ensure_ascii=False) + "\n")
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - started
+
+    for rule_id, count in per_rule.items():
+        print(f"  {rule_id}: {count:,} violation(s)")
+    print(
+        f"Checked {documents:,} payloads in {elapsed:.2f} s ({check_s:.2f} s in rules): "
+        f"{failing:,} inconsistent"
+    )
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Compile every schema conditional into an explicit decision table.
+
+The flat variant already expands each `allOf` `if`/`then` block into
+`x-branches` (use_if_psur_frequency on Table 1 and Table 7, the
+data_collection_period_changed switch in Section A, the is_applicable
+toggles, ...). This module turns them into lookup tables keyed by the
+instance pointer of the conditional object:
+
+    discriminator value -> required fields
+                        -> active / inactive subtrees
+                        -> active table columns (schema row keys, plus the
+                           layout.tables entry that renders the subtree)
+
+so a consumer can pick the active branch with one dictionary lookup
+instead of re-evaluating the conditional.
+`byDiscriminator` maps each discriminator field pointer back to its
+conditional, for consumers that react to a field change.
+
+Case keys follow the flat variant: discriminator values, with non-string
+values JSON-encoded ("true", "false").
+"""
+
+from flatten_schema import _case_key
+from schema_validator import pointer_join
+
+# Branch subtrees rendered by a layout.tables entry.
+BRANCH_LAYOUT_TABLES = {
+    "/sections/C_volume_of_sales_and_population_exposure/table_1_sales_by_region/annual_format":
+        "C.table_1_annual_sales",
+    "/sections/F_product_complaint_types_counts_and_rates/table_7_complaint_rate_and_count/annual_format":
+        "F.table_7_annually_harm_problem",
+}
+
+
+def _types(node):
+    t = node.get("type", "object")
+    return t if isinstance(t, list) else [t]
+
+
+def _table_columns(node, pointer, out):
+    """{table pointer: [row property keys]} for every table_array under `node`."""
+    items = node.get("items", {})
+    if "array" in _types(node) and "properties" in items:
+        out[pointer] = list(items["properties"])
+        return out
+    for name, child in node.get("properties", {}).items():
+        _table_columns(child, pointer_join(pointer, name), out)
+    return out
+
+
+def _conditionals(node, pointer, found):
+    if "x-branches" in node:
+        found.append((pointer, node))
+    for name, child in node.get("properties", {}).items():
+        _conditionals(child, pointer_join(pointer, name), found)
+
+
+def _decision_table(pointer, node, layout_tables):
+    branches = node["x-branches"]
+    discriminator = branches["discriminator"]
+    disc_node = node["properties"][discriminator]
+    cases = branches["cases"]
+    switched = sorted({name for case in cases.values() for name in case["active"]})
+
+    compiled = {}
+    for key, case in cases.items():
+        columns, layout = {}, []
+        for name in case["active"]:
+            subtree = pointer_join(pointer, name)
+            _table_columns(node["properties"][name], subtree, columns)
+            layout_key = BRANCH_LAYOUT_TABLES.get(subtree)
+            if layout_key is not None:
+                if layout_key not in layout_tables:
+                    raise ValueError(f"{subtree}: layout table {layout_key!r} is not in layout.tables")
+                layout.append({
+                    "layoutKey": layout_key,
+                    "columns": [c["key"] for c in layout_tables[layout_key]["columns"]],
+                })
+        compiled[key] = {
+            "required": case["required"],
+            "active": case["active"],
+            "inactive": [name for name in switched if name not in case["active"]],
+            "activeColumns": columns,
+            "layoutTables": layout,
+        }
+
+    values = disc_node.get("enum")
+    if values is None and "boolean" in _types(disc_node):
+        values = [True, False]
+    return {
+        "discriminator": discriminator,
+        "discriminatorPointer": pointer_join(pointer, discriminator),
+        "caseKeys": [_case_key(v) for v in values] if values else list(cases),
+        "defaultCase": _case_key(disc_node["default"]) if "default" in disc_node else None,
+        "cases": compiled,
+    }
+
+
+def build_decision_tables(flat, template_json):
+    """Return {"meta", "tables", "byDiscriminator"} for a flat variant and its template dict."""
+    found = []
+    _conditionals(flat["form"], "/form", found)
+    _conditionals(flat["psur_cover_page"], "/psur_cover_page", found)
+    for key in flat["sectionOrder"]:
+        _conditionals(flat["sections"][key], f"/sections/{key}", found)
+
+    layout_tables = template_json["layout"]["tables"]
+    tables = {pointer: _decision_table(pointer, node, layout_tables) for pointer, node in found}
+    meta = {k: flat["meta"][k] for k in ("id", "revision")}
+    return {
+        "meta": {**meta, "source": "template.json"},
+        "tables": tables,
+        "byDiscriminator": {t["discriminatorPointer"]: pointer for pointer, t in tables.items()},
+    }
+
+
+def active_case(decision_table, container):
+    """The compiled case for the object `container` at the table's pointer, or None if undecided."""
+    value = container.get(decision_table["discriminator"]) if isinstance(container, dict) else None
+    if value is None:
+        return None
+    return decision_table["cases"].get(_case_key(value))
+
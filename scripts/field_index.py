@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Build a flat JSON-pointer index of every field in the FormQAR-054 schema.
+
+The index is derived from the flat variant (flatten_schema.py), so $refs are
+already inlined and every node carries a concrete ui.widget. Keys are
+instance JSON pointers; `*` stands for "any row" inside a table or array:
+
+    /sections/D_information_on_serious_incidents/table_2_.../*/region
+
+Each entry holds the node's type, kind (leaf/object/table/array), whether
+it is required by its parent (`required`) and by every ancestor up to the
+section root (`required_path`), its widget, enum values, numeric/length
+bounds and the pointer of the table it belongs to (if any). Per-section
+counts of required and optional leaves are precomputed under `sections`.
+"""
+
+BOUND_KEYWORDS = ("minimum", "maximum", "minLength", "minItems", "maxItems")
+
+
+def _kind(node):
+    if "properties" in node:
+        return "object"
+    if node.get("type") == "array":
+        return "table" if node.get("ui", {}).get("widget") == "table" else "array"
+    return "leaf"
+
+
+def _entry(node, required, required_path, table):
+    items = node.get("items", {})
+    enum = node.get("enum", items.get("enum") if node.get("type") == "array" else None)
+    return {
+        "type": node.get("type"),
+        "kind": _kind(node),
+        "required": required,
+        "required_path": required_path,
+        "widget": node["ui"]["widget"],
+        "enum": enum,
+        "const": node.get("const"),
+        "bounds": {k: node[k] for k in BOUND_KEYWORDS if k in node} or None,
+        "table": table,
+    }
+
+
+def _walk(node, pointer, required, required_path, table, fields):
+    fields[pointer] = _entry(node, required, required_path, table)
+    kind = fields[pointer]["kind"]
+    if kind == "object":
+        node_required = set(node.get("required", []))
+        for name, child in node["properties"].items():
+            child_required = name in node_required
+            _walk(child, f"{pointer}/{name}", child_required, required_path and child_required, table, fields)
+    elif kind == "table":
+        _walk(node["items"], f"{pointer}/*", True, required_path, pointer, fields)
+
+
+def build_field_index(flat):
+    """Return {"meta", "fields", "sections"} for a flat template variant."""
+    fields = {}
+    for root_key in ("form", "psur_cover_page"):
+        _walk(flat[root_key], f"/{root_key}", True, True, None, fields)
+
+    sections = {}
+    for key in flat["sectionOrder"]:
+        prefix = f"/sections/{key}"
+        _walk(flat["sections"][key], prefix, True, True, None, fields)
+        leaves = [e for p, e in fields.items() if p.startswith(prefix + "/") and e["kind"] == "leaf"]
+        sections[key] = {
+            "required_leaves": sum(e["required_path"] for e in leaves),
+            "optional_leaves": sum(not e["required_path"] for e in leaves),
+            "tables": sum(e["kind"] == "table" for p, e in fields.items() if p.startswith(prefix + "/")),
+        }
+
+    meta = {k: flat["meta"][k] for k in ("id", "revision")}
+    return {"meta": {**meta, "source": "template.json", "fieldCount": len(fields)}, "fields": fields, "sections": sections}
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Build the pre-resolved ("flat") variant of the FormQAR-054 template schema.
+
+The flat variant is what renderers read on their hot path, so everything
+that would otherwise be re-derived per render is resolved here:
+
+  - every `$ref: #/$defs/...` is inlined (enum options appear in place);
+  - `allOf` `if`/`then` blocks keyed on a const discriminator are expanded
+    into `x-branches`, one case per discriminator value with the complete
+    `required` list for that case (e.g. ANNUALLY / EVERY_TWO_YEARS on
+    `table_1_sales_by_region` and `table_7_complaint_rate_and_count`);
+  - conditions that every valid instance satisfies (`if: {required: [...]}`
+    over already-required fields) are folded into the node itself;
+  - uiSchema hints are merged into each node's `ui`, and every field gets a
+    concrete `ui.widget` using the same fallback rules as the DOCX renderer.
+
+Case keys in `x-branches.cases` are the discriminator values; non-string
+values are JSON-encoded (`"true"`, `"false"`).
+"""
+
+import copy
+import json
+
+from schema_validator import resolve_ref
+
+FLAT_VARIANT = "flat"
+
+
+def _case_key(value):
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def default_widget(node):
+    """The widget psur_form_docx.ts getWidgetType() would pick for a field without ui.widget."""
+    if "enum" in node:
+        return "select"
+    if node.get("type") == "boolean":
+        return "checkbox"
+    if node.get("type") == "array" and "ui" in node:
+        return "table"
+    if node.get("type") == "object":
+        return "object"
+    if node.get("format") == "date":
+        return "date"
+    return "text"
+
+
+def _discriminator(clause):
+    """(field, const) when `clause` is `if: {properties: {field: {const: x}}}`, else None."""
+    cond = clause.get("if", {})
+    props = cond.get("properties", {})
+    if set(cond) == {"properties"} and len(props) == 1:
+        (field, sub), = props.items()
+        if set(sub) == {"const"}:
+            return field, sub["const"]
+    return None
+
+
+def _discriminator_values(node, field):
+    sub = node.get("properties", {}).get(field, {})
+    if "enum" in sub:
+        return list(sub["enum"])
+    if sub.get("type") == "boolean":
+        return [True, False]
+    return None
+
+
+def _expand_conditionals(node):
+    """Replace `allOf` on an object node with folded constraints and explicit `x-branches`."""
+    clauses = node.pop("allOf", None)
+    if not clauses:
+        return
+    required = node.get("required", [])
+    by_field = {}
+    for clause in clauses:
+        cond = clause.get("if")
+        then = clause.get("then", {})
+        if cond is not None and set(cond) == {"required"} and set(cond["required"]) <= set(required):
+            # Always true for a valid instance: fold `then` into the node.
+            for prop, extra in then.get("properties", {}).items():
+                node["properties"][prop] = {**node["properties"].get(prop, {}), **extra}
+            node["required"] = required + [r for r in then.get("required", []) if r not in required]
+            required = node["required"]
+            continue
+        disc = _discriminator(clause)
+        if disc is None or set(then) - {"required"} or "else" in clause:
+            raise ValueError(f"Cannot flatten conditional: {json.dumps(clause)}")
+        field, const = disc
+        by_field.setdefault(field, []).append((const, then.get("required", [])))
+
+    if len(by_field) > 1:
+        raise ValueError(f"Multiple discriminators on one node: {sorted(by_field)}")
+    for field, rules in by_field.items():
+        values = _discriminator_values(node, field) or [const for const, _ in rules]
+        cases = {}
+        for value in values:
+            case_required = list(required)
+            active = []
+            for const, then_required in rules:
+                if const == value and type(const) is type(value):
+                    for name in then_required:
+                        if name not in case_required:
+                            case_required.append(name)
+                        active.append(name)
+            cases[_case_key(value)] = {"required": case_required, "active": active}
+        node["x-branches"] = {"discriminator": field, "cases": cases}
+
+
+def _resolve(node, root):
+    while "$ref" in node:
+        target = resolve_ref(node["$ref"], root)
+        siblings = {k: v for k, v in node.items() if k != "$ref"}
+        node = {**copy.deepcopy(target), **siblings}
+    return node
+
+
+def _flatten(node, root):
+    node = _resolve(copy.deepcopy(node), root)
+    if "properties" in node:
+        node["properties"] = {k: _flatten(v, root) for k, v in node["properties"].items()}
+    if isinstance(node.get("items"), dict):
+        node["items"] = _flatten(node["items"], root)
+    if "allOf" in node:
+        _expand_conditionals(node)
+    ui = dict(node.get("ui", {}))
+    ui.setdefault("widget", default_widget(node))
+    node["ui"] = ui
+    return node
+
+
+def _merge_ui_schema(node, ui_entry):
+    """Merge `ui:*` hints from a uiSchema entry into node["ui"], recursing into child entries."""
+    for key, value in ui_entry.items():
+        if key.startswith("ui:"):
+            node["ui"][key[3:]] = value
+        elif isinstance(value, dict) and key in node.get("properties", {}):
+            _merge_ui_schema(node["properties"][key], value)
+
+
+def flatten_template(template):
+    """Return the flat variant of a template.json dict."""
+    schema = template["schema"]
+    ui_sections = template["uiSchema"]["sections"]
+    order = ui_sections["ui:order"]
+
+    root = _flatten({k: v for k, v in schema.items() if k != "$defs"}, schema)
+    sections = root["properties"].pop("sections")
+    for key in order:
+        _merge_ui_schema(sections["properties"][key], ui_sections.get(key, {}))
+
+    return {
+        "meta": {**template["meta"], "variant": FLAT_VARIANT, "source": "template.json"},
+        "sectionOrder": order,
+        "globalOptions": template["uiSchema"].get("ui:globalOptions", {}),
+        "form": root["properties"]["form"],
+        "psur_cover_page": root["properties"]["psur_cover_page"],
+        "sections": {key: sections["properties"][key] for key in order},
+    }
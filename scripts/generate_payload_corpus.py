@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Generate a deterministic corpus of valid, filled FormQAR-054 payloads.
+
+Walks the schema built by template.py (through its flat variant, so $refs
+are inlined and every allOf/if/then conditional is an explicit branch) and
+produces payloads that validate: every required list, minItems/maxItems,
+enums such as MDRClass/USFDAClass, patterns, date formats and the
+ANNUALLY / EVERY_TWO_YEARS branches are honoured. Payload i depends only on
+(seed, i), so corpora can be produced in any order or in parallel and are
+streamed one document at a time.
+
+Usage:
+    python scripts/generate_payload_corpus.py --count 1000 --out corpus.jsonl
+    python scripts/generate_payload_corpus.py --count 10 --rows table_7=5000 --rows default=25
+    python scripts/generate_payload_corpus.py --count 100000 --seed 7 --out - | gzip > corpus.jsonl.gz
+
+Programmatic use:
+    from generate_payload_corpus import PayloadGenerator
+    for payload in PayloadGenerator(seed=1).iter_payloads(100):
+        ...
+"""
+
+import argparse
+import datetime
+import json
+import random
+import sys
+import time
+
+from flatten_schema import flatten_template
+from generate_template_json import build_template
+
+DEFAULT_ROWS = 10
+NULL_PROBABILITY = 0.05
+
+_WORDS = (
+    "device complaint investigation trend report risk benefit analysis sterile catheter "
+    "implant patient clinical evaluation performance safety field action corrective preventive "
+    "root cause labeling distribution region literature registry follow-up assessment review"
+).split()
+_REGIONS = ("EU", "UK", "US", "APAC", "LATAM", "MEA", "Canada", "Japan")
+_DATE_START = datetime.date(2018, 1, 1)
+_DATE_SPAN_DAYS = 365 * 7
+
+
+# ── Pattern sampling ──────────────────────────────────────────────
+
+
+def _parse_pattern(pattern):
+    """Parse the regex subset used by the schema into [(alphabet, min, max)] atoms."""
+    atoms = []
+    i = 0
+    body = pattern[1:] if pattern.startswith("^") else pattern
+    body = body[:-1] if body.endswith("$") else body
+    while i < len(body):
+        c = body[i]
+        if c == "\\":
+            esc = body[i + 1]
+            alphabet = "0123456789" if esc == "d" else esc
+            i += 2
+        elif c == "[":
+            end = body.index("]", i)
+            spec = body[i + 1:end]
+            alphabet = ""
+            j = 0
+            while j < len(spec):
+                if j + 2 < len(spec) and spec[j + 1] == "-":
+                    alphabet += "".join(chr(o) for o in range(ord(spec[j]), ord(spec[j + 2]) + 1))
+                    j += 3
+                else:
+                    alphabet += spec[j]
+                    j += 1
+            i = end + 1
+        elif c in "().|*+?{":
+            raise ValueError(f"Unsupported pattern construct {c!r} in {pattern!r}")
+        else:
+            alphabet = c
+            i += 1
+        lo = hi = 1
+        if i < len(body) and body[i] == "{":
+            end = body.index("}", i)
+            bounds = body[i + 1:end].split(",")
+            lo = int(bounds[0])
+            hi = lo if len(bounds) == 1 else (int(bounds[1]) if bounds[1] else lo + 4)
+            i = end + 1
+        atoms.append((alphabet, lo, hi))
+    return atoms
+
+
+class PayloadGenerator:
+    """Deterministic generator of schema-valid payloads."""
+
+    def __init__(self, seed=0, rows=None, default_rows=DEFAULT_ROWS, optional_probability=0.8,
+                 frequency=None, template=None):
+        self.seed = seed
+        self.rows = dict(rows or {})
+        self.default_rows = default_rows
+        self.optional_probability = optional_probability
+        self.frequency = frequency
+        self.flat = flatten_template(template or build_template())
+        self._patterns = {}
+
+    # ── value generators ──────────────────────────────────────────
+
+    def _text(self, rng, node, min_words=2, max_words=8):
+        widget = node.get("ui", {}).get("widget")
+        if widget == "textarea":
+            min_words, max_words = 12, 40
+        words = [rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words))]
+        text = " ".join(words).capitalize()
+        min_len = node.get("minLength", 0)
+        while len(text) < min_len:
+            text += " " + rng.choice(_WORDS)
+        return text
+
+    def _pattern(self, rng, pattern):
+        atoms = self._patterns.get(pattern)
+        if atoms is None:
+            atoms = self._patterns[pattern] = _parse_pattern(pattern)
+        return "".join(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(lo, hi))) for alphabet, lo, hi in atoms
+        )
+
+    def _date(self, rng):
+        return (_DATE_START + datetime.timedelta(days=rng.randrange(_DATE_SPAN_DAYS))).isoformat()
+
+    def _number(self, rng, node, integer):
+        low = node.get("minimum", 0)
+        high = node.get("maximum", low + (500 if integer else 1000))
+        if integer:
+            return rng.randint(int(low), int(high))
+        return round(rng.uniform(low, high), 2)
+
+    def _row_count(self, pointer, node):
+        count = self.default_rows
+        for key, value in self.rows.items():
+            if any(token == key or token.startswith(key + "_") for token in pointer.split("/")):
+                count = value
+                break
+        count = max(count, node.get("minItems", 0))
+        if "maxItems" in node:
+            count = min(count, node["maxItems"])
+        return count
+
+    def value(self, rng, node, pointer):
+        """A random value valid against flat schema `node` located at `pointer`."""
+        if "const" in node:
+            return node["const"]
+        if "enum" in node:
+            if pointer.endswith("/use_if_psur_frequency") and self.frequency:
+                return self.frequency
+            return rng.choice(node["enum"])
+        types_ = node.get("type", "object")
+        types_ = types_ if isinstance(types_, list) else [types_]
+        if "null" in types_ and len(types_) > 1 and rng.random() < NULL_PROBABILITY:
+            return None
+        type_name = next(t for t in types_ if t != "null")
+
+        if type_name == "object":
+            return self._object(rng, node, pointer)
+        if type_name == "array":
+            if node.get("ui", {}).get("widget") == "table":
+                count = self._row_count(pointer, node)
+            else:
+                lo = node.get("minItems", 1)
+                count = rng.randint(lo, node.get("maxItems", lo + 2))
+            item = node.get("items", {})
+            return [self.value(rng, item, f"{pointer}/{i}") for i in range(count)]
+        if type_name == "string":
+            if node.get("format") == "date":
+                return self._date(rng)
+            if "pattern" in node:
+                return self._pattern(rng, node["pattern"])
+            if pointer.endswith("/region"):
+                return rng.choice(_REGIONS)
+            return self._text(rng, node)
+        if type_name == "boolean":
+            return rng.random() < 0.5
+        if type_name == "integer":
+            return self._number(rng, node, integer=True)
+        if type_name == "number":
+            return self._number(rng, node, integer=False)
+        raise ValueError(f"Unsupported type {type_name!r} at {pointer}")
+
+    def _object(self, rng, node, pointer):
+        props = node.get("properties", {})
+        required = set(node.get("required", []))
+        out = {}
+        branches = node.get("x-branches")
+        if branches:
+            disc = branches["discriminator"]
+            out[disc] = self.value(rng, props[disc], f"{pointer}/{disc}")
+            key = out[disc] if isinstance(out[disc], str) else json.dumps(out[disc])
+            case = branches["cases"][key]
+            required |= set(case["required"])
+            # Leave the inactive format out so each document has a single, clear branch.
+            inactive = {name for c in branches["cases"].values() for name in c["active"]} - set(case["active"])
+        else:
+            inactive = set()
+        for name, child in props.items():
+            if name in out or name in inactive:
+                continue
+            if name in required or rng.random() < self.optional_probability:
+                out[name] = self.value(rng, child, f"{pointer}/{name}")
+        # start/end date pairs (data collection periods) are drawn independently; order them.
+        for start, end in _date_pairs(props):
+            if isinstance(out.get(start), str) and isinstance(out.get(end), str):
+                days = sorted(datetime.date.fromisoformat(out[n]) for n in (start, end))
+                out[start], out[end] = (day.isoformat() for day in days)
+        return {name: out[name] for name in props if name in out}
+
+    # ── documents ─────────────────────────────────────────────────
+
+    def payload(self, index):
+        """Payload number `index`; depends only on (seed, index)."""
+        rng = random.Random(f"{self.seed}:{index}")
+        flat = self.flat
+        return {
+            "form": self.value(rng, flat["form"], "/form"),
+            "psur_cover_page": self.value(rng, flat["psur_cover_page"], "/psur_cover_page"),
+            "sections": {
+                key: self.value(rng, flat["sections"][key], f"/sections/{key}") for key in flat["sectionOrder"]
+            },
+        }
+
+    def iter_payloads(self, count, start=0):
+        for index in range(start, start + count):
+            yield self.payload(index)
+
+
+def _date_pairs(props):
+    """(start, end) names of date properties that differ only in "start" / "end"."""
+    dates = {name for name, child in props.items() if child.get("format") == "date"}
+    return [(name, name.replace("start", "end")) for name in props
+            if name in dates and "start" in name and name.replace("start", "end") in dates]
+
+
+def _parse_rows(specs):
+    rows = {}
+    default = DEFAULT_ROWS
+    for spec in specs:
+        key, _, value = spec.partition("=")
+        if not value:
+            raise argparse.ArgumentTypeError(f"Expected KEY=N, got {spec!r}")
+        if key == "default":
+            default = int(value)
+        else:
+            rows[key] = int(value)
+    return rows, default
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic FormQAR-054 payloads as JSONL")
+    parser.add_argument("--count", type=int, default=100, help="Number of payloads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", type=int, default=0, help="Index of the first payload (for sharding)")
+    parser.add_argument("--rows", action="append", default=[], metavar="TABLE=N",
+                        help="Row count for tables whose path contains TABLE (e.g. table_7=5000); 'default=N' for all others")
+    parser.add_argument("--frequency", choices=["ANNUALLY", "EVERY_TWO_YEARS"], help="Force one PSUR frequency branch")
+    parser.add_argument("--out", default="-", help="Output JSONL path ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    rows, default_rows = _parse_rows(args.rows)
+    generator = PayloadGenerator(seed=args.seed, rows=rows, default_rows=default_rows, frequency=args.frequency)
+
+    started = time.perf_counter()
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        for payload in generator.iter_payloads(args.count, args.start):
+            out.write(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+    print(f"Generated {args.count} payloads in {elapsed:.2f} s ({args.count / elapsed:,.0f}/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,27 +5,61 @@ Generate template.json from template.py schema definition.
 Wraps the FormQAR-054 UI Schema with meta, layout, theme, and uiSchema
 sections required by the DOCX renderer.
 
+Builds are content-addressed: the SHA-256 of template.py, the generator
+source, the meta/theme/layout/uiSchema blocks and the Python version is
+recorded in .template_build_cache.json. When the key is unchanged and
+template.json still matches the recorded digest, the rebuild and the
+write are skipped.
+
 Usage:
     python scripts/generate_template_json.py
+    python scripts/generate_template_json.py --force
+    python scripts/generate_template_json.py --dist     # + template_pack/dist/ (CBOR, gzip, brotli)
+    python scripts/watch_template.py                    # rebuild on every save of template.py
+
+Programmatic use:
+    from generate_template_json import build_template
+    template = build_template()
 """
 
+import argparse
+import hashlib
+import importlib.util
 import json
-import sys
 import os
+import platform
+import sys
+import time
 
 # Add project root to path so we can import template.py
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-# Import the schema from template.py
-# template.py builds `schema` and populates `sections` as a side-effect.
-# Strip the file-write block at the end (lines that write to /mnt/data/).
-source = open(os.path.join(project_root, "template.py"), encoding="utf-8").read()
-# Remove the write-to-file block at the end
-source = source.split("# Write to file")[0]
-exec(source)
+TEMPLATE_SOURCE = os.path.join(project_root, "template.py")
+OUT_PATH = os.path.join(project_root, "template.json")
+PACK_DIR = os.path.join(project_root, "template_pack")
+CACHE_PATH = os.path.join(project_root, ".template_build_cache.json")
+
+
+def load_schema(source_path=TEMPLATE_SOURCE):
+    """Import a template.py-style module and return the schema its `build_schema()` builds.
+
+    The project's template.py is imported once as the `template` module, so
+    its memoized sections are shared by every caller in the process; any
+    other path is imported as a fresh, unregistered module.
+    """
+    if os.path.abspath(source_path) == TEMPLATE_SOURCE:
+        import template
+
+        return template.build_schema()
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    spec = importlib.util.spec_from_file_location(f"_template_{name}", source_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, "build_schema"):
+        raise ValueError(f"{source_path}: no build_schema() (not a template.py-style module)")
+    return module.build_schema()
 
-# `schema` is now in scope from template.py
 
 # ── Meta ──────────────────────────────────────────────────────────
 
@@ -296,16 +330,194 @@ ui_schema = {
 
 # ── Assemble full template.json ───────────────────────────────────
 
-template_json = {
-    "meta": meta,
-    "schema": schema,
-    "uiSchema": ui_schema,
-    "layout": layout,
-    "theme": theme,
-}
 
-out_path = os.path.join(project_root, "template.json")
-with open(out_path, "w", encoding="utf-8") as f:
-    json.dump(template_json, f, indent=2, ensure_ascii=False)
+def build_template(schema=None):
+    """Return the full template.json dict (meta, schema, uiSchema, layout, theme)."""
+    if schema is None:
+        schema = load_schema()
+    return {
+        "meta": meta,
+        "schema": schema,
+        "uiSchema": ui_schema,
+        "layout": layout,
+        "theme": theme,
+    }
+
 
-print(f"Generated {out_path} ({os.path.getsize(out_path):,} bytes)")
+def render_template_json(template_json):
+    """Serialize a template dict exactly as it is written to template.json."""
+    return json.dumps(template_json, indent=2, ensure_ascii=False)
+
+
+def build_artifacts(template_json, dist=False):
+    """Return {path relative to the project root: text or bytes} for template.json and its derived files.
+
+    With `dist`, the binary and compressed distributions under template_pack/dist/ are included.
+    """
+    from arrow_schemas import build_arrow_schemas
+    from decision_tables import build_decision_tables
+    from field_index import build_field_index
+    from flatten_schema import flatten_template
+    from schema_fingerprints import build_fingerprints
+    from section_pack import build_section_pack
+    from table_layout_plans import build_table_plans
+
+    text = render_template_json(template_json)
+    source_sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def derived(artifact):
+        # Loaders attach a derived file only when this matches the template.json they read.
+        return render_template_json({**artifact, "meta": {**artifact["meta"], "sourceSha256": source_sha256}})
+
+    flat = flatten_template(template_json)
+    artifacts = {
+        "template.json": text,
+        "template_pack/template.flat.json": derived(flat),
+        "template_pack/field_index.json": derived(build_field_index(flat)),
+        "template_pack/table_plans.json": derived(build_table_plans(template_json)),
+        "template_pack/arrow_schemas.json": derived(build_arrow_schemas(flat)),
+        "template_pack/decision_tables.json": derived(build_decision_tables(flat, template_json)),
+        "template_pack/schema_fingerprints.json": derived(
+            build_fingerprints(template_json["schema"], template_json["meta"])
+        ),
+    }
+    artifacts.update(build_section_pack(template_json))
+    if dist:
+        from template_dist import build_distributions
+
+        artifacts.update(build_distributions(template_json))
+    return artifacts
+
+
+# ── Incremental build cache ───────────────────────────────────────
+
+# Helper modules whose source feeds the derived artifacts (part of the cache key).
+BUILD_MODULES = (
+    "arrow_schemas.py",
+    "decision_tables.py",
+    "field_index.py",
+    "flatten_schema.py",
+    "schema_fingerprints.py",
+    "schema_validator.py",
+    "section_pack.py",
+    "table_layout_plans.py",
+    "template_dist.py",
+)
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def compute_cache_key(source_path=TEMPLATE_SOURCE, dist=False, source_bytes=None):
+    """Content hash over every input that can change the generated output.
+
+    `source_bytes` is the template.py content the outputs were built from;
+    when omitted it is read from `source_path`.
+    """
+    h = hashlib.sha256(b"dist" if dist else b"")
+    if source_bytes is None:
+        with open(source_path, "rb") as f:
+            source_bytes = f.read()
+    h.update(source_bytes)
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    for path in [os.path.abspath(__file__)] + [os.path.join(script_dir, m) for m in BUILD_MODULES]:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    blocks = {"meta": meta, "theme": theme, "layout": layout, "uiSchema": ui_schema}
+    h.update(json.dumps(blocks, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    h.update(f"{platform.python_implementation()} {platform.python_version()}".encode("ascii"))
+    return h.hexdigest()
+
+
+def _read_cache():
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(key, outputs):
+    with open(CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "outputs": outputs}, f, indent=2)
+        f.write("\n")
+
+
+def is_up_to_date(key):
+    """True when the cached key matches and every output is untouched since it was written."""
+    cached = _read_cache()
+    outputs = cached.get("outputs")
+    if cached.get("key") != key or not outputs:
+        return False
+    for rel_path, digest in outputs.items():
+        path = os.path.join(project_root, rel_path)
+        if not os.path.exists(path) or _sha256_file(path) != digest:
+            return False
+    return True
+
+
+def write_artifacts(artifacts, unchanged=None):
+    """Write each artifact and return {relative path: sha256} of what was written.
+
+    Every file is staged next to its target first and only then renamed into
+    place, so a failed build never leaves a mix of old and new artifacts.
+    Files whose digest equals the one in `unchanged` are not rewritten.
+    """
+    digests, staged = {}, []
+    try:
+        for rel_path, text in artifacts.items():
+            data = text.encode("utf-8") if isinstance(text, str) else text
+            digests[rel_path] = hashlib.sha256(data).hexdigest()
+            path = os.path.join(project_root, rel_path)
+            if unchanged and unchanged.get(rel_path) == digests[rel_path] and os.path.exists(path):
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            staged.append((tmp, path))
+    except BaseException:
+        for tmp, _ in staged:
+            os.unlink(tmp)
+        raise
+    # template.json last: readers that key off it see the derived files already in place.
+    staged.sort(key=lambda item: os.path.basename(item[1]) == "template.json")
+    for tmp, path in staged:
+        os.replace(tmp, path)
+    return digests
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate template.json from template.py")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the cache key is unchanged")
+    parser.add_argument("--dist", action="store_true", help="Also emit CBOR/minified/compressed distributions")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    key = compute_cache_key(dist=args.dist)
+
+    if not args.force and is_up_to_date(key):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"Cache hit ({key[:12]}): {OUT_PATH} is up to date [{elapsed_ms:.1f} ms]")
+        return 0
+
+    digests = write_artifacts(build_artifacts(build_template(), dist=args.dist))
+    _write_cache(key, digests)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    reason = "forced" if args.force else "miss"
+    print(f"Cache {reason} ({key[:12]}): Generated {OUT_PATH} ({os.path.getsize(OUT_PATH):,} bytes)")
+    for rel_path in digests:
+        if rel_path != "template.json":
+            print(f"  + {rel_path} ({os.path.getsize(os.path.join(project_root, rel_path)):,} bytes)")
+    print(f"Build time: {elapsed_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Bulk-migrate stored FormQAR-054 payloads between schema revisions.
+
+Applies a migration plan from schema_diff.py to archives of payloads in a
+process pool. Inputs are streamed, never loaded whole:
+
+  - a JSONL file (one payload per line) is written to a JSONL file with
+    the same line order;
+  - a directory is walked for *.json files, mirrored under the output
+    directory.
+
+After migration each payload is checked with the compiled validator for
+the new schema (unless --no-validate). Payloads that cannot be migrated or
+do not validate are left out of the output and listed, with their errors,
+in <out>.failures.jsonl. A throughput summary is printed at the end.
+
+Usage:
+    python scripts/schema_diff.py old_template.py template.py --plan build/migration/plan.json
+    python scripts/migrate_payloads.py build/migration/plan.json archive.jsonl --out migrated.jsonl --new template.py
+    python scripts/migrate_payloads.py build/migration/plan.json archive_dir/ --out migrated_dir/ --workers 8
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+from compile_validator import load_compiled_validator
+from schema_diff import MigrationError, apply_plan, load_schema_file, schema_digest
+
+MAX_REPORTED_ERRORS = 20
+
+_plan = None
+_validator = None
+
+
+def _init_worker(plan, new_schema):
+    global _plan, _validator
+    _plan = plan
+    _validator = load_compiled_validator(new_schema) if new_schema is not None else None
+
+
+def _migrate(item):
+    """Worker: (source, text) -> (source, migrated text or None, errors, input bytes)."""
+    source, text = item
+    size = len(text.encode("utf-8"))
+    try:
+        document = apply_plan(json.loads(text), _plan)
+    except (MigrationError, json.JSONDecodeError) as exc:
+        return source, None, [["", str(exc)]], size
+    except Exception as exc:  # one malformed document must not abort the run
+        return source, None, [["", f"{type(exc).__name__}: {exc}"]], size
+    if _validator is not None:
+        errors = _validator.validate(document)
+        if errors:
+            return source, None, [list(e) for e in errors[:MAX_REPORTED_ERRORS]], size
+    return source, json.dumps(document, ensure_ascii=False, separators=(",", ":")), [], size
+
+
+def _iter_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                yield f"{path}:{number}", line
+
+
+def _iter_directory(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith(".json"):
+                path = os.path.join(dirpath, name)
+                with open(path, encoding="utf-8") as f:
+                    yield os.path.relpath(path, root), f.read()
+
+
+def iter_sources(source):
+    """(name, JSON text) for every payload in a JSONL archive or a directory of *.json files."""
+    return _iter_directory(source) if os.path.isdir(source) else _iter_jsonl(source)
+
+
+def _bounded(items, slots):
+    """Yield from `items`, blocking while every one of `slots` is taken by an unfinished payload."""
+    for item in items:
+        slots.acquire()
+        yield item
+
+
+def _write_atomic(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def migrate(plan, source, out, new_schema=None, workers=None, chunksize=64):
+    """Migrate every payload in `source` (JSONL file or directory) into `out`; return the run report."""
+    is_dir = os.path.isdir(source)
+    # Pool.imap drains its input eagerly; cap the payloads read ahead of the
+    # results so a large archive stays streamed.
+    slots = threading.Semaphore(2 * (workers or os.cpu_count() or 1) * chunksize)
+    items = _bounded(iter_sources(source), slots)
+    failures_path = f"{out.rstrip(os.sep)}.failures.jsonl"
+    stats = {"documents": 0, "migrated": 0, "failed": 0, "bytes": 0}
+
+    started = time.perf_counter()
+    jsonl_out = None if is_dir else open(f"{out}.tmp", "w", encoding="utf-8")
+    try:
+        with open(failures_path, "w", encoding="utf-8") as failures, multiprocessing.Pool(
+            workers, initializer=_init_worker, initargs=(plan, new_schema)
+        ) as pool:
+            # imap keeps input order, so a JSONL archive is rewritten line for line.
+            for name, text, errors, size in pool.imap(_migrate, items, chunksize):
+                slots.release()
+                stats["documents"] += 1
+                stats["bytes"] += size
+                if text is None:
+                    stats["failed"] += 1
+                    failures.write(json.dumps({"source": name, "errors": errors}, ensure_ascii=False) + "\n")
+                elif is_dir:
+                    stats["migrated"] += 1
+                    _write_atomic(os.path.join(out, name), text + "\n")
+                else:
+                    stats["migrated"] += 1
+                    jsonl_out.write(text + "\n")
+    except BaseException:
+        if jsonl_out is not None:
+            jsonl_out.close()
+            os.remove(f"{out}.tmp")
+        raise
+    if jsonl_out is not None:
+        jsonl_out.close()
+        os.replace(f"{out}.tmp", out)
+
+    elapsed = time.perf_counter() - started
+    stats.update({
+        "elapsed_s": round(elapsed, 3),
+        "documents_per_s": round(stats["documents"] / max(elapsed, 1e-9), 1),
+        "mb_per_s": round(stats["bytes"] / 1e6 / max(elapsed, 1e-9), 2),
+        "failures": failures_path,
+    })
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate stored FormQAR-054 payloads with a migration plan")
+    parser.add_argument("plan", help="Plan JSON written by schema_diff.py --plan")
+    parser.add_argument("source", help="JSONL archive or directory of *.json payloads")
+    parser.add_argument("--out", required=True, help="Output JSONL path or directory")
+    parser.add_argument("--new", help="New-revision schema (builder script or JSON) to validate migrated payloads")
+    parser.add_argument("--no-validate", action="store_true", help="Skip validation against the new schema")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=64, help="Payloads sent to a worker at a time")
+    args = parser.parse_args(argv)
+
+    with open(args.plan, encoding="utf-8") as f:
+        plan = json.load(f)
+    new_schema = None
+    if not args.no_validate:
+        if not args.new:
+            parser.error("--new is required unless --no-validate is given")
+        new_schema = load_schema_file(args.new)
+        if schema_digest(new_schema) != plan["to"]:
+            parser.error(f"{args.new} is not the target revision of {args.plan}")
+
+    report = migrate(plan, args.source, args.out, new_schema, args.workers, args.chunksize)
+    print(
+        f"Migrated {report['migrated']:,} of {report['documents']:,} payloads "
+        f"({report['failed']:,} failed) in {report['elapsed_s']:.2f} s: "
+        f"{report['documents_per_s']:,.0f} docs/s, {report['mb_per_s']:.1f} MB/s"
+    )
+    if report["failed"]:
+        print(f"Failures: {report['failures']}")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Columnar cache of a pack's normalized tables, keyed by source and profile hash.
+
+`pack:map` (src/packs/loader.ts) parses every raw CSV, applies the file's
+mapping profile record by record and writes the result back out as CSV
+text, which every consumer then parses again. The cache instead keeps
+each normalized table as an uncompressed Arrow IPC file:
+
+    <pack>/.cache/<fileId>-<key>.arrow
+
+`key` is derived from the SHA-256 of the raw file bytes (the hash the
+loader records in fileHashes) and the hash of that file's entry in
+pack.profile.json, so a table is rebuilt only when its raw file or its own
+mapping changes; regenerating the profile with unchanged mappings (a new
+`generatedAt`) keeps it valid. A hit is memory-mapped, so reading a table
+costs page faults for the columns actually used rather than a parse.
+
+On a miss the raw CSV is read with pyarrow and normalized column by
+column. Every step of `normalizeRecord` (src/packs/normalizer.ts) is a
+function of a single value, so it is applied once per distinct value of
+each column and the results are gathered back with `take`, using ports of
+the TS helpers that keep JavaScript string semantics (`trim()`,
+`padStart`, `undefined` in a template literal). Raw fields are trimmed
+after unquoting; csv-parse's `trim` leaves whitespace inside quotes.
+
+Requires the optional `pyarrow` package.
+
+Usage:
+    python scripts/pack_cache.py packs/demo_cardio_2023
+    python scripts/pack_cache.py packs/demo_cardio_2023 --file complaints --check
+
+Programmatic use:
+    from pack_cache import PackCache
+    cache = PackCache("packs/demo_cardio_2023")
+    complaints = cache.table_for("complaints")     # pyarrow.Table, memory-mapped
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+
+from section_validation import content_hash
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # optional: only needed to build and read the cache
+    pa = None
+
+CACHE_FORMAT = "psur-pack-cache/1"
+CACHE_DIR = ".cache"
+HASH_BLOCK = 1 << 20
+
+# String.prototype.trim() strips WhiteSpace and LineTerminator code points.
+JS_WHITESPACE = "\t\n\v\f\r \u00a0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000\ufeff"
+
+
+def sha256_file(path):
+    """SHA-256 of a file's bytes, read in blocks (equals sha256Bytes(readFileSync(path)))."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(raw_sha256, file_profile):
+    """Cache key of a normalized table: raw file hash + mapping profile hash."""
+    return content_hash({"format": CACHE_FORMAT, "raw": raw_sha256, "profile": content_hash(file_profile)})
+
+
+# ── normalizer.ts, one value at a time ────────────────────────────
+
+
+def _js_trim(value):
+    return value.strip(JS_WHITESPACE)
+
+
+DATE_FORMATS = {  # format: (separator, positions of year, month, day)
+    "MM/DD/YYYY": ("/", (2, 0, 1)),
+    "DD.MM.YYYY": (".", (2, 1, 0)),
+    "DD-MM-YYYY": ("-", (2, 1, 0)),
+    "YYYY/MM/DD": ("/", (0, 1, 2)),
+}
+
+
+def parse_date(value, fmt):
+    if not value or _js_trim(value) == "":
+        return ""
+    v = _js_trim(value)
+    if fmt not in DATE_FORMATS:
+        return v  # YYYY-MM-DD is already canonical; unknown formats pass through
+    sep, positions = DATE_FORMATS[fmt]
+    parts = v.split(sep)
+    yyyy, mm, dd = (parts[i] if i < len(parts) else None for i in positions)
+    if mm is None or dd is None:  # undefined.padStart(): normalizeRecord throws
+        raise ValueError(f"{value!r} does not match date format {fmt}")
+    return f"{'undefined' if yyyy is None else yyyy}-{mm.rjust(2, '0')}-{dd.rjust(2, '0')}"
+
+
+def normalize_boolean(value, rule):
+    lower = _js_trim(value).lower()
+    if lower in rule["trueValues"]:
+        return "true"
+    if lower in rule["falseValues"]:
+        return "false"
+    return value
+
+
+def clean_value(value, rule):
+    result = value
+    for op in rule["operations"]:
+        if op == "trim":
+            result = _js_trim(result)
+        elif op == "uppercase":
+            result = result.upper()
+        elif op == "lowercase":
+            result = result.lower()
+        elif op == "null_tokens":
+            if rule.get("nullTokens") and result in rule["nullTokens"]:
+                result = ""
+    return result
+
+
+def derive_field(value, rule):
+    transform = rule["transform"]
+    if transform == "month_bucket":
+        return value[:7] if len(value) >= 7 else value
+    if transform == "year_extract":
+        return value[:4] if len(value) >= 4 else value
+    if transform == "uppercase":
+        return value.upper()
+    if transform == "lowercase":
+        return value.lower()
+    if transform == "trim":
+        return _js_trim(value)
+    return value
+
+
+def _rule_for(rules, target):
+    return next((rule for rule in rules if rule["column"] == target), None)
+
+
+def _typed_steps(file_profile, target):
+    """Date, boolean and code-mapping steps of normalizeRecord for one column (None if it has none)."""
+    date = _rule_for(file_profile["dateParsingRules"], target)
+    boolean = _rule_for(file_profile["booleanNormalizationRules"], target)
+    codes = _rule_for(file_profile["codeMappingDictionaries"], target)
+    if not (date or boolean or codes):
+        return None
+
+    def step(value):
+        if date and value:
+            value = parse_date(value, date["format"])
+        if boolean and value:
+            value = normalize_boolean(value, boolean)
+        if codes and value and codes["mappings"].get(value):
+            value = codes["mappings"][value]
+        return value
+
+    return step
+
+
+# ── Columnar normalization ────────────────────────────────────────
+
+
+def _map_distinct(column, fn):
+    """Apply `fn` to each distinct value of a string column; results gathered with take."""
+    encoded = column.dictionary_encode()
+    mapped = pa.array([fn(v) for v in encoded.dictionary.to_pylist()], pa.string())
+    return mapped.take(encoded.indices)
+
+
+def _js_trim_array(column):
+    return pc.utf8_trim(column, characters=JS_WHITESPACE)
+
+
+def _clean(column, rule):
+    """cleanValue over a column of trimmed raw fields; trim is then a no-op and null tokens are vectorized."""
+    if any(op in ("uppercase", "lowercase") for op in rule["operations"]):
+        return _map_distinct(column, lambda v: clean_value(v, rule))
+    for op in rule["operations"]:
+        if op == "null_tokens" and rule.get("nullTokens"):
+            tokens = pa.array(rule["nullTokens"], pa.string())
+            column = pc.if_else(pc.is_in(column, value_set=tokens), "", column)
+    return column
+
+
+def read_raw_csv(path):
+    """Raw CSV as a table of trimmed string columns, as csv-parse reads it for the loader."""
+    with open(path, encoding="utf-8", newline="") as f:
+        header = next(csv.reader(f), [])
+    try:
+        table = pacsv.read_csv(
+            path,
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in header}, strings_can_be_null=False
+            ),
+        )
+        columns = {name: table.column(name).combine_chunks() for name in table.column_names}
+    except pa.ArrowInvalid:
+        # Ragged rows (relax_column_count): short rows read missing fields as "".
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = [row for row in csv.reader(f) if row]
+        body = rows[1:]
+        columns = {
+            name: pa.array([row[i] if i < len(row) else "" for row in body], pa.string())
+            for i, name in enumerate(header)
+        }
+    return pa.table({_js_trim(name): _js_trim_array(column) for name, column in columns.items()})
+
+
+def normalize_table(raw, file_profile):
+    """`normalizeRecords` over a whole raw table, columns in the normalized records' key order."""
+    empty = pa.array([""] * raw.num_rows, pa.string())
+    result = {}
+    for mapping in file_profile["columnMappings"]:
+        source, target = mapping["sourceColumn"], mapping["targetColumn"]
+        column = raw.column(source).combine_chunks() if source in raw.column_names else empty
+        clean = _rule_for(file_profile["valueCleaningRules"], target)
+        if clean:
+            column = _clean(column, clean)
+        step = _typed_steps(file_profile, target)
+        if step:
+            column = _map_distinct(column, step)
+        result[target] = column
+    for rule in file_profile["derivedFieldRules"]:
+        source = result.get(rule["sourceColumn"], empty)
+        result[rule["targetColumn"]] = _map_distinct(source, lambda v, rule=rule: derive_field(v, rule))
+    return pa.table(result)
+
+
+# ── Cache ─────────────────────────────────────────────────────────
+
+
+class PackCache:
+    """Normalized tables of one pack, built from raw/ + pack.profile.json and kept as Arrow IPC files."""
+
+    def __init__(self, pack_dir, cache_dir=None):
+        if pa is None:
+            raise RuntimeError("the pack cache requires pyarrow (pip install pyarrow)")
+        self.pack_dir = pack_dir
+        self.cache_dir = cache_dir or os.path.join(pack_dir, CACHE_DIR)
+        with open(os.path.join(pack_dir, "pack.profile.json"), encoding="utf-8") as f:
+            self.profile = json.load(f)
+        self.files = {m["fileId"]: m for m in self.profile["fileMappings"] if m["filename"].endswith(".csv")}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def available(cls, pack_dir):
+        """True if the pack has a profile and pyarrow is installed."""
+        return pa is not None and os.path.exists(os.path.join(pack_dir, "pack.profile.json"))
+
+    def raw_path(self, file_id):
+        """Raw file of `file_id`, in raw/ or the pack root (as findRawFile looks it up)."""
+        filename = self.files[file_id]["filename"]
+        for candidate in (os.path.join(self.pack_dir, "raw", filename), os.path.join(self.pack_dir, filename)):
+            if os.path.exists(candidate):
+                return candidate
+        raise FileNotFoundError(f"Raw file not found: {filename} (checked raw/ and pack root)")
+
+    def path(self, file_id, key):
+        return os.path.join(self.cache_dir, f"{file_id}-{key[:16]}.arrow")
+
+    def table(self, file_id):
+        """Normalized table of `file_id`, memory-mapped from the cache (built first on a miss)."""
+        file_profile = self.files[file_id]
+        raw_path = self.raw_path(file_id)
+        key = cache_key(sha256_file(raw_path), file_profile)
+        path = self.path(file_id, key)
+        if os.path.exists(path):
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+            if (table.schema.metadata or {}).get(b"cache_key") == key.encode():
+                self.hits += 1
+                return table
+        self.misses += 1
+        table = normalize_table(read_raw_csv(raw_path), file_profile)
+        self._write(file_id, path, table.replace_schema_metadata({"cache_key": key, "format": CACHE_FORMAT}))
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def table_for(self, canonical_target):
+        """Normalized table of the pack's file mapped to `canonical_target` (e.g. "complaints")."""
+        for file_id, file_profile in self.files.items():
+            if file_profile["canonicalTarget"] == canonical_target:
+                return self.table(file_id)
+        raise KeyError(f"pack.profile.json maps no CSV file to {canonical_target}")
+
+    def _write(self, file_id, path, table):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+        for stale in glob.glob(os.path.join(glob.escape(self.cache_dir), f"{glob.escape(file_id)}-*.arrow")):
+            if stale != path:
+                os.remove(stale)
+
+
+def _normalized_csv(pack_dir, filename):
+    with open(os.path.join(pack_dir, "normalized", filename), encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    return (rows[0], rows[1:]) if rows else ([], [])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or refresh the columnar cache of a pack's normalized tables")
+    parser.add_argument("pack", help="Pack directory containing pack.profile.json and raw/")
+    parser.add_argument("--file", action="append", help="File id to load (repeatable; default: every CSV file)")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare each cached table with normalized/<file> written by pack:map")
+    args = parser.parse_args(argv)
+
+    if not PackCache.available(args.pack):
+        print("Error: the pack cache needs pyarrow and pack.profile.json", file=sys.stderr)
+        return 2
+    cache = PackCache(args.pack)
+    mismatched = 0
+    for file_id in args.file or list(cache.files):
+        started = time.perf_counter()
+        try:
+            table = cache.table(file_id)
+        except (OSError, ValueError) as exc:
+            print(f"Error: {file_id}: {exc}", file=sys.stderr)
+            return 2
+        elapsed = time.perf_counter() - started
+        print(f"  {file_id}: {table.num_rows:,} rows, {table.num_columns} columns in {elapsed:.3f} s")
+        if args.check:
+            header, rows = _normalized_csv(args.pack, cache.files[file_id]["filename"])
+            cached = [list(row) for row in zip(*(table.column(c).to_pylist() for c in table.column_names))]
+            if header != table.column_names or rows != cached:
+                mismatched += 1
+                print(f"    differs from normalized/{cache.files[file_id]['filename']}")
+    print(f"{cache.hits:,} cache hit(s), {cache.misses:,} rebuilt")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Shred a corpus of filled PSUR payloads into one Parquet dataset per table.
+
+Reads the Arrow schemas from template_pack/arrow_schemas.json (see
+arrow_schemas.py) and writes
+
+    <out>/<dataset>/product_family=<family>/period=<start>_<end>/part-*.parquet
+
+for every table_array in the form. Cross-report questions such as "all
+Table 2 rows for region EU across 400 PSURs" become a columnar scan:
+
+    import pyarrow.dataset as ds
+    rows = ds.dataset("build/parquet/D_table_2_serious_incidents_by_imdrf_annex_a_by_region",
+                      partitioning="hive").to_table(filter=ds.field("region") == "EU")
+
+Payloads are streamed and rows are buffered per dataset and written in
+batches, so memory stays bounded by the batch size. Values that do not fit
+a column's type (or enum) are written as null and counted in the summary.
+
+Requires the optional `pyarrow` package.
+
+Usage:
+    python scripts/parquet_shred.py corpus.jsonl --out build/parquet
+    python scripts/parquet_shred.py archive_dir/ --out build/parquet --batch-rows 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+from generate_template_json import PACK_DIR
+from migrate_payloads import iter_sources
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pads
+except ImportError:  # optional: only needed to write Parquet
+    pa = None
+
+SCHEMAS_PATH = os.path.join(PACK_DIR, "arrow_schemas.json")
+UNKNOWN = "__unknown__"
+
+
+def _tokens(pointer):
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _lookup(document, tokens):
+    node = document
+    for token in tokens:
+        if not isinstance(node, dict) or token not in node:
+            return None
+        node = node[token]
+    return node
+
+
+# ── Arrow types ───────────────────────────────────────────────────
+
+
+def arrow_type(spec):
+    kind = spec["id"]
+    if kind == "dictionary":
+        return pa.dictionary(pa.int8(), pa.string())
+    if kind == "list":
+        return pa.list_(arrow_type(spec["item"]))
+    if kind == "struct":
+        return pa.struct([arrow_field(f) for f in spec["fields"]])
+    return {"string": pa.string(), "int32": pa.int32(), "int64": pa.int64(),
+            "float64": pa.float64(), "bool": pa.bool_()}[kind]
+
+
+def arrow_field(column):
+    return pa.field(column["name"], arrow_type(column["type"]), nullable=column["nullable"])
+
+
+def arrow_schema(dataset):
+    return pa.schema([arrow_field(c) for c in dataset["fields"]], metadata={"pointer": dataset["pointer"]})
+
+
+def _coerce(spec, value):
+    """(value fitting `spec`, number of values replaced by null)."""
+    if value is None:
+        return None, 0
+    kind = spec["id"]
+    if kind in ("string", "dictionary"):
+        if type(value) is not str or (kind == "dictionary" and value not in spec["values"]):
+            return None, 1
+        return value, 0
+    if kind in ("int32", "int64"):
+        if type(value) is int:
+            return value, 0
+        if type(value) is float and value.is_integer():
+            return int(value), 0
+        return None, 1
+    if kind == "float64":
+        return (float(value), 0) if type(value) in (int, float) else (None, 1)
+    if kind == "bool":
+        return (value, 0) if type(value) is bool else (None, 1)
+    if kind == "list":
+        if type(value) is not list:
+            return None, 1
+        out, bad = [], 0
+        for item in value:
+            v, b = _coerce(spec["item"], item)
+            out.append(v)
+            bad += b
+        return out, bad
+    if kind == "struct":
+        if type(value) is not dict:
+            return None, 1
+        out, bad = {}, 0
+        for field in spec["fields"]:
+            out[field["name"]], b = _coerce(field["type"], value.get(field["name"]))
+            bad += b
+        return out, bad
+    raise ValueError(f"Unknown type spec {kind!r}")
+
+
+# ── Shredder ──────────────────────────────────────────────────────
+
+
+class ParquetShredder:
+    """Buffer table rows per dataset and write them as hive-partitioned Parquet."""
+
+    def __init__(self, out_dir, schemas, batch_rows=65536):
+        if pa is None:
+            raise RuntimeError("parquet_shred requires the optional 'pyarrow' package")
+        self.out_dir = out_dir
+        self.batch_rows = batch_rows
+        self.datasets = schemas["datasets"]
+        self._schemas = {name: arrow_schema(d) for name, d in self.datasets.items()}
+        self._tokens = {name: _tokens(d["pointer"]) for name, d in self.datasets.items()}
+        self._dict_values = {
+            name: {c["name"]: pa.array(c["type"]["values"], pa.string())
+                   for c in d["fields"] if c["type"]["id"] == "dictionary"}
+            for name, d in self.datasets.items()
+        }
+        sources = schemas["partitioning"]["sources"]
+        self._family_tokens = _tokens(sources["product_family"])
+        self._period_tokens = _tokens(sources["period"])
+        self._partitioning = pads.partitioning(
+            pa.schema([(c, pa.string()) for c in schemas["partitioning"]["columns"]]), flavor="hive"
+        )
+        self._buffers = {name: {c["name"]: [] for c in d["fields"]} for name, d in self.datasets.items()}
+        self._run = uuid.uuid4().hex[:12]
+        self._flushes = 0
+        self.stats = {"documents": 0, "rows": {name: 0 for name in self.datasets}, "nulled": 0, "skipped": 0, "files": 0}
+
+    def _partition_values(self, document):
+        family = _lookup(document, self._family_tokens)
+        period = _lookup(document, self._period_tokens)
+        family = family if isinstance(family, str) and family else UNKNOWN
+        if isinstance(period, dict) and period.get("start_date") and period.get("end_date"):
+            period = f"{period['start_date']}_{period['end_date']}"
+        else:
+            period = UNKNOWN
+        return family, period
+
+    def add(self, name, document):
+        """Shred the tables of one payload identified by `name`."""
+        family, period = self._partition_values(document)
+        for dataset, spec in self.datasets.items():
+            rows = _lookup(document, self._tokens[dataset])
+            if not isinstance(rows, list) or not rows:
+                continue
+            buffer = self._buffers[dataset]
+            columns = spec["fields"][4:]
+            for index, row in enumerate(rows):
+                if not isinstance(row, dict):
+                    self.stats["skipped"] += 1
+                    continue
+                buffer["document"].append(name)
+                buffer["row"].append(index)
+                buffer["product_family"].append(family)
+                buffer["period"].append(period)
+                for col in columns:
+                    value, bad = _coerce(col["type"], row.get(col["name"]))
+                    buffer[col["name"]].append(value)
+                    self.stats["nulled"] += bad
+                self.stats["rows"][dataset] += 1
+            if len(buffer["row"]) >= self.batch_rows:
+                self._flush(dataset)
+        self.stats["documents"] += 1
+
+    def _array(self, dataset, column, values, type_):
+        dictionary = self._dict_values[dataset].get(column)
+        if dictionary is None:
+            return pa.array(values, type_)
+        codes = {v: i for i, v in enumerate(dictionary.to_pylist())}
+        indices = pa.array([None if v is None else codes[v] for v in values], pa.int8())
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+    def _flush(self, dataset):
+        buffer = self._buffers[dataset]
+        if not buffer["row"]:
+            return
+        schema = self._schemas[dataset]
+        table = pa.Table.from_arrays(
+            [self._array(dataset, f.name, buffer[f.name], f.type) for f in schema], schema=schema
+        )
+        self._flushes += 1
+        written = []
+        pads.write_dataset(
+            table,
+            os.path.join(self.out_dir, dataset),
+            format="parquet",
+            partitioning=self._partitioning,
+            basename_template=f"part-{self._run}-{self._flushes}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_visitor=written.append,
+        )
+        self.stats["files"] += len(written)
+        for values in buffer.values():
+            values.clear()
+
+    def close(self):
+        for dataset in self.datasets:
+            self._flush(dataset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+
+
+def load_arrow_schemas(path=SCHEMAS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shred PSUR payloads into per-table Parquet datasets")
+    parser.add_argument("sources", nargs="+", help="JSONL archives or directories of *.json payloads")
+    parser.add_argument("--out", required=True, help="Output directory (one dataset per table)")
+    parser.add_argument("--schemas", default=SCHEMAS_PATH, help="arrow_schemas.json from the template pack")
+    parser.add_argument("--batch-rows", type=int, default=65536, help="Rows buffered per table before a write")
+    args = parser.parse_args(argv)
+
+    if pa is None:
+        parser.error("pyarrow is not installed (pip install pyarrow)")
+
+    started = time.perf_counter()
+    with ParquetShredder(args.out, load_arrow_schemas(args.schemas), args.batch_rows) as shredder:
+        for source in args.sources:
+            for name, text in iter_sources(source):
+                shredder.add(name, json.loads(text))
+    elapsed = time.perf_counter() - started
+
+    stats = shredder.stats
+    total = sum(stats["rows"].values())
+    for dataset, rows in stats["rows"].items():
+        if rows:
+            print(f"  {dataset}: {rows:,} rows")
+    print(
+        f"Shredded {stats['documents']:,} payloads into {total:,} rows, {stats['files']:,} file(s) "
+        f"in {elapsed:.2f} s ({stats['nulled']:,} value(s) written as null, "
+        f"{stats['skipped']:,} non-object row(s) skipped)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
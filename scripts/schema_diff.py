@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Structural diff between two FormQAR-054 schema revisions, and the payload
+migration plan compiled from it.
+
+Both schemas are walked into a map of instance JSON pointers (`*` standing
+for any array item) after resolving $refs. Comparing the two maps gives:
+
+  added / removed   fields present in only one revision (top-most only)
+  renamed           a removed and an added sibling with an identical subtree,
+                    or an explicit `--rename OLD=NEW` hint
+  enum              values added to / removed from an enum
+  required          fields that became required or optional in their parent
+  conditional       fields required by an `if`/`then` in their parent under
+                    conditions that were added or removed
+  type              fields whose declared type changed
+
+`build_migration_plan()` turns the diff into an ordered list of operations
+(rename, remove, ensure, map_enum) that `apply_plan()` runs against a
+payload. Newly required fields are filled from the new schema's defaults,
+conditionally required ones only in objects that satisfy the condition;
+removed enum values must be mapped with `--enum-map` (or fall back to the
+new node's default when that is in the new enum), otherwise documents
+holding them fail to migrate.
+
+Usage:
+    python scripts/schema_diff.py OLD NEW [--rename OLD_PTR=NEW_PTR] [--plan plan.json]
+
+OLD and NEW are template.py-style builder scripts, template.json files or
+bare schema JSON files. Bulk migration is in migrate_payloads.py.
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import sys
+
+from generate_template_json import load_schema
+from schema_validator import json_equal, pointer_join, resolve_ref
+
+ANNOTATION_KEYWORDS = ("title", "description", "ui", "default")
+
+
+class MigrationError(ValueError):
+    """A payload cannot be migrated by the plan."""
+
+
+def load_schema_file(path):
+    """Schema from a builder script, a template.json (its `schema` block) or a bare schema file."""
+    if path.endswith(".py"):
+        return load_schema(path)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["schema"] if "schema" in data and "meta" in data else data
+
+
+def schema_digest(schema):
+    return hashlib.sha256(json.dumps(schema, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+# ── Field maps ────────────────────────────────────────────────────
+
+
+def _resolve(node, root):
+    """Inline $refs, keeping keywords declared next to them."""
+    while "$ref" in node:
+        siblings = {k: v for k, v in node.items() if k != "$ref"}
+        node = {**resolve_ref(node["$ref"], root), **siblings}
+    return node
+
+
+def _types(node):
+    t = node.get("type")
+    if t is None:
+        return None
+    return sorted(t) if isinstance(t, list) else [t]
+
+
+def _signature(node, root):
+    """Hash of a subtree's validation keywords; annotations are ignored so relabelled fields still match."""
+
+    def strip(n):
+        if isinstance(n, dict):
+            n = _resolve(n, root)
+            return {k: strip(v) for k, v in sorted(n.items()) if k not in ANNOTATION_KEYWORDS}
+        if isinstance(n, list):
+            return [strip(v) for v in n]
+        return n
+
+    return hashlib.sha256(json.dumps(strip(node), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _conditionals(node):
+    """[(canonical `if` condition, `then` required names)] of an object node's if/then blocks."""
+    blocks = [node] + [b for b in node.get("allOf", []) if isinstance(b, dict)]
+    return [
+        (json.dumps(block["if"], sort_keys=True, ensure_ascii=False), set(block["then"].get("required", [])))
+        for block in blocks
+        if isinstance(block.get("if"), dict) and isinstance(block.get("then"), dict)
+    ]
+
+
+def field_map(schema):
+    """{pointer: {"node", "required", "conditional", "types", "enum", "parent"}} for every field of `schema`.
+
+    `conditional` lists the canonical `if` conditions of the parent under
+    which the field is required.
+    """
+    fields = {}
+
+    def walk(node, pointer, required, conditional, parent):
+        node = _resolve(node, schema)
+        if pointer:
+            fields[pointer] = {
+                "node": node,
+                "required": required,
+                "conditional": conditional,
+                "types": _types(node),
+                "enum": node.get("enum"),
+                "parent": parent,
+            }
+        node_required = set(node.get("required", []))
+        conditionals = _conditionals(node)
+        for name, child in node.get("properties", {}).items():
+            when = sorted(condition for condition, names in conditionals if name in names)
+            walk(child, pointer_join(pointer, name), name in node_required, when, pointer)
+        items = node.get("items")
+        if isinstance(items, dict):
+            walk(items, f"{pointer}/*", True, [], pointer)
+
+    walk(schema, "", True, [], None)
+    return fields
+
+
+def _top_most(pointers):
+    out = []
+    for pointer in sorted(pointers):
+        if not any(pointer.startswith(p + "/") for p in out):
+            out.append(pointer)
+    return out
+
+
+# ── Diff ──────────────────────────────────────────────────────────
+
+
+def diff_schemas(old, new, renames=None):
+    """Structural diff of two schemas; `renames` maps old pointers to new ones explicitly."""
+    old_fields, new_fields = field_map(old), field_map(new)
+    removed = set(old_fields) - set(new_fields)
+    added = set(new_fields) - set(old_fields)
+
+    renamed = dict(renames or {})
+    for src, dst in renamed.items():
+        if src not in old_fields or dst not in new_fields:
+            raise ValueError(f"Rename hint {src} -> {dst} does not match both schemas")
+
+    # Heuristic: a removed and an added sibling with identical validation keywords.
+    by_parent = {}
+    for pointer in _top_most(added - set(renamed.values())):
+        key = (new_fields[pointer]["parent"], _signature(new_fields[pointer]["node"], new))
+        by_parent.setdefault(key, []).append(pointer)
+    candidates = {}
+    for pointer in _top_most(removed - set(renamed)):
+        key = (old_fields[pointer]["parent"], _signature(old_fields[pointer]["node"], old))
+        candidates.setdefault(key, []).append(pointer)
+    for key, sources in candidates.items():
+        targets = by_parent.get(key, [])
+        if len(sources) == 1 and len(targets) == 1:
+            renamed[sources[0]] = targets[0]
+
+    def under(pointer, roots):
+        return any(pointer == r or pointer.startswith(r + "/") for r in roots)
+
+    # Fields below a rename are compared under their new pointer.
+    pairs = {p: p for p in set(old_fields) & set(new_fields)}
+    for src, dst in renamed.items():
+        for pointer in old_fields:
+            if under(pointer, [src]):
+                target = dst + pointer[len(src):]
+                if target in new_fields:
+                    pairs[pointer] = target
+
+    enum_changes, required_changes, conditional_changes, type_changes = [], [], [], []
+    for src, dst in sorted(pairs.items()):
+        before, after = old_fields[src], new_fields[dst]
+        if before["enum"] is not None and after["enum"] is not None and before["enum"] != after["enum"]:
+            enum_changes.append({
+                "path": dst,
+                "added": [v for v in after["enum"] if v not in before["enum"]],
+                "removed": [v for v in before["enum"] if v not in after["enum"]],
+                "default": after["node"].get("default"),
+            })
+        if before["required"] != after["required"]:
+            required_changes.append({"path": dst, "required": after["required"]})
+        if before["conditional"] != after["conditional"]:
+            conditional_changes.append({
+                "path": dst,
+                "added": [json.loads(c) for c in after["conditional"] if c not in before["conditional"]],
+                "removed": [json.loads(c) for c in before["conditional"] if c not in after["conditional"]],
+            })
+        if before["types"] != after["types"]:
+            type_changes.append({"path": dst, "from": before["types"], "to": after["types"]})
+
+    return {
+        "from": schema_digest(old),
+        "to": schema_digest(new),
+        "added": [p for p in _top_most(added) if not under(p, renamed.values())],
+        "removed": [p for p in _top_most(removed) if not under(p, renamed)],
+        "renamed": [{"from": src, "to": dst} for src, dst in sorted(renamed.items())],
+        "enum": enum_changes,
+        "required": required_changes,
+        "conditional": conditional_changes,
+        "type": type_changes,
+    }
+
+
+# ── Migration plan ────────────────────────────────────────────────
+
+
+def default_value(node, root):
+    """Value for a newly required field: its default, else the smallest value its schema allows."""
+    node = _resolve(node, root)
+    if "default" in node:
+        return copy.deepcopy(node["default"])
+    if "const" in node:
+        return node["const"]
+    if "enum" in node:
+        return "NOT_SELECTED" if "NOT_SELECTED" in node["enum"] else node["enum"][0]
+    types_ = _types(node) or ["object"]
+    if "null" in types_:
+        return None
+    kind = types_[0]
+    if kind == "object":
+        props = node.get("properties", {})
+        return {name: default_value(props[name], root) for name in node.get("required", []) if name in props}
+    if kind == "array":
+        return [default_value(node["items"], root) for _ in range(node.get("minItems", 0))]
+    if kind == "boolean":
+        return False
+    if kind in ("integer", "number"):
+        return node.get("minimum", 0)
+    return ""
+
+
+def build_migration_plan(diff, new, enum_maps=None):
+    """Ordered operations migrating payloads from diff["from"] to diff["to"]."""
+    new_fields = field_map(new)
+    enum_maps = enum_maps or {}
+    ops = []
+    for rename in diff["renamed"]:
+        ops.append({"op": "rename", "from": rename["from"], "to": rename["to"]})
+    for pointer in diff["removed"]:
+        ops.append({"op": "remove", "path": pointer})
+
+    ensure = {p for p in diff["added"] if new_fields[p]["required"]}
+    ensure |= {c["path"] for c in diff["required"] if c["required"]}
+    # A field added together with its if/then is conditionally required
+    # without appearing in diff["conditional"].
+    conditional = {c["path"]: c["added"] for c in diff.get("conditional", []) if c["added"]}
+    for pointer in diff["added"]:
+        if not new_fields[pointer]["required"] and new_fields[pointer]["conditional"]:
+            conditional[pointer] = [json.loads(c) for c in new_fields[pointer]["conditional"]]
+    ensure_ops = [(p, None) for p in ensure] + [(p, when) for p, when in conditional.items() if p not in ensure]
+    for pointer, when in sorted(ensure_ops, key=lambda e: (e[0].count("/"), e[0])):
+        op = {"op": "ensure", "path": pointer, "value": default_value(new_fields[pointer]["node"], new)}
+        if when is not None:
+            op["when"] = when
+        ops.append(op)
+
+    for change in diff["enum"]:
+        if not change["removed"]:
+            continue
+        explicit = enum_maps.get(change["path"], {})
+        allowed = new_fields[change["path"]]["enum"] or []
+        fallback = change["default"]
+        mapping = {}
+        for value in change["removed"]:
+            if value in explicit:
+                mapping[value] = explicit[value]
+            elif fallback is not None and any(json_equal(fallback, v) for v in allowed):
+                mapping[value] = fallback
+        ops.append({"op": "map_enum", "path": change["path"], "mapping": mapping, "removed": change["removed"]})
+    return {"from": diff["from"], "to": diff["to"], "ops": ops}
+
+
+# ── Applying a plan ───────────────────────────────────────────────
+
+
+def _tokens(pointer):
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _parents(document, tokens):
+    """Every value reached by `tokens` ("*" fans out over list items); missing paths reach nothing."""
+    nodes = [document]
+    for token in tokens:
+        nxt = []
+        for node in nodes:
+            if token == "*":
+                if isinstance(node, list):
+                    nxt.extend(node)
+            elif isinstance(node, dict) and token in node:
+                nxt.append(node[token])
+        nodes = nxt
+    return nodes
+
+
+def _rename(document, src, dst):
+    src_tokens, dst_tokens = _tokens(src), _tokens(dst)
+    if src_tokens[:-1] == dst_tokens[:-1]:
+        for parent in _parents(document, src_tokens[:-1]):
+            if isinstance(parent, dict) and src_tokens[-1] in parent:
+                parent[dst_tokens[-1]] = parent.pop(src_tokens[-1])
+        return
+    if "*" in src_tokens or "*" in dst_tokens:
+        raise MigrationError(f"Cannot move {src} to {dst} across array items")
+    parents = _parents(document, src_tokens[:-1])
+    if not parents or not isinstance(parents[0], dict) or src_tokens[-1] not in parents[0]:
+        return
+    value = parents[0].pop(src_tokens[-1])
+    targets = _parents(document, dst_tokens[:-1])
+    if not targets or not isinstance(targets[0], dict):
+        raise MigrationError(f"Cannot move {src} to {dst}: target parent is missing")
+    targets[0][dst_tokens[-1]] = value
+
+
+CONDITION_KEYWORDS = {"properties", "required"}
+CONDITION_VALUE_KEYWORDS = {"const", "enum"}
+
+
+def _satisfies(instance, condition):
+    """Whether an object satisfies an `if` condition built from properties/const/enum and required."""
+    unsupported = set(condition) - CONDITION_KEYWORDS
+    unsupported |= {k for sub in condition.get("properties", {}).values() for k in sub} - CONDITION_VALUE_KEYWORDS
+    if unsupported:
+        raise MigrationError(f"Unsupported keyword(s) in if-condition: {', '.join(sorted(unsupported))}")
+    if any(name not in instance for name in condition.get("required", [])):
+        return False
+    for name, sub in condition.get("properties", {}).items():
+        if name not in instance:
+            continue  # an absent property satisfies `properties`
+        value = instance[name]
+        if "const" in sub and not json_equal(value, sub["const"]):
+            return False
+        if "enum" in sub and not any(json_equal(value, v) for v in sub["enum"]):
+            return False
+    return True
+
+
+def _is_enum_value(value):
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def apply_plan(document, plan):
+    """Migrate `document` in place; raise MigrationError when it holds data the plan cannot map."""
+    for op in plan["ops"]:
+        kind = op["op"]
+        if kind == "rename":
+            _rename(document, op["from"], op["to"])
+        elif kind == "remove":
+            tokens = _tokens(op["path"])
+            for parent in _parents(document, tokens[:-1]):
+                if isinstance(parent, dict):
+                    parent.pop(tokens[-1], None)
+        elif kind == "ensure":
+            tokens = _tokens(op["path"])
+            if tokens[-1] == "*":
+                continue
+            for parent in _parents(document, tokens[:-1]):
+                if not isinstance(parent, dict) or tokens[-1] in parent:
+                    continue
+                if "when" in op and not any(_satisfies(parent, condition) for condition in op["when"]):
+                    continue
+                parent[tokens[-1]] = copy.deepcopy(op["value"])
+        elif kind == "map_enum":
+            tokens = _tokens(op["path"])
+            mapping = op["mapping"]
+            for parent in _parents(document, tokens[:-1]):
+                if tokens[-1] == "*":
+                    if not isinstance(parent, list):
+                        raise MigrationError(f"{op['path']}: expected an array, found {type(parent).__name__}")
+                    keys = range(len(parent))
+                elif isinstance(parent, dict):
+                    keys = [tokens[-1]] if tokens[-1] in parent else []
+                else:
+                    raise MigrationError(f"{op['path']}: expected an object, found {type(parent).__name__}")
+                for key in keys:
+                    value = parent[key]
+                    if not _is_enum_value(value):
+                        raise MigrationError(f"{op['path']}: expected an enum value, found {type(value).__name__}")
+                    if value in mapping:
+                        parent[key] = mapping[value]
+                    elif value in op["removed"]:
+                        raise MigrationError(f"{op['path']}: no mapping for removed enum value {value!r}")
+        else:
+            raise ValueError(f"Unknown migration op: {kind!r}")
+    return document
+
+
+def _parse_pairs(specs):
+    pairs = {}
+    for spec in specs:
+        src, sep, dst = spec.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected OLD=NEW, got {spec!r}")
+        pairs[src] = dst
+    return pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff two FormQAR-054 schema revisions")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--rename", action="append", default=[], metavar="OLD_PTR=NEW_PTR",
+                        help="Explicit rename (JSON pointers, '*' for array items)")
+    parser.add_argument("--enum-map", help="JSON file {pointer: {old_value: new_value}} for removed enum values")
+    parser.add_argument("--plan", help="Write the migration plan to this path")
+    args = parser.parse_args(argv)
+
+    old, new = load_schema_file(args.old), load_schema_file(args.new)
+    diff = diff_schemas(old, new, _parse_pairs(args.rename))
+    print(json.dumps({k: v for k, v in diff.items() if k not in ("from", "to")}, indent=2, ensure_ascii=False))
+
+    if args.plan:
+        enum_maps = {}
+        if args.enum_map:
+            with open(args.enum_map, encoding="utf-8") as f:
+                enum_maps = json.load(f)
+        plan = build_migration_plan(diff, new, enum_maps)
+        os.makedirs(os.path.dirname(os.path.abspath(args.plan)), exist_ok=True)
+        with open(args.plan, "w", encoding="utf-8") as f:
+            json.dump(plan, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Wrote {len(plan['ops'])} operation(s) to {args.plan}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
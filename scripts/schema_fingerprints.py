@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Merkle-style schema fingerprints and incremental revalidation of stored payloads.
+
+Every subschema gets a fingerprint: the SHA-256 of its canonical form, in
+which $refs are inlined, annotations (title, description, ui, default) are
+dropped, keys are sorted and each child under `properties` / `items` is
+replaced by the child's own fingerprint. A fingerprint therefore changes
+exactly when something that can affect validation changes somewhere in
+its subtree, including a shared $defs entry such as TriState.
+
+`build_fingerprints()` emits template_pack/schema_fingerprints.json with
+the root fingerprint, one per validation part (the `form` and
+`psur_cover_page` blocks and each section A–M) and one per instance
+pointer (`*` for any row).
+
+Payloads are stamped in a sidecar JSONL file (the payload schema allows no
+extra keys): per source, the content hash of the payload as stored (the
+SHA-256 of its text, see `text_hash()`) and, per part, the fingerprint it
+was validated against and its errors. Revalidation after a schema edit
+reuses a part's stamped result when the stored payload is byte-identical
+and the part's fingerprint is unchanged, and only runs the compiled
+validator for the rest. Payloads are never re-canonicalised for this: a
+changed payload is simply revalidated in full.
+
+Usage:
+    python scripts/schema_fingerprints.py corpus.jsonl --stamps corpus.stamps.jsonl
+    python scripts/schema_fingerprints.py corpus.jsonl --stamps corpus.stamps.jsonl --schema new_template.py
+
+Programmatic use:
+    from schema_fingerprints import IncrementalValidator
+    errors, stamp = IncrementalValidator().revalidate(json.loads(text), old_stamp, text_hash(text))
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from schema_validator import pointer_join, resolve_ref
+from section_validation import BLOCK_KEYS, SectionValidator
+
+ALGORITHM = "sha256-merkle/1"
+ANNOTATION_KEYWORDS = ("title", "description", "ui", "default", "examples", "$comment")
+
+
+def _hash(value):
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def _resolve(node, root):
+    while isinstance(node, dict) and "$ref" in node:
+        siblings = {k: v for k, v in node.items() if k != "$ref"}
+        node = {**resolve_ref(node["$ref"], root), **siblings}
+    return node
+
+
+def _canonical(value, root):
+    """Annotation-free, ref-inlined copy of a keyword value (allOf, if/then, enum, ...)."""
+    if isinstance(value, dict):
+        value = _resolve(value, root)
+        return {k: _canonical(v, root) for k, v in value.items() if k not in ANNOTATION_KEYWORDS}
+    if isinstance(value, list):
+        return [_canonical(v, root) for v in value]
+    return value
+
+
+def _fingerprint(node, root, pointer, out):
+    node = _resolve(node, root)
+    own = {}
+    for key, value in node.items():
+        if key in ANNOTATION_KEYWORDS or key == "$defs":
+            continue
+        if key == "properties":
+            own[key] = {
+                name: _fingerprint(child, root, pointer_join(pointer, name), out) for name, child in value.items()
+            }
+        elif key == "items" and isinstance(value, dict):
+            own[key] = _fingerprint(value, root, f"{pointer}/*", out)
+        else:
+            own[key] = _canonical(value, root)
+    digest = _hash(own)
+    out[pointer] = digest
+    return digest
+
+
+def part_pointer(key):
+    return f"/{key}" if key in BLOCK_KEYS else pointer_join("/sections", key)
+
+
+def build_fingerprints(schema, meta=None):
+    """Return {"meta", "algorithm", "root", "parts", "subtrees"} for a schema."""
+    subtrees = {}
+    root = _fingerprint(schema, schema, "", subtrees)
+    sections = _resolve(schema["properties"]["sections"], schema)
+    parts = {key: subtrees[part_pointer(key)] for key in BLOCK_KEYS + tuple(sections["properties"])}
+    head = {k: meta[k] for k in ("id", "revision")} if meta else {}
+    return {
+        "meta": {**head, "source": "template.json"},
+        "algorithm": ALGORITHM,
+        "root": root,
+        "parts": parts,
+        "subtrees": dict(sorted(subtrees.items())),
+    }
+
+
+def changed_parts(old, new):
+    """Part keys whose fingerprint differs between two fingerprint documents (or is new)."""
+    return [key for key, digest in new["parts"].items() if old["parts"].get(key) != digest]
+
+
+# ── Incremental revalidation ──────────────────────────────────────
+
+
+def text_hash(text):
+    """Content hash of a payload as stored: the SHA-256 of its UTF-8 text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IncrementalValidator:
+    """Revalidate payloads, reusing stamped part results whose schema and content are unchanged."""
+
+    def __init__(self, schema=None, validator=None):
+        self.sections = SectionValidator(schema, validator)
+        self.fingerprints = build_fingerprints(self.sections.schema)
+        self.reused = 0
+        self.validated = 0
+
+    def revalidate(self, document, stamp=None, content=None):
+        """(errors, new stamp) for `document`; `stamp` is the one recorded at its last validation.
+
+        `content` identifies the stored payload (`text_hash()` of its text, or
+        a hash recorded when it was written). Stamped part results are reused
+        only when it matches the stamp's; without it every part is validated.
+        """
+        errors = self.sections._structural_errors(document)
+        unchanged = content is not None and (stamp or {}).get("content") == content
+        old_parts = stamp["parts"] if unchanged else {}
+        parts = {}
+        sections = document.get("sections") if isinstance(document, dict) else None
+        for key, fingerprint in self.fingerprints["parts"].items():
+            container = document if key in BLOCK_KEYS else sections
+            if not isinstance(container, dict) or key not in container:
+                continue
+            old = old_parts.get(key)
+            if old and old["schema"] == fingerprint:
+                part_errors = [tuple(e) for e in old["errors"]]
+                self.reused += 1
+            else:
+                part_errors = self.sections.validate_section(key, container[key])
+                self.validated += 1
+            parts[key] = {"schema": fingerprint, "errors": [list(e) for e in part_errors]}
+            errors.extend(part_errors)
+        stamp = {"algorithm": ALGORITHM, "root": self.fingerprints["root"], "content": content, "parts": parts}
+        return errors, stamp
+
+
+def _read_stamps(path):
+    stamps = {}
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    stamps[record["source"]] = record
+    return stamps
+
+
+def main(argv=None):
+    from migrate_payloads import iter_sources
+    from schema_diff import load_schema_file
+
+    parser = argparse.ArgumentParser(description="Incrementally revalidate stored payloads using schema fingerprints")
+    parser.add_argument("sources", nargs="+", help="JSONL archives or directories of *.json payloads")
+    parser.add_argument("--stamps", required=True, help="Sidecar JSONL of validation stamps (read, then rewritten)")
+    parser.add_argument("--schema", help="Schema to validate against (builder script or JSON; default: template.py)")
+    args = parser.parse_args(argv)
+
+    schema = load_schema_file(args.schema) if args.schema else None
+    validator = IncrementalValidator(schema)
+    stamps = _read_stamps(args.stamps)
+
+    started = time.perf_counter()
+    documents = failing = 0
+    tmp = f"{args.stamps}.tmp"
+    with open(tmp, "w", encoding="utf-8") as out:
+        for source in args.sources:
+            for name, text in iter_sources(source):
+                errors, stamp = validator.revalidate(json.loads(text), stamps.get(name), text_hash(text))
+                documents += 1
+                failing += bool(errors)
+                out.write(json.dumps({"source": name, **stamp}, ensure_ascii=False) + "\n")
+    os.replace(tmp, args.stamps)
+    elapsed = time.perf_counter() - started
+
+    total = validator.reused + validator.validated
+    print(
+        f"Revalidated {documents:,} payloads in {elapsed:.2f} s: {validator.validated:,} of {total:,} "
+        f"part(s) validated, {validator.reused:,} reused from stamps; {failing:,} invalid"
+    )
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Reference (interpretive) validator for the FormQAR-054 schema.
+
+Walks the schema tree at validation time and supports exactly the JSON
+Schema keywords that template.py uses: type, enum, const, required,
+properties, additionalProperties, items, minItems, maxItems, minLength,
+pattern, minimum, maximum, format ("date" is asserted), $ref and
+allOf/if/then. It is the behavioural baseline for the compiled validator
+in compile_validator.py.
+
+Errors are reported as (json_pointer, message) tuples.
+
+Usage:
+    python scripts/schema_validator.py payload.json [...]
+"""
+
+import datetime
+import json
+import re
+import sys
+
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+_PATTERN_CACHE = {}
+
+
+def pointer_join(pointer, token):
+    """Append one reference token to a JSON pointer (RFC 6901 escaping)."""
+    token = str(token).replace("~", "~0").replace("/", "~1")
+    return f"{pointer}/{token}"
+
+
+def resolve_ref(ref, root):
+    """Resolve a local `#/...` reference against the root schema."""
+    if not ref.startswith("#/"):
+        raise ValueError(f"Unsupported $ref: {ref}")
+    node = root
+    for token in ref[2:].split("/"):
+        node = node[token.replace("~1", "/").replace("~0", "~")]
+    return node
+
+
+def is_type(value, type_name):
+    if type_name == "string":
+        return isinstance(value, str)
+    if type_name == "integer":
+        if isinstance(value, bool):
+            return False
+        return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+    if type_name == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if type_name == "boolean":
+        return isinstance(value, bool)
+    if type_name == "null":
+        return value is None
+    if type_name == "object":
+        return isinstance(value, dict)
+    if type_name == "array":
+        return isinstance(value, list)
+    raise ValueError(f"Unknown JSON type: {type_name}")
+
+
+def json_equal(a, b):
+    """JSON equality: booleans never equal numbers (1 == 1.0, 1 != True), also inside arrays and objects."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(json_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(json_equal(a[k], b[k]) for k in a)
+    return a == b
+
+
+def is_date(value):
+    if not DATE_RE.match(value):
+        return False
+    try:
+        datetime.date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def iter_errors(instance, schema, root=None, pointer=""):
+    """Yield (json_pointer, message) for every violation of `schema` by `instance`."""
+    if root is None:
+        root = schema
+
+    if "$ref" in schema:
+        yield from iter_errors(instance, resolve_ref(schema["$ref"], root), root, pointer)
+
+    if "type" in schema:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        if not any(is_type(instance, t) for t in types):
+            yield pointer, f"{instance!r} is not of type {', '.join(repr(t) for t in types)}"
+            return
+
+    if "const" in schema and not json_equal(instance, schema["const"]):
+        yield pointer, f"{schema['const']!r} was expected"
+
+    if "enum" in schema and not any(json_equal(instance, e) for e in schema["enum"]):
+        yield pointer, f"{instance!r} is not one of {schema['enum']!r}"
+
+    if isinstance(instance, str):
+        if "minLength" in schema and len(instance) < schema["minLength"]:
+            yield pointer, f"{instance!r} is too short"
+        if "pattern" in schema:
+            regex = _PATTERN_CACHE.get(schema["pattern"])
+            if regex is None:
+                regex = _PATTERN_CACHE[schema["pattern"]] = re.compile(schema["pattern"])
+            if not regex.search(instance):
+                yield pointer, f"{instance!r} does not match {schema['pattern']!r}"
+        if schema.get("format") == "date" and not is_date(instance):
+            yield pointer, f"{instance!r} is not a 'date'"
+
+    if isinstance(instance, (int, float)) and not isinstance(instance, bool):
+        if "minimum" in schema and instance < schema["minimum"]:
+            yield pointer, f"{instance!r} is less than the minimum of {schema['minimum']!r}"
+        if "maximum" in schema and instance > schema["maximum"]:
+            yield pointer, f"{instance!r} is greater than the maximum of {schema['maximum']!r}"
+
+    if isinstance(instance, list):
+        if "minItems" in schema and len(instance) < schema["minItems"]:
+            yield pointer, f"{instance!r} should have at least {schema['minItems']} items"
+        if "maxItems" in schema and len(instance) > schema["maxItems"]:
+            yield pointer, f"{instance!r} should have at most {schema['maxItems']} items"
+        if "items" in schema:
+            for i, item in enumerate(instance):
+                yield from iter_errors(item, schema["items"], root, pointer_join(pointer, i))
+
+    if isinstance(instance, dict):
+        for name in schema.get("required", []):
+            if name not in instance:
+                yield pointer, f"{name!r} is a required property"
+        props = schema.get("properties", {})
+        if schema.get("additionalProperties") is False:
+            extras = [k for k in instance if k not in props]
+            if extras:
+                yield pointer, f"Additional properties are not allowed ({', '.join(repr(k) for k in extras)} unexpected)"
+        for name, subschema in props.items():
+            if name in instance:
+                yield from iter_errors(instance[name], subschema, root, pointer_join(pointer, name))
+
+    for clause in schema.get("allOf", []):
+        if "if" in clause:
+            if not any(True for _ in iter_errors(instance, clause["if"], root, pointer)):
+                if "then" in clause:
+                    yield from iter_errors(instance, clause["then"], root, pointer)
+            elif "else" in clause:
+                yield from iter_errors(instance, clause["else"], root, pointer)
+        else:
+            yield from iter_errors(instance, clause, root, pointer)
+
+
+def validate(instance, schema):
+    """Return the list of (json_pointer, message) errors for `instance`."""
+    return list(iter_errors(instance, schema))
+
+
+def main(argv=None):
+    from generate_template_json import load_schema
+
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print("Usage: python scripts/schema_validator.py payload.json [...]", file=sys.stderr)
+        return 2
+    schema = load_schema()
+    failed = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            errors = validate(json.load(f), schema)
+        for pointer, message in errors:
+            print(f"{path}#{pointer}: {message}")
+        failed += bool(errors)
+    print(f"{len(paths) - failed}/{len(paths)} payloads valid")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Per-section split of template.json for lazy loading by the web target.
+
+`build_section_pack()` produces, under template_pack/sections/:
+
+  <section key>.json   one file per section A–M: the section's schema made
+                       standalone (the $defs it references, e.g. TriState or
+                       MDRClass, are copied in), its uiSchema and the
+                       layout.tables entries of that section
+  manifest.json        meta, the UI section order and global options, the
+                       root schema without the sections (form header and
+                       cover page, with their $defs), and per section file
+                       its size, SHA-256 and ETag
+
+A client fetches manifest.json, renders the cover page from it and fetches
+a section file only when that section is opened; each section can be
+cached independently by its content hash.
+"""
+
+import hashlib
+import json
+
+SECTIONS_DIR = "template_pack/sections"
+MANIFEST = "manifest.json"
+DEFS_PREFIX = "#/$defs/"
+
+
+def _refs(node, found):
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith(DEFS_PREFIX):
+            found.add(ref[len(DEFS_PREFIX):])
+        for value in node.values():
+            _refs(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _refs(value, found)
+    return found
+
+
+def referenced_defs(node, defs):
+    """Names of every $defs entry `node` references, transitively, in $defs order."""
+    wanted = _refs(node, set())
+    pending = list(wanted)
+    while pending:
+        for name in _refs(defs[pending.pop()], set()) - wanted:
+            wanted.add(name)
+            pending.append(name)
+    return [name for name in defs if name in wanted]
+
+
+def standalone(node, defs):
+    """`node` with the $defs it needs attached, so its #/$defs/ refs resolve within the file."""
+    names = referenced_defs(node, defs)
+    return {**node, "$defs": {name: defs[name] for name in names}} if names else dict(node)
+
+
+def _section_defs(schema):
+    ref = schema["properties"]["sections"].get("$ref", "")
+    if ref.startswith(DEFS_PREFIX):
+        return schema["$defs"][ref[len(DEFS_PREFIX):]]
+    return schema["properties"]["sections"]
+
+
+def _file_entry(name, data):
+    digest = hashlib.sha256(data).hexdigest()
+    return {"file": name, "bytes": len(data), "sha256": digest, "etag": f'"sha256-{digest}"'}
+
+
+def _render(document):
+    return json.dumps(document, indent=2, ensure_ascii=False)
+
+
+def build_section_pack(template_json):
+    """Return {path relative to the project root: text} for the section files and their manifest."""
+    schema = template_json["schema"]
+    defs = {k: v for k, v in schema["$defs"].items() if k != "sections"}
+    sections = _section_defs(schema)
+    ui_sections = template_json["uiSchema"]["sections"]
+    layout_tables = template_json["layout"]["tables"]
+    meta = {k: template_json["meta"][k] for k in ("id", "revision")}
+
+    artifacts, entries = {}, {}
+    for key in ui_sections["ui:order"]:
+        letter = key.split("_", 1)[0]
+        document = {
+            "meta": {**meta, "source": "template.json", "section": key},
+            "required": key in sections.get("required", []),
+            "schema": standalone(sections["properties"][key], defs),
+            "uiSchema": ui_sections.get(key, {}),
+            "layoutTables": {k: v for k, v in layout_tables.items() if k.split(".", 1)[0] == letter},
+        }
+        text = _render(document)
+        name = f"{key}.json"
+        artifacts[f"{SECTIONS_DIR}/{name}"] = text
+        entries[key] = _file_entry(name, text.encode("utf-8"))
+
+    root = {k: v for k, v in schema.items() if k not in ("properties", "$defs")}
+    root["properties"] = {k: v for k, v in schema["properties"].items() if k != "sections"}
+    root["required"] = [k for k in schema.get("required", []) if k != "sections"]
+    manifest = {
+        "meta": {**meta, "source": "template.json", "renderer_targets": template_json["meta"].get("renderer_targets", [])},
+        "uiOrder": list(ui_sections["ui:order"]),
+        "globalOptions": template_json["uiSchema"].get("ui:globalOptions", {}),
+        "rootSchema": standalone(root, defs),
+        "sections": entries,
+    }
+    artifacts[f"{SECTIONS_DIR}/{MANIFEST}"] = _render(manifest)
+    return artifacts
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Per-section partial validation for blur-time validation in the web target.
+
+The uiSchema sets `"validateOn": "blur"`. Rather than revalidating the whole
+document on every blur, `SectionValidator` validates only the part that
+changed, using the compiled per-section validators from
+compile_validator.py:
+
+  - `validate_section(key, value)` checks one section A–M (or the `form` /
+    `psur_cover_page` blocks);
+  - `validate_patch(document, patch)` applies an RFC 6902 JSON Patch and
+    revalidates only the sections its operations touch.
+
+A caller that already knows a section's content hash (recorded when it was
+stored, or tracked by the editor) can pass it as `digest`; results are then
+cached under it, so an unchanged section is never revalidated. Without a
+digest the section is simply validated: hashing its canonical JSON costs
+more than the compiled validator does. `validate_patch` keeps such digests
+current without rehashing: a part the patch leaves alone keeps its digest,
+and a touched part's new digest is chained from the old ones and the patch
+(`patched_digests`). Errors are (json_pointer, message) tuples with
+document-absolute pointers.
+
+Usage:
+    python scripts/section_validation.py payload.json
+    python scripts/section_validation.py payload.json --section F_product_complaint_types_counts_and_rates
+    python scripts/section_validation.py payload.json --patch delta.json
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import sys
+from collections import OrderedDict
+
+from compile_validator import load_compiled_validator
+from generate_template_json import load_schema
+from schema_validator import json_equal, pointer_join, resolve_ref
+
+BLOCK_KEYS = ("form", "psur_cover_page")
+
+
+class PatchError(ValueError):
+    """A JSON Patch operation could not be applied."""
+
+
+# ── JSON Pointer / JSON Patch ─────────────────────────────────────
+
+
+def parse_pointer(pointer):
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _container(document, tokens, pointer):
+    node = document
+    for token in tokens[:-1]:
+        try:
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise PatchError(f"Path not found: {pointer}") from None
+    return node
+
+
+def _index(parent, token, pointer, end_ok):
+    """List index for `token`; "-" (one past the end) only when `end_ok`."""
+    if token == "-" and end_ok:
+        return len(parent)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise PatchError(f"Invalid array index: {pointer}")
+    index = int(token)
+    if index > len(parent) or (index == len(parent) and not end_ok):
+        raise PatchError(f"Index out of range: {pointer}")
+    return index
+
+
+def _get(document, pointer):
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        return document
+    parent = _container(document, tokens, pointer)
+    try:
+        return parent[int(tokens[-1])] if isinstance(parent, list) else parent[tokens[-1]]
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise PatchError(f"Path not found: {pointer}") from None
+
+
+def _remove(document, pointer):
+    """Remove the value at `pointer`; return (value, undo)."""
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        raise PatchError("Removing the whole document is not supported")
+    parent = _container(document, tokens, pointer)
+    token = tokens[-1]
+    if isinstance(parent, list):
+        index = _index(parent, token, pointer, end_ok=False)
+        value = parent.pop(index)
+        return value, lambda: parent.insert(index, value)
+    if not isinstance(parent, dict) or token not in parent:
+        raise PatchError(f"Path not found: {pointer}")
+    value = parent.pop(token)
+    return value, lambda: parent.__setitem__(token, value)
+
+
+def _add(document, pointer, value, replace=False):
+    """Add (or replace) the value at `pointer`; return the undo callable."""
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        raise PatchError("Replacing the whole document is not supported")
+    parent = _container(document, tokens, pointer)
+    token = tokens[-1]
+    if isinstance(parent, list):
+        index = _index(parent, token, pointer, end_ok=not replace)
+        if replace:
+            old = parent[index]
+            parent[index] = value
+            return lambda: parent.__setitem__(index, old)
+        parent.insert(index, value)
+        return lambda: parent.pop(index)
+    if not isinstance(parent, dict):
+        raise PatchError(f"Path not found: {pointer}")
+    if token in parent:
+        old = parent[token]
+        parent[token] = value
+        return lambda: parent.__setitem__(token, old)
+    if replace:
+        raise PatchError(f"Path not found: {pointer}")
+    parent[token] = value
+    return lambda: parent.pop(token)
+
+
+def _apply_op(document, op):
+    """Apply one patch operation; return its undo callables in the order they must run."""
+    kind, path = op.get("op"), op.get("path")
+    if path is None:
+        raise PatchError(f"Patch op {kind!r} has no path")
+    if kind == "add":
+        return [_add(document, path, copy.deepcopy(op["value"]))]
+    if kind == "remove":
+        return [_remove(document, path)[1]]
+    if kind == "replace":
+        return [_add(document, path, copy.deepcopy(op["value"]), replace=True)]
+    if kind == "move":
+        value, undo_remove = _remove(document, op["from"])
+        try:
+            undo_add = _add(document, path, value)
+        except PatchError:
+            undo_remove()
+            raise
+        return [undo_add, undo_remove]
+    if kind == "copy":
+        return [_add(document, path, copy.deepcopy(_get(document, op["from"])))]
+    if kind == "test":
+        if not json_equal(_get(document, path), op["value"]):
+            raise PatchError(f"Test failed at {path}")
+        return []
+    raise PatchError(f"Unknown patch op: {kind!r}")
+
+
+def apply_json_patch(document, patch):
+    """Apply an RFC 6902 patch to `document` in place and return it.
+
+    The patch is atomic: if any operation fails, the ones already applied
+    are undone before the PatchError propagates.
+    """
+    undo = []
+    try:
+        for op in patch:
+            undo.extend(_apply_op(document, op))
+    except BaseException:
+        for step in reversed(undo):
+            step()
+        raise
+    return document
+
+
+def affected_parts(patch):
+    """Section/block keys touched by `patch`; None when it touches the document root or the sections map."""
+    parts = set()
+    for op in patch:
+        for pointer in (op.get("path"), op.get("from")):
+            if pointer is None:
+                continue
+            tokens = parse_pointer(pointer)
+            if len(tokens) >= 2 and tokens[0] == "sections":
+                parts.add(tokens[1])
+            elif len(tokens) >= 1 and tokens[0] in BLOCK_KEYS:
+                parts.add(tokens[0])
+            else:
+                return None
+    return parts
+
+
+# ── Validator ─────────────────────────────────────────────────────
+
+
+def content_hash(value):
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def patched_digests(digests, patch):
+    """Part digests after `patch`, given those before it; None if the patch touches the root.
+
+    Untouched parts keep their digest. Applying the same patch to the same
+    touched content always gives the same result, so a touched part's new
+    digest hashes its old digest, the old digests of every touched part (the
+    source of a move/copy) and the patch. Parts without a known digest stay
+    unknown.
+    """
+    keys = affected_parts(patch)
+    if keys is None:
+        return None
+    out = dict(digests)
+    before = [digests.get(key) for key in sorted(keys)]
+    if any(d is None for d in before):
+        for key in keys:
+            out.pop(key, None)
+        return out
+    patch_hash = content_hash(patch)
+    for key in keys:
+        out[key] = hashlib.sha256("\0".join([digests[key], *before, patch_hash]).encode("utf-8")).hexdigest()
+    return out
+
+
+class SectionValidator:
+    """Validate sections independently, caching results by caller-supplied content hash."""
+
+    def __init__(self, schema=None, validator=None, cache_size=4096):
+        self.schema = schema if schema is not None else load_schema()
+        self.validator = validator or load_compiled_validator(self.schema)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        sections_def = resolve_ref(self.schema["properties"]["sections"]["$ref"], self.schema)
+        self._section_keys = list(sections_def["properties"])
+        self._section_required = list(sections_def.get("required", []))
+
+    def _pointer(self, key):
+        return f"/{key}" if key in BLOCK_KEYS else pointer_join("/sections", key)
+
+    def _function(self, key):
+        if key in BLOCK_KEYS:
+            return self.validator.BLOCK_VALIDATORS[key]
+        try:
+            return self.validator.SECTION_VALIDATORS[key]
+        except KeyError:
+            raise KeyError(f"Unknown section: {key}") from None
+
+    def validate_section(self, key, value, digest=None):
+        """Errors for one section (or block) value.
+
+        `digest` identifies the value's content (e.g. `content_hash(value)`
+        recorded at write time); results are cached under it when given.
+        """
+        fn = self._function(key)
+        pointer = self._pointer(key)
+        if not isinstance(value, dict):
+            return [(pointer, f"{value!r} is not of type 'object'")]
+        if digest is None:
+            errors = []
+            fn(value, pointer, errors)
+            return errors
+        cache_key = (key, digest)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(cache_key)
+            return list(cached)
+        self.misses += 1
+        errors = []
+        fn(value, pointer, errors)
+        self._cache[cache_key] = tuple(errors)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return errors
+
+    def _structural_errors(self, document):
+        """Root- and sections-level required/unexpected keys (cheap; never cached)."""
+        errors = []
+        if not isinstance(document, dict):
+            return [("", f"{document!r} is not of type 'object'")]
+        for key in self.schema.get("required", []):
+            if key not in document:
+                errors.append(("", f"{key!r} is a required property"))
+        extras = [k for k in document if k not in self.schema["properties"]]
+        if extras:
+            errors.append(("", f"Additional properties are not allowed ({', '.join(repr(k) for k in extras)} unexpected)"))
+        sections = document.get("sections")
+        if isinstance(sections, dict):
+            for key in self._section_required:
+                if key not in sections:
+                    errors.append(("/sections", f"{key!r} is a required property"))
+            extras = [k for k in sections if k not in self._section_keys]
+            if extras:
+                errors.append(("/sections", f"Additional properties are not allowed ({', '.join(repr(k) for k in extras)} unexpected)"))
+        elif sections is not None:
+            errors.append(("/sections", f"{sections!r} is not of type 'object'"))
+        return errors
+
+    def validate_parts(self, document, keys, digests=None):
+        """{key: errors} for the given section/block keys present in `document`.
+
+        `digests` optionally maps keys to content hashes (see `validate_section`).
+        """
+        results = {}
+        digests = digests or {}
+        sections = document.get("sections") if isinstance(document, dict) else None
+        for key in keys:
+            container = document if key in BLOCK_KEYS else sections
+            if isinstance(container, dict) and key in container:
+                results[key] = self.validate_section(key, container[key], digests.get(key))
+        return results
+
+    def validate_document(self, document, digests=None):
+        """Full validation assembled from per-part results (cached for parts with a digest)."""
+        errors = self._structural_errors(document)
+        keys = BLOCK_KEYS + tuple(self._section_keys)
+        for part_errors in self.validate_parts(document, keys, digests).values():
+            errors.extend(part_errors)
+        return errors
+
+    def part_digests(self, document, keys=None):
+        """{key: content_hash} for the sections/blocks (default: all) present in `document`.
+
+        Seeds the `digests` argument of `validate_patch`.
+        """
+        sections = document.get("sections") if isinstance(document, dict) else None
+        digests = {}
+        for key in BLOCK_KEYS + tuple(self._section_keys) if keys is None else keys:
+            container = document if key in BLOCK_KEYS else sections
+            if isinstance(container, dict) and key in container:
+                digests[key] = content_hash(container[key])
+        return digests
+
+    def validate_patch(self, document, patch, digests=None):
+        """Apply `patch` to `document` in place; return {key: errors} for the parts it touched.
+
+        With `digests` (part key -> digest of the content before the patch,
+        e.g. from `part_digests`), every part is returned: the ones the patch
+        leaves alone come from the cache. `digests` is updated in place to
+        the post-patch digests so the next patch can reuse them.
+        Structural errors (missing or unexpected sections) are reported under the key "".
+        """
+        apply_json_patch(document, patch)
+        keys = affected_parts(patch)
+        if digests is not None:
+            updated = patched_digests(digests, patch)
+            if updated is None:
+                updated = self.part_digests(document)
+            else:
+                # Touched parts whose prior content was unknown are hashed once here.
+                updated.update(self.part_digests(document, [k for k in keys if k not in updated]))
+            digests.clear()
+            digests.update(updated)
+            keys = BLOCK_KEYS + tuple(self._section_keys)
+        elif keys is None:
+            keys = BLOCK_KEYS + tuple(self._section_keys)
+        results = self.validate_parts(document, keys, digests)
+        results[""] = self._structural_errors(document)
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a payload section by section")
+    parser.add_argument("payload")
+    parser.add_argument("--section", help="Validate only this section (or 'form' / 'psur_cover_page')")
+    parser.add_argument("--patch", help="JSON Patch file to apply before validating the touched sections")
+    args = parser.parse_args(argv)
+
+    with open(args.payload, encoding="utf-8") as f:
+        document = json.load(f)
+    validator = SectionValidator()
+
+    if args.patch:
+        with open(args.patch, encoding="utf-8") as f:
+            results = validator.validate_patch(document, json.load(f))
+        errors = [e for part in results.values() for e in part]
+    elif args.section:
+        container = document if args.section in BLOCK_KEYS else document.get("sections", {})
+        errors = validator.validate_section(args.section, container.get(args.section))
+    else:
+        errors = validator.validate_document(document)
+
+    for pointer, message in errors:
+        print(f"{pointer}: {message}")
+    print(f"{len(errors)} error(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
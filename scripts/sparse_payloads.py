@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Default-elided sparse storage for filled FormQAR-054 payloads.
+
+Most fields carry a schema default (checkboxes `false`, TriState / YesNoNA /
+MDRClass selects `NOT_SELECTED`) and stored payloads repeat them thousands
+of times. The sparse encoding walks a payload alongside the flat schema and
+
+  - drops every property whose value equals its schema `default` (or
+    `const`), recording the rare *missing* defaulted property under
+    "$absent" so the decoder does not invent it;
+  - replaces enum values with their index in the schema's enum order;
+  - keeps everything else (free text, numbers, unknown properties, values
+    outside the schema) verbatim.
+
+Decoding restores a payload equal to the original (`decode(encode(p)) == p`,
+key order follows the schema). Encoded documents are stamped with the
+codec id, a hash over the enum orders and defaults they depend on, and are
+only decoded with a matching schema.
+
+Usage:
+    python scripts/sparse_payloads.py encode corpus.jsonl --out corpus.sparse.jsonl
+    python scripts/sparse_payloads.py decode corpus.sparse.jsonl --out corpus.jsonl
+    python scripts/sparse_payloads.py bench corpus.jsonl
+
+Programmatic use:
+    from sparse_payloads import SparseCodec
+    codec = SparseCodec()
+    stored = codec.encode(payload)
+    assert codec.decode(stored) == payload
+"""
+
+import argparse
+import copy
+import gc
+import gzip
+import hashlib
+import json
+import sys
+import time
+
+from flatten_schema import flatten_template
+from generate_template_json import build_template
+from migrate_payloads import iter_sources
+
+FORMAT = "psur-sparse/1"
+ABSENT = "$absent"
+RAW = "$raw"
+
+OBJECT, ENUM, ARRAY = range(3)
+
+
+class SparseError(ValueError):
+    """An encoded document cannot be decoded with this schema."""
+
+
+def _types(node):
+    t = node.get("type", "object")
+    return t if isinstance(t, list) else [t]
+
+
+def _plan(node):
+    """Codec plan for a flat schema node: (OBJECT, props, defaults), (ENUM, values, codes), (ARRAY, item) or None."""
+    if "properties" in node:
+        props, defaults = {}, {}
+        for name, child in node["properties"].items():
+            if name.startswith("$"):
+                raise ValueError(f"Property name {name!r} clashes with the sparse encoding's reserved keys")
+            props[name] = _plan(child)
+            if "default" in child:
+                defaults[name] = child["default"]
+            elif "const" in child:
+                defaults[name] = child["const"]
+        return (OBJECT, props, defaults)
+    if "enum" in node:
+        values = list(node["enum"])
+        codes = {v: i for i, v in enumerate(values) if isinstance(v, str)}
+        return (ENUM, values, codes) if codes else None
+    if "array" in _types(node) and "items" in node:
+        item = _plan(node["items"])
+        return (ARRAY, item) if item is not None else None
+    return None
+
+
+def _describe(plan):
+    """JSON-serializable form of a plan (what the codec id hashes)."""
+    if plan is None:
+        return 0
+    if plan[0] == OBJECT:
+        return {"p": {n: _describe(c) for n, c in plan[1].items()}, "d": plan[2]}
+    if plan[0] == ENUM:
+        return {"e": plan[1]}
+    return {"i": _describe(plan[1])}
+
+
+def _same(value, default):
+    return type(value) is type(default) and value == default
+
+
+def _escape(key):
+    return "$" + key if key.startswith("$") else key
+
+
+def _encode(plan, value):
+    if plan is None:
+        return value
+    kind = plan[0]
+    if kind == OBJECT:
+        if type(value) is not dict:
+            return value
+        props, defaults = plan[1], plan[2]
+        out = {}
+        for key, item in value.items():
+            child = props.get(key, False)
+            if child is False:
+                out[_escape(key)] = item
+            elif key in defaults and _same(item, defaults[key]):
+                continue
+            else:
+                out[key] = _encode(child, item)
+        absent = [key for key in defaults if key not in value]
+        if absent:
+            out[ABSENT] = absent
+        return out
+    if kind == ENUM:
+        if type(value) is str:
+            code = plan[2].get(value)
+            return value if code is None else code
+        # Numbers and objects would be read back as codes / wrappers.
+        return {RAW: value} if type(value) in (int, float, dict) else value
+    if type(value) is not list:
+        return value
+    item = plan[1]
+    return [_encode(item, v) for v in value]
+
+
+def _decode(plan, value):
+    if plan is None:
+        return value
+    kind = plan[0]
+    if kind == OBJECT:
+        if type(value) is not dict:
+            return value
+        props, defaults = plan[1], plan[2]
+        absent = value.get(ABSENT, ())
+        out = {}
+        for key, child in props.items():
+            if key in value:
+                out[key] = _decode(child, value[key])
+            elif key in defaults and key not in absent:
+                default = defaults[key]
+                out[key] = copy.deepcopy(default) if isinstance(default, (dict, list)) else default
+        for key, item in value.items():
+            if key not in props and key != ABSENT:
+                out[key[1:] if key.startswith("$$") else key] = item
+        return out
+    if kind == ENUM:
+        if type(value) is int:
+            try:
+                return plan[1][value]
+            except IndexError:
+                raise SparseError(f"Enum code {value} out of range") from None
+        if type(value) is dict:
+            return value[RAW]
+        return value
+    if type(value) is not list:
+        return value
+    item = plan[1]
+    return [_decode(item, v) for v in value]
+
+
+class SparseCodec:
+    """Encode / decode payloads against one schema revision."""
+
+    def __init__(self, flat=None):
+        flat = flat or flatten_template(build_template())
+        root = {
+            "properties": {
+                "form": flat["form"],
+                "psur_cover_page": flat["psur_cover_page"],
+                "sections": {"properties": {key: flat["sections"][key] for key in flat["sectionOrder"]}},
+            }
+        }
+        self.plan = _plan(root)
+        digest = hashlib.sha256(json.dumps(_describe(self.plan), sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        self.codec_id = digest.hexdigest()[:16]
+
+    def encode(self, payload):
+        """Sparse document for `payload`: {"format", "codec", "data"}."""
+        return {"format": FORMAT, "codec": self.codec_id, "data": _encode(self.plan, payload)}
+
+    def decode(self, document):
+        if document.get("format") != FORMAT:
+            raise SparseError(f"Not a {FORMAT} document")
+        if document.get("codec") != self.codec_id:
+            raise SparseError(
+                f"Document was encoded with codec {document.get('codec')}, this schema is {self.codec_id}"
+            )
+        return _decode(self.plan, document["data"])
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+# ── Benchmark ─────────────────────────────────────────────────────
+
+
+def run_benchmark(codec, sources):
+    plain, sparse = [], []
+    for source in sources:
+        for _, text in iter_sources(source):
+            payload = json.loads(text)
+            plain.append(_dumps(payload))
+            sparse.append(_dumps(codec.encode(payload)))
+    if not plain:
+        print("No payloads found")
+        return 1
+
+    def timed(decode, texts):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            values = [decode(t) for t in texts]
+            return values, time.perf_counter() - started
+        finally:
+            gc.enable()
+
+    originals, plain_s = timed(json.loads, plain)
+    restored, sparse_s = timed(lambda t: codec.decode(json.loads(t)), sparse)
+    mismatches = sum(a != b for a, b in zip(originals, restored))
+
+    def sizes(texts):
+        blob = "\n".join(texts).encode("utf-8")
+        return len(blob), len(gzip.compress(blob, 6))
+
+    plain_raw, plain_gz = sizes(plain)
+    sparse_raw, sparse_gz = sizes(sparse)
+    count = len(plain)
+    print(f"Corpus: {count:,} payloads")
+    print(f"Plain JSON:  {plain_raw / 1e6:8.2f} MB   gzip {plain_gz / 1e6:8.2f} MB")
+    print(
+        f"Sparse JSON: {sparse_raw / 1e6:8.2f} MB   gzip {sparse_gz / 1e6:8.2f} MB "
+        f"({plain_raw / sparse_raw:.2f}x / {plain_gz / sparse_gz:.2f}x smaller)"
+    )
+    print(f"Decode: plain {count / plain_s:,.0f} payloads/s   sparse {count / sparse_s:,.0f} payloads/s")
+    print(f"Round-trip mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Default-elided sparse storage for FormQAR-054 payloads")
+    parser.add_argument("mode", choices=("encode", "decode", "bench"))
+    parser.add_argument("sources", nargs="+", help="JSONL archives or directories of *.json payloads")
+    parser.add_argument("--out", help="Output JSONL path (encode / decode; default: stdout)")
+    args = parser.parse_args(argv)
+
+    codec = SparseCodec()
+    if args.mode == "bench":
+        return run_benchmark(codec, args.sources)
+
+    convert = codec.encode if args.mode == "encode" else codec.decode
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for source in args.sources:
+            for name, text in iter_sources(source):
+                try:
+                    out.write(_dumps(convert(json.loads(text))) + "\n")
+                except SparseError as exc:
+                    print(f"{name}: {exc}", file=sys.stderr)
+                    return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Batched Western Electric / Nelson rule evaluation over a series × months matrix.
+
+`evaluateWesternElectric` (src/analytics/western-electric.ts) checks one
+series at a time, slicing and filtering every window. Here all series are
+evaluated together: each rule is a comparison against the per-series
+control limits followed by a rolling-window count taken from a cumulative
+sum along the months axis, so the work is a handful of array operations
+per rule regardless of how many series there are.
+
+  RULE_1  one point beyond 3σ from the center line
+  RULE_2  2 of 3 consecutive points beyond 2σ on the same side
+  RULE_3  4 of 5 consecutive points beyond 1σ on the same side
+  RULE_4  8 consecutive points on the same side of the center line
+  RULE_5  6 consecutive points steadily increasing or decreasing   (Nelson 3)
+  RULE_6  14 consecutive points alternating up and down            (Nelson 4)
+  RULE_7  15 consecutive points within 1σ of the center line       (Nelson 7)
+  RULE_8  8 consecutive points beyond 1σ, on both sides, none
+          within 1σ                                                (Nelson 8)
+
+Rules 1–4 reproduce the TS evaluator exactly: the same comparisons, the
+same violation objects (rule, description, periods, values) in the same
+order, and no violations for a series of fewer than 2 points or with
+σ = 0. Rules 5–8 complete the Nelson set; the remaining Nelson rules (1,
+2, 5, 6) are covered by, or are variants of, Rules 1–4.
+
+Rows are series, left-aligned: series s occupies columns [0, lengths[s])
+and anything after that is ignored.
+
+Usage:
+    python scripts/spc_rules.py packs/demo_cardio_2023
+    python scripts/spc_rules.py portfolio/ --rules nelson --out build/violations.jsonl
+
+Programmatic use:
+    from spc_rules import NELSON, evaluate_rules
+    violations = evaluate_rules(rates, periods, lengths, rules=NELSON)   # [[violation, ...] per series]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from complaint_trends import DEFAULT_BY, js_to_fixed, json_number
+
+WESTERN_ELECTRIC = ("RULE_1", "RULE_2", "RULE_3", "RULE_4")
+NELSON = WESTERN_ELECTRIC + ("RULE_5", "RULE_6", "RULE_7", "RULE_8")
+RULE_SETS = {"western-electric": WESTERN_ELECTRIC, "nelson": NELSON}
+
+
+def moments(rates, lengths):
+    """(mean, population σ) per series, summed left to right as stats.ts does."""
+    count, n = rates.shape
+    mean = np.zeros(count)
+    squares = np.zeros(count)
+    columns = np.arange(n)
+    inside = columns[None, :] < lengths[:, None]
+    for m in range(n):
+        mean += np.where(inside[:, m], rates[:, m], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(lengths > 0, mean / lengths, 0.0)
+    for m in range(n):
+        diff = rates[:, m] - mean
+        squares += np.where(inside[:, m], diff * diff, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma = np.where(lengths > 0, np.sqrt(squares / lengths), 0.0)
+    return mean, sigma
+
+
+def window_counts(flags, width):
+    """[series, start] number of set flags in each run of `width` consecutive columns."""
+    count, n = flags.shape
+    if n < width:
+        return np.zeros((count, 0), dtype=np.int32)
+    cumulative = np.zeros((count, n + 1), dtype=np.int32)
+    np.cumsum(flags, axis=1, out=cumulative[:, 1:])
+    return cumulative[:, width:] - cumulative[:, :-width]
+
+
+# Each rule: (window width, description per side, kernel); a kernel returns
+# one [series, start] hit matrix per side, in the order TS reports them.
+
+
+def _rule_1(rates, mean, sigma):
+    return [np.abs(rates - mean[:, None]) > (3 * sigma)[:, None]]
+
+
+def _rule_2(rates, mean, sigma):
+    return [
+        window_counts(rates > (mean + 2 * sigma)[:, None], 3) >= 2,
+        window_counts(rates < (mean - 2 * sigma)[:, None], 3) >= 2,
+    ]
+
+
+def _rule_3(rates, mean, sigma):
+    return [
+        window_counts(rates > (mean + sigma)[:, None], 5) >= 4,
+        window_counts(rates < (mean - sigma)[:, None], 5) >= 4,
+    ]
+
+
+def _rule_4(rates, mean, sigma):
+    return [
+        window_counts(rates > mean[:, None], 8) == 8,
+        window_counts(rates < mean[:, None], 8) == 8,
+    ]
+
+
+def _rule_5(rates, mean, sigma):
+    step = np.diff(rates, axis=1)
+    return [window_counts(step > 0, 5) == 5, window_counts(step < 0, 5) == 5]
+
+
+def _rule_6(rates, mean, sigma):
+    direction = np.sign(np.diff(rates, axis=1))
+    return [window_counts(direction[:, :-1] * direction[:, 1:] < 0, 12) == 12]
+
+
+def _rule_7(rates, mean, sigma):
+    return [window_counts(np.abs(rates - mean[:, None]) < sigma[:, None], 15) == 15]
+
+
+def _rule_8(rates, mean, sigma):
+    above = rates > (mean + sigma)[:, None]
+    below = rates < (mean - sigma)[:, None]
+    return [(window_counts(above | below, 8) == 8) & (window_counts(above, 8) > 0) & (window_counts(below, 8) > 0)]
+
+
+RULES = {
+    "RULE_1": (1, (None,), _rule_1),
+    "RULE_2": (3, ("2 of 3 consecutive points above 2σ", "2 of 3 consecutive points below 2σ"), _rule_2),
+    "RULE_3": (5, ("4 of 5 consecutive points above 1σ", "4 of 5 consecutive points below 1σ"), _rule_3),
+    "RULE_4": (8, ("8 consecutive points above center line", "8 consecutive points below center line"), _rule_4),
+    "RULE_5": (6, ("6 consecutive points increasing", "6 consecutive points decreasing"), _rule_5),
+    "RULE_6": (14, ("14 consecutive points alternating up and down",), _rule_6),
+    "RULE_7": (15, ("15 consecutive points within 1σ of center line",), _rule_7),
+    "RULE_8": (8, ("8 consecutive points beyond 1σ on both sides of center line",), _rule_8),
+}
+
+
+def rule_hits(rates, lengths, mean, sigma, rules=WESTERN_ELECTRIC, last_only=False):
+    """{rule: [series, start, side] bool matrix} of window starts violating each rule.
+
+    With `last_only`, only the window ending at each series' last point is kept.
+    """
+    eligible = (lengths >= 2) & (sigma != 0)
+    hits = {}
+    for rule in rules:
+        width, sides, kernel = RULES[rule]
+        with np.errstate(invalid="ignore"):
+            per_side = kernel(rates, mean, sigma)
+        stacked = np.stack(per_side, axis=-1)
+        starts = np.arange(stacked.shape[1])[None, :]
+        last = (lengths - width)[:, None]
+        stacked &= (starts == last if last_only else starts <= last)[:, :, None]
+        stacked &= eligible[:, None, None]
+        hits[rule] = stacked
+    return hits
+
+
+def evaluate_rules(rates, periods, lengths=None, rules=WESTERN_ELECTRIC, mean=None, sigma=None, last_only=False):
+    """[[WesternElectricViolation, ...] for each series], in evaluateWesternElectric's order.
+
+    `rates` is a series × months matrix; `periods` either one list of month
+    labels shared by every row or a matching matrix of labels per series.
+    `mean` / `sigma` default to the moments of each row's first
+    `lengths[s]` values (all columns when `lengths` is omitted). With
+    `last_only`, only windows ending at each series' last point are reported.
+    """
+    rates = np.asarray(rates, dtype=np.float64)
+    count, n = rates.shape
+    lengths = np.full(count, n, dtype=np.int64) if lengths is None else np.asarray(lengths, dtype=np.int64)
+    if mean is None or sigma is None:
+        mean, sigma = moments(rates, lengths)
+    shared = not isinstance(periods, np.ndarray) or periods.ndim == 1
+    labels, values = {}, {}
+
+    def row(s):
+        if s not in labels:
+            labels[s] = list(periods) if shared else periods[s, :lengths[s]].tolist()
+            values[s] = [json_number(v) for v in rates[s, :lengths[s]].tolist()]
+        return labels[s], values[s]
+
+    violations = [[] for _ in range(count)]
+    for rule, hits in rule_hits(rates, lengths, mean, sigma, rules, last_only).items():
+        width, sides, _ = RULES[rule]
+        for s, i, side in zip(*(axis.tolist() for axis in np.nonzero(hits))):
+            names, series = row(s)
+            window = series[i:i + width]
+            if rule == "RULE_1":
+                description = (
+                    f"Point at {names[i]} is beyond 3σ from center line "
+                    f"(value: {js_to_fixed(window[0])}, UCL: {js_to_fixed(mean[s] + 3 * sigma[s])})"
+                )
+            else:
+                description = f"{sides[side]} in periods {', '.join(names[i:i + width])}"
+            violations[s].append({
+                "rule": rule,
+                "description": description,
+                "periods": names[i:i + width],
+                "values": window,
+            })
+    return violations
+
+
+def main(argv=None):
+    from complaint_trends import build_series, read_pack
+
+    parser = argparse.ArgumentParser(description="Western Electric / Nelson rules for every series of a data pack")
+    parser.add_argument("pack", help="Pack directory containing normalized/complaints.csv and normalized/sales.csv")
+    parser.add_argument("--by", default=",".join(DEFAULT_BY),
+                        help="Comma-separated grouping columns (default: %(default)s; \"\" for the portfolio series)")
+    parser.add_argument("--rules", choices=sorted(RULE_SETS), default="western-electric",
+                        help="Rule set to evaluate (default: %(default)s)")
+    parser.add_argument("--out", help="Write {key, violations} lines for series with violations to this JSONL file")
+    args = parser.parse_args(argv)
+
+    by = tuple(c for c in args.by.split(",") if c)
+    grid = build_series(*read_pack(args.pack, by), by=by)
+    started = time.perf_counter()
+    violations = grid.violations(RULE_SETS[args.rules])
+    elapsed = time.perf_counter() - started
+
+    per_rule = dict.fromkeys(RULE_SETS[args.rules], 0)
+    flagged = 0
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    try:
+        for s, found in enumerate(violations):
+            for violation in found:
+                per_rule[violation["rule"]] += 1
+            if found:
+                flagged += 1
+                if out:
+                    out.write(json.dumps({"key": grid.key_dict(s), "violations": found}, ensure_ascii=False) + "\n")
+    finally:
+        if out:
+            out.close()
+
+    for rule, count in per_rule.items():
+        print(f"  {rule}: {count:,} violation(s)")
+    print(f"Evaluated {len(grid):,} series in {elapsed:.2f} s: {flagged:,} with violations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Streaming validation of FormQAR-054 payloads with very large tables.
+
+Tables such as D.table_2_serious_incidents_by_imdrf_annex_a_by_region can
+carry tens of thousands of rows; loading a 200 MB payload just to validate
+it is not an option on the workers. `StreamValidator` reads the payload in
+fixed-size chunks and walks it structurally:
+
+  - objects on the path to a table are tokenized key by key;
+  - every row of a table array is decoded on its own, checked against the
+    compiled row validator (its `additionalProperties: False` item schema)
+    and discarded;
+  - every other value is decoded whole (these are small form fields).
+
+Everything outside the tables is then validated as one small skeleton
+document in which each table is empty; minItems/maxItems of the tables
+are checked against the streamed row counts instead. Memory is bounded by the chunk
+size, the largest single row and the size of the non-table fields,
+independent of the number of rows.
+
+Errors are (json_pointer, message) tuples, identical to those of the full
+validator except that a table is shown as `[<N rows>]` in item-count messages.
+
+Usage:
+    python scripts/stream_validator.py payload.json [--max-errors 100] [--chunk-size 1048576]
+    python scripts/stream_validator.py --self-check   # chunk-boundary sweep of the reader
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+
+from compile_validator import load_compiled_validator
+from generate_template_json import load_schema
+from schema_validator import pointer_join, resolve_ref
+
+CHUNK_SIZE = 1 << 20
+_WHITESPACE = " \t\n\r"
+# Characters that can continue a number the decoder has stopped short of.
+_NUMBER_TAIL = ".eE+-0123456789"
+# A decode error this close to the buffer end may be a token cut by the chunk
+# edge ("tru", "-Infinit", "\u00"); further back it is a real syntax error.
+_TRUNCATION_WINDOW = 16
+_DECODER = json.JSONDecoder()
+
+
+class StreamError(ValueError):
+    """The payload is not well-formed JSON."""
+
+
+class _Reader:
+    """Chunked text reader that keeps only the unconsumed tail of the input in memory."""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.chars = 0
+
+    def _fill(self):
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.chars += len(chunk)
+        self.buf += chunk
+        return True
+
+    def peek(self):
+        """Next non-whitespace character without consuming it ('' at end of input)."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars):
+        c = self.peek()
+        if c not in chars or not c:
+            raise StreamError(f"Expected one of {chars!r} at offset {self.offset}, found {c!r}")
+        self.pos += 1
+        return c
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as exc:
+                offset = self.chars - (len(self.buf) - exc.pos)
+                truncated = exc.msg.startswith("Unterminated string") or exc.pos + _TRUNCATION_WINDOW >= len(self.buf)
+                if not truncated or self.eof or not self._fill():
+                    raise StreamError(f"Invalid JSON at offset {offset}: {exc.msg}") from None
+                continue
+            # A number that ends at, or just before, the buffer edge may continue in the next
+            # chunk: "1" of "1.5", "1." of "1.25" and "-12" of "-12e3" all decode as ints.
+            if (
+                not self.eof
+                and isinstance(value, (int, float))
+                and (end == len(self.buf) or (self.buf[end] in _NUMBER_TAIL and end + 2 >= len(self.buf)))
+                and self._fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+    @property
+    def offset(self):
+        return self.chars - (len(self.buf) - self.pos)
+
+
+class StreamValidator:
+    """Validate payloads from a file object without materializing their tables."""
+
+    def __init__(self, schema=None, validator=None, chunk_size=CHUNK_SIZE):
+        self.schema = schema if schema is not None else load_schema()
+        self.validator = validator or load_compiled_validator(self.schema)
+        self.chunk_size = chunk_size
+        self.tables = dict(self.validator.TABLE_ROW_VALIDATORS)
+        self._bounds = {pointer: self._table_bounds(pointer) for pointer in self.tables}
+        self._ancestors = {""}
+        for pointer in self.tables:
+            parts = pointer.split("/")
+            self._ancestors.update("/".join(parts[:i]) for i in range(1, len(parts)))
+        self.rows = 0
+
+    def _table_bounds(self, pointer):
+        node = self.schema
+        for token in pointer[1:].split("/"):
+            if "$ref" in node:
+                node = resolve_ref(node["$ref"], self.schema)
+            node = node["properties"][token]
+        if "$ref" in node:
+            node = resolve_ref(node["$ref"], self.schema)
+        return node.get("minItems"), node.get("maxItems")
+
+    def iter_errors(self, fp):
+        """Yield row errors as rows stream past, then the errors of the non-table skeleton."""
+        reader = _Reader(fp, self.chunk_size)
+        counts = {}
+        skeleton = yield from self._value(reader, "", counts)
+        if reader.peek():
+            raise StreamError(f"Trailing data at offset {reader.offset}")
+        for pointer, message in self.validator.validate(skeleton):
+            if pointer in counts and message.startswith("[] should have at"):
+                continue
+            yield pointer, message
+        for pointer, count in counts.items():
+            low, high = self._bounds[pointer]
+            shown = f"[<{count} rows>]" if count else "[]"
+            if low is not None and count < low:
+                yield pointer, f"{shown} should have at least {low} items"
+            if high is not None and count > high:
+                yield pointer, f"{shown} should have at most {high} items"
+
+    def _value(self, reader, pointer, counts):
+        c = reader.peek()
+        if pointer in self.tables and c == "[":
+            counts[pointer] = yield from self._table(reader, pointer)
+            return []
+        if pointer in self._ancestors and c == "{":
+            return (yield from self._object(reader, pointer, counts))
+        return reader.value()
+
+    def _object(self, reader, pointer, counts):
+        reader.expect("{")
+        out = {}
+        if reader.peek() == "}":
+            reader.pos += 1
+            return out
+        while True:
+            if reader.peek() != '"':
+                raise StreamError(f"Expected a property name at offset {reader.offset}")
+            key = reader.value()
+            reader.expect(":")
+            out[key] = yield from self._value(reader, pointer_join(pointer, key), counts)
+            if reader.expect(",}") == "}":
+                return out
+
+    def _table(self, reader, pointer):
+        validate_row = self.tables[pointer]
+        row_errors = []
+        reader.expect("[")
+        count = 0
+        if reader.peek() == "]":
+            reader.pos += 1
+            return 0
+        while True:
+            row = reader.value()
+            row_pointer = f"{pointer}/{count}"
+            if isinstance(row, dict):
+                validate_row(row, row_pointer, row_errors)
+            else:
+                row_errors.append((row_pointer, f"{row!r} is not of type 'object'"))
+            yield from row_errors
+            row_errors.clear()
+            count += 1
+            self.rows += 1
+            if reader.expect(",]") == "]":
+                return count
+
+    def validate(self, fp):
+        return list(self.iter_errors(fp))
+
+
+SELF_CHECK_DOCUMENTS = (
+    '[1.5,2]', '{"a": 1.25}', '[-12e3]', '{"a": [1E+2, -0.5e-1, true], "b": null}',
+    '{"k\\u00e9": ["a\\"b", true, false, null, -Infinity]}',
+)
+# A syntax error in the first row, followed by enough rows to span many chunks.
+SELF_CHECK_MALFORMED = '[{"a": 1,, "b": 2}' + ', {"a": 1, "b": 2}' * 64 + ']'
+
+
+def _read_structured(reader):
+    """Decode the next value the way StreamValidator does: containers token by token, scalars whole."""
+    c = reader.peek()
+    if c == "{":
+        reader.expect("{")
+        out = {}
+        if reader.peek() == "}":
+            reader.pos += 1
+            return out
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            out[key] = _read_structured(reader)
+            if reader.expect(",}") == "}":
+                return out
+    if c == "[":
+        reader.expect("[")
+        out = []
+        if reader.peek() == "]":
+            reader.pos += 1
+            return out
+        while True:
+            out.append(_read_structured(reader))
+            if reader.expect(",]") == "]":
+                return out
+    return reader.value()
+
+
+def self_check(max_chunk=8):
+    """Read SELF_CHECK_DOCUMENTS at every chunk size up to `max_chunk`; return the mismatches.
+
+    SELF_CHECK_MALFORMED must fail without the reader running ahead to the end of the input.
+    """
+    failures = []
+    for document in SELF_CHECK_DOCUMENTS:
+        expected = json.loads(document)
+        for chunk_size in range(1, max_chunk + 1):
+            try:
+                got = _read_structured(_Reader(io.StringIO(document), chunk_size))
+            except StreamError as exc:
+                got = exc
+            if got != expected or repr(got) != repr(expected):
+                failures.append(f"{document} @ chunk {chunk_size}: {got!r} != {expected!r}")
+    for chunk_size in range(1, max_chunk + 1):
+        reader = _Reader(io.StringIO(SELF_CHECK_MALFORMED), chunk_size)
+        try:
+            _read_structured(reader)
+        except StreamError:
+            if reader.eof:
+                failures.append(f"malformed row @ chunk {chunk_size}: read to end of input before failing")
+        else:
+            failures.append(f"malformed row @ chunk {chunk_size}: no error raised")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream-validate FormQAR-054 payloads with large tables")
+    parser.add_argument("payloads", nargs="*")
+    parser.add_argument("--max-errors", type=int, default=100, help="Errors to print per payload (0 for all)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Characters read per chunk")
+    parser.add_argument("--self-check", action="store_true",
+                        help="Check the reader across chunk boundaries (chunk sizes 1-8) and exit")
+    args = parser.parse_args(argv)
+
+    if args.self_check:
+        failures = self_check()
+        for failure in failures:
+            print(f"FAIL {failure}")
+        print(f"Self-check: {len(failures)} failure(s)")
+        return 1 if failures else 0
+    if not args.payloads:
+        parser.error("at least one payload is required")
+
+    validator = StreamValidator(chunk_size=args.chunk_size)
+    failed = 0
+    for path in args.payloads:
+        started = time.perf_counter()
+        rows_before = validator.rows
+        count = 0
+        with open(path, encoding="utf-8") as fp:
+            for pointer, message in validator.iter_errors(fp):
+                count += 1
+                if not args.max_errors or count <= args.max_errors:
+                    print(f"{path}: {pointer}: {message}")
+        elapsed = time.perf_counter() - started
+        rows = validator.rows - rows_before
+        print(f"{path}: {count} error(s), {rows:,} table rows in {elapsed:.2f} s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+        failed += bool(count)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Precompute DOCX layout plans for every table in layout.tables.
+
+For each table the plan holds what the renderers otherwise derive per
+table per report:
+
+  columnWidthsTwips   absolute widths that fill the text width of the
+                      layout.pageModel page (A4, 1-inch margins)
+  headerRows          the resolved header grid: one list of cells per
+                      header row, each with its text, column span, start
+                      column and width, following the same merge rules as
+                      psur_form_docx.ts (merges on the first and middle
+                      rows, plain column headers on the last)
+  repeatHeader        header rows are flagged to repeat on every page
+
+Widths are proportional to the header text, with numeric columns (counts,
+rates, percentages) kept narrow; rounding error goes to the last column so
+widths always sum to the text width.
+"""
+
+import re
+
+# Page sizes in twips (1/1440 inch) and the DOCX default 1-inch margins.
+PAGE_MODELS = {
+    "A4": {"widthTwips": 11906, "heightTwips": 16838, "marginTwips": 1440},
+    "Letter": {"widthTwips": 12240, "heightTwips": 15840, "marginTwips": 1440},
+}
+
+MIN_WEIGHT = 8
+MAX_WEIGHT = 30
+NUMERIC_WEIGHT = 7
+NUMERIC_KEY = re.compile(r"(^n_|count|rate|percent|number_of|^total|^period_|preceding_period|current_data)")
+
+
+def column_weight(column):
+    if NUMERIC_KEY.search(column["key"]):
+        return NUMERIC_WEIGHT
+    return max(MIN_WEIGHT, min(len(column["header"]), MAX_WEIGHT))
+
+
+def column_widths(columns, total):
+    """Integer twip widths proportional to each column's weight, summing exactly to `total`."""
+    if not columns:
+        return []
+    weights = [column_weight(c) for c in columns]
+    scale = total / sum(weights)
+    widths = [int(w * scale) for w in weights]
+    widths[-1] += total - sum(widths)
+    return widths
+
+
+def _merged_row(merges, columns, widths, fill_headers):
+    cells = []
+    col = 0
+    while col < len(columns):
+        merge = next((m for m in merges if m["col_start"] == col), None)
+        if merge:
+            end = merge["col_end"]
+            cells.append({
+                "text": merge["label"],
+                "colStart": col,
+                "span": end - col + 1,
+                "widthTwips": sum(widths[col:end + 1]),
+            })
+            col = end + 1
+            continue
+        covered = any(m["col_start"] < col <= m["col_end"] for m in merges)
+        if not covered:
+            text = columns[col]["header"] if fill_headers else ""
+            cells.append({"text": text, "colStart": col, "span": 1, "widthTwips": widths[col]})
+        col += 1
+    return cells
+
+
+def header_rows(table, widths):
+    """Resolved header grid for one table layout."""
+    columns = table["columns"]
+    merged = table.get("merged_cells", [])
+    count = table.get("header_rows", 1) if merged else 1
+    rows = []
+    for index in range(count):
+        merges = [m for m in merged if m["row"] == index]
+        if index == 0 and merges:
+            rows.append(_merged_row(merges, columns, widths, fill_headers=True))
+        elif index == count - 1:
+            rows.append([
+                {"text": c["header"], "colStart": i, "span": 1, "widthTwips": widths[i]}
+                for i, c in enumerate(columns)
+            ])
+        else:
+            rows.append(_merged_row(merges, columns, widths, fill_headers=False))
+    return rows
+
+
+def build_table_plans(template_json):
+    """Return {"meta", "page", "tables"} layout plans for a template dict."""
+    layout = template_json["layout"]
+    model = layout.get("pageModel", "A4")
+    if model not in PAGE_MODELS:
+        raise ValueError(f"Unknown pageModel {model!r}; expected one of {', '.join(PAGE_MODELS)}")
+    page = dict(PAGE_MODELS[model])
+    page["model"] = model
+    page["contentWidthTwips"] = page["widthTwips"] - 2 * page["marginTwips"]
+
+    tables = {}
+    for key, table in layout["tables"].items():
+        widths = column_widths(table["columns"], page["contentWidthTwips"])
+        tables[key] = {
+            "columnKeys": [c["key"] for c in table["columns"]],
+            "columnWidthsTwips": widths,
+            "totalWidthTwips": sum(widths),
+            "headerRows": header_rows(table, widths),
+            "repeatHeader": True,
+        }
+
+    meta = {k: template_json["meta"][k] for k in ("id", "revision")}
+    return {"meta": {**meta, "source": "template.json"}, "page": page, "tables": tables}
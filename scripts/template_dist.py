@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Binary and compressed distributions of template.json, plus a lazy loader.
+
+`build_distributions()` produces, under template_pack/dist/:
+
+  template.cbor       CBOR (RFC 8949) encoding of the full template
+  template.min.json   minified JSON
+  template.min.json.gz
+  template.min.json.br   (only when the optional `brotli` package is installed)
+  manifest.json       per-file SHA-256 / ETag / size, and the byte ranges of
+                      meta, uiSchema, layout, theme and each section A–M
+                      inside template.cbor
+
+The CBOR codec is a small stdlib implementation covering the JSON data
+model; any conforming CBOR decoder can read the file. `LazyTemplate`
+memory-maps template.cbor and decodes a block or section only when it is
+first accessed.
+
+Being pure Python, the decoder is about 4.5x slower than `json.loads` per
+byte, so the CBOR path only pays off for sparse access: one section decodes
+in about half the time `json.loads` takes for the whole template, but
+touching most sections costs more. `LazyTemplate.full()` therefore parses
+template.min.json with `json.loads` instead of decoding template.cbor.
+
+Usage:
+    python scripts/generate_template_json.py --dist
+
+Programmatic use:
+    from template_dist import LazyTemplate
+    tpl = LazyTemplate("template_pack/dist")
+    tpl.sections["F_product_complaint_types_counts_and_rates"]
+"""
+
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+try:
+    import brotli
+except ImportError:  # optional: .br variant is skipped without it
+    brotli = None
+
+DIST_DIR = "template_pack/dist"
+TOP_LEVEL_BLOCKS = ("meta", "uiSchema", "layout", "theme")
+SECTIONS_PATH = ("schema", "$defs", "sections", "properties")
+
+CONTENT_TYPES = {
+    "template.cbor": ("application/cbor", None),
+    "template.min.json": ("application/json", None),
+    "template.min.json.gz": ("application/json", "gzip"),
+    "template.min.json.br": ("application/json", "br"),
+}
+
+
+# ── CBOR codec (JSON data model subset) ───────────────────────────
+
+
+def _head(out, major, value):
+    if value < 24:
+        out.append((major << 5) | value)
+    elif value < 0x100:
+        out += struct.pack(">BB", (major << 5) | 24, value)
+    elif value < 0x10000:
+        out += struct.pack(">BH", (major << 5) | 25, value)
+    elif value < 0x100000000:
+        out += struct.pack(">BI", (major << 5) | 26, value)
+    else:
+        out += struct.pack(">BQ", (major << 5) | 27, value)
+
+
+def _encode(obj, out, path, marks, wanted):
+    start = len(out)
+    if obj is None:
+        out.append(0xF6)
+    elif obj is True:
+        out.append(0xF5)
+    elif obj is False:
+        out.append(0xF4)
+    elif isinstance(obj, int):
+        if obj >= 0:
+            _head(out, 0, obj)
+        else:
+            _head(out, 1, -1 - obj)
+    elif isinstance(obj, float):
+        out += struct.pack(">Bd", 0xFB, obj)
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        _head(out, 3, len(data))
+        out += data
+    elif isinstance(obj, (list, tuple)):
+        _head(out, 4, len(obj))
+        for i, item in enumerate(obj):
+            _encode(item, out, path + (i,), marks, wanted)
+    elif isinstance(obj, dict):
+        _head(out, 5, len(obj))
+        for key, value in obj.items():
+            _encode(key, out, None, marks, wanted)
+            _encode(value, out, None if path is None else path + (key,), marks, wanted)
+    else:
+        raise TypeError(f"Cannot CBOR-encode {type(obj).__name__}")
+    if path is not None and wanted(path):
+        marks[path] = (start, len(out))
+
+
+def encode_cbor(obj, wanted=lambda path: False):
+    """Encode `obj`; return (bytes, {path: (start, end)}) for every path where wanted(path) is true."""
+    out = bytearray()
+    marks = {}
+    _encode(obj, out, (), marks, wanted)
+    return bytes(out), marks
+
+
+def _decode(buf, pos):
+    initial = buf[pos]
+    major, info = initial >> 5, initial & 0x1F
+    pos += 1
+    if major == 7:
+        if info == 20:
+            return False, pos
+        if info == 21:
+            return True, pos
+        if info == 22:
+            return None, pos
+        if info == 25:
+            return _half_to_float(struct.unpack_from(">H", buf, pos)[0]), pos + 2
+        if info == 26:
+            return struct.unpack_from(">f", buf, pos)[0], pos + 4
+        if info == 27:
+            return struct.unpack_from(">d", buf, pos)[0], pos + 8
+        raise ValueError(f"Unsupported CBOR simple value {info} at {pos - 1}")
+    if info < 24:
+        arg = info
+    elif info == 24:
+        arg, pos = buf[pos], pos + 1
+    elif info == 25:
+        arg, pos = struct.unpack_from(">H", buf, pos)[0], pos + 2
+    elif info == 26:
+        arg, pos = struct.unpack_from(">I", buf, pos)[0], pos + 4
+    elif info == 27:
+        arg, pos = struct.unpack_from(">Q", buf, pos)[0], pos + 8
+    else:
+        raise ValueError(f"Indefinite-length CBOR items are not supported (at {pos - 1})")
+
+    if major == 0:
+        return arg, pos
+    if major == 1:
+        return -1 - arg, pos
+    if major == 2:
+        return bytes(buf[pos:pos + arg]), pos + arg
+    if major == 3:
+        return str(buf[pos:pos + arg], "utf-8"), pos + arg
+    if major == 4:
+        items = []
+        for _ in range(arg):
+            item, pos = _decode(buf, pos)
+            items.append(item)
+        return items, pos
+    if major == 5:
+        obj = {}
+        for _ in range(arg):
+            key, pos = _decode(buf, pos)
+            obj[key], pos = _decode(buf, pos)
+        return obj, pos
+    raise ValueError(f"Unsupported CBOR major type {major} at {pos - 1}")
+
+
+def _half_to_float(h):
+    return struct.unpack(">e", struct.pack(">H", h))[0]
+
+
+def decode_cbor(buf, start=0, end=None):
+    """Decode the single CBOR item in buf[start:end]."""
+    value, pos = _decode(memoryview(buf), start)
+    if end is not None and pos != end:
+        raise ValueError(f"CBOR item at {start} ends at {pos}, expected {end}")
+    return value
+
+
+# ── Distribution build ────────────────────────────────────────────
+
+
+def _file_entry(name, data):
+    digest = hashlib.sha256(data).hexdigest()
+    content_type, encoding = CONTENT_TYPES[name]
+    entry = {"bytes": len(data), "sha256": digest, "etag": f'"sha256-{digest}"', "contentType": content_type}
+    if encoding:
+        entry["contentEncoding"] = encoding
+    return entry
+
+
+def build_distributions(template_json):
+    """Return {path relative to the project root: bytes} for every distribution file."""
+    section_depth = len(SECTIONS_PATH) + 1
+
+    def wanted(path):
+        return (len(path) == 1 and path[0] in TOP_LEVEL_BLOCKS) or (
+            len(path) == section_depth and path[:-1] == SECTIONS_PATH
+        )
+
+    cbor, marks = encode_cbor(template_json, wanted)
+    minified = json.dumps(template_json, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    files = {
+        "template.cbor": cbor,
+        "template.min.json": minified,
+        "template.min.json.gz": gzip.compress(minified, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        files["template.min.json.br"] = brotli.compress(minified, quality=11)
+
+    manifest = {
+        "meta": {k: template_json["meta"][k] for k in ("id", "revision")},
+        "files": {name: _file_entry(name, data) for name, data in files.items()},
+        "offsets": {
+            "blocks": {path[0]: list(marks[path]) for path in sorted(marks) if len(path) == 1},
+            "sections": {path[-1]: list(marks[path]) for path in marks if len(path) == section_depth},
+        },
+    }
+    artifacts = {f"{DIST_DIR}/{name}": data for name, data in files.items()}
+    artifacts[f"{DIST_DIR}/manifest.json"] = (json.dumps(manifest, indent=2) + "\n").encode("utf-8")
+    return artifacts
+
+
+# ── Lazy loader ───────────────────────────────────────────────────
+
+
+class _LazySections(Mapping):
+    def __init__(self, owner):
+        self._owner = owner
+        self._ranges = owner.manifest["offsets"]["sections"]
+        self._cache = {}
+
+    def __getitem__(self, key):
+        if key not in self._cache:
+            start, end = self._ranges[key]
+            self._cache[key] = decode_cbor(self._owner._buf, start, end)
+        return self._cache[key]
+
+    def __iter__(self):
+        return iter(self._ranges)
+
+    def __len__(self):
+        return len(self._ranges)
+
+
+class LazyTemplate:
+    """Memory-mapped template.cbor that decodes blocks and sections on first access."""
+
+    def __init__(self, dist_dir):
+        with open(os.path.join(dist_dir, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.dist_dir = dist_dir
+        self._file = open(os.path.join(dist_dir, "template.cbor"), "rb")
+        self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._blocks = {}
+        self.sections = _LazySections(self)
+
+    def etag(self, name="template.cbor"):
+        return self.manifest["files"][name]["etag"]
+
+    def block(self, name):
+        """Decode a top-level block (meta, uiSchema, layout, theme, or the full schema)."""
+        if name not in self._blocks:
+            ranges = self.manifest["offsets"]["blocks"]
+            if name in ranges:
+                self._blocks[name] = decode_cbor(self._buf, *ranges[name])
+            else:
+                self._blocks[name] = self.full()[name]
+        return self._blocks[name]
+
+    def __getitem__(self, name):
+        return self.block(name)
+
+    def full(self):
+        """The whole template (equivalent to json.load of template.json), parsed from template.min.json."""
+        with open(os.path.join(self.dist_dir, "template.min.json"), "rb") as f:
+            return json.loads(f.read())
+
+    def close(self):
+        self._buf.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
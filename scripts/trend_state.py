@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Persisted, incrementally updated monthly trend state per series.
+
+Each PSUR cycle appends a month of complaints and sales. Instead of
+rebuilding every series from the full history, a state file keeps per
+series (device_model × country by default):
+
+  - the running left-to-right sum of the rates, so the mean is exactly the
+    `mean()` of stats.ts
+  - Welford moments (count, mean, M2) for the standard deviation and UCL
+  - the last 15 (period, rate) points, enough for every rule window
+  - the monthly ledger (period, complaints, units), which TrendResult
+    reports as monthlySeries
+
+Folding in a month is O(1) per series: the moments are updated, and the
+rule windows that end at the new month are checked against the updated
+limits from the tail buffer alone (one batched spc_rules call for all
+series). These alerts are what the fold reports.
+
+`computeTrend` judges every historical point against the final limits,
+which move with each month, and uses a two-pass standard deviation that
+Welford matches only to the last few bits. The full TrendResult
+(determination, the complete violation list, rounded statistics) is
+therefore derived from the ledger with complaint_trends, which reproduces
+computeTrend exactly, rather than from the running moments.
+
+A month at or before a series' last folded month is accepted only if it
+matches the ledger (re-running a cumulative pack is a no-op); changed
+history is an error, and the state must be rebuilt.
+
+Usage:
+    python scripts/trend_state.py packs/demo_cardio_2023 --state build/trend_state.json
+    python scripts/trend_state.py packs/demo_cardio_2023 --state build/trend_state.json --out build/trends.json
+
+Programmatic use:
+    from trend_state import TrendStore
+    store = TrendStore.load("build/trend_state.json")
+    alerts = store.fold_grid(grid)          # grid: complaint_trends.SeriesGrid
+    store.save("build/trend_state.json")
+"""
+
+import argparse
+import bisect
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from complaint_trends import DEFAULT_BY, RATE_PER, SeriesGrid, build_series, read_pack
+from spc_rules import NELSON, WESTERN_ELECTRIC, evaluate_rules
+
+STATE_FORMAT = "psur-trend-state/1"
+TAIL = 15  # longest rule window (RULE_7)
+
+
+class TrendStateError(ValueError):
+    pass
+
+
+class TrendState:
+    """Running statistics and tail buffer of one series."""
+
+    __slots__ = ("n", "total", "welford_mean", "m2", "zero_exposure", "tail", "history")
+
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.welford_mean = 0.0
+        self.m2 = 0.0
+        self.zero_exposure = 0
+        self.tail = []  # [(period, rate)], at most TAIL points
+        self.history = []  # [(period, complaints, units)]
+
+    @property
+    def last_period(self):
+        return self.history[-1][0] if self.history else None
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / self.n) if self.n else 0.0
+
+    def fold(self, period, complaints, units):
+        """Append one month; O(1)."""
+        rate = complaints / units * RATE_PER if units > 0 else 0.0
+        self.n += 1
+        self.total += rate
+        delta = rate - self.welford_mean
+        self.welford_mean += delta / self.n
+        self.m2 += delta * (rate - self.welford_mean)
+        self.zero_exposure += units == 0
+        self.tail.append((period, rate))
+        if len(self.tail) > TAIL:
+            del self.tail[0]
+        self.history.append((period, complaints, units))
+
+    def to_json(self):
+        return {
+            "n": self.n,
+            "sum": self.total,
+            "welfordMean": self.welford_mean,
+            "m2": self.m2,
+            "zeroExposure": self.zero_exposure,
+            "tail": [list(point) for point in self.tail],
+            "history": [list(month) for month in self.history],
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        state = cls()
+        state.n = data["n"]
+        state.total = data["sum"]
+        state.welford_mean = data["welfordMean"]
+        state.m2 = data["m2"]
+        state.zero_exposure = data["zeroExposure"]
+        state.tail = [tuple(point) for point in data["tail"]]
+        state.history = [tuple(month) for month in data["history"]]
+        return state
+
+
+class TrendStore:
+    """TrendState per series key, folded a month at a time and persisted as JSON."""
+
+    def __init__(self, by=DEFAULT_BY, rules=WESTERN_ELECTRIC):
+        self.by = tuple(by)
+        self.rules = tuple(rules)
+        self.states = {}
+
+    def _check_history(self, key, state, period, complaints, units):
+        i = bisect.bisect_left(state.history, (period,))
+        if i < len(state.history) and state.history[i][0] == period:
+            recorded = state.history[i]
+            if recorded[1:] != (complaints, units):
+                raise TrendStateError(
+                    f"{dict(zip(self.by, key))} {period}: history changed "
+                    f"({recorded[1]:g}/{recorded[2]:g} -> {complaints:g}/{units:g}); rebuild the state"
+                )
+            return
+        raise TrendStateError(
+            f"{dict(zip(self.by, key))} {period}: month precedes the last folded month "
+            f"{state.last_period}; rebuild the state"
+        )
+
+    def fold_grid(self, grid):
+        """Fold every month of `grid` that is newer than each series' state.
+
+        Returns {period: [(key, [violation, ...]), ...]}: for each folded
+        month, the series whose rule windows ending at that month fire.
+        """
+        if grid.by != self.by:
+            raise TrendStateError(f"grid is grouped by {grid.by}, the state by {self.by}")
+        alerts = {}
+        for m, period in enumerate(grid.periods):
+            folded = []
+            for s in np.flatnonzero(grid.present[:, m]).tolist():
+                key = grid.keys[s]
+                state = self.states.setdefault(key, TrendState())
+                complaints, units = float(grid.complaints[s, m]), float(grid.units[s, m])
+                if state.last_period is not None and period <= state.last_period:
+                    self._check_history(key, state, period, complaints, units)
+                    continue
+                state.fold(period, complaints, units)
+                folded.append(key)
+            if folded:
+                alerts[period] = self._tail_alerts(folded)
+        return alerts
+
+    def _tail_alerts(self, keys):
+        """Violations of the windows ending at each series' newest month, from the tail buffers of `keys`."""
+        states = [self.states[key] for key in keys]
+        lengths = np.array([len(state.tail) for state in states], dtype=np.int64)
+        rates = np.full((len(states), TAIL), np.nan)
+        labels = np.empty((len(states), TAIL), dtype=object)
+        for s, state in enumerate(states):
+            labels[s, :len(state.tail)], rates[s, :len(state.tail)] = zip(*state.tail)
+        mean = np.array([state.mean for state in states])
+        sigma = np.array([state.std for state in states])
+        found = evaluate_rules(rates, labels, lengths, self.rules, mean, sigma, last_only=True)
+        return [(key, violations) for key, violations in zip(keys, found) if violations]
+
+    def grid(self):
+        """SeriesGrid over every series' ledger (exact computeTrend results via trend_result)."""
+        keys = sorted(self.states)
+        periods = sorted({month[0] for state in self.states.values() for month in state.history})
+        column = {period: m for m, period in enumerate(periods)}
+        shape = (len(keys), len(periods))
+        complaints, units = np.zeros(shape), np.zeros(shape)
+        present = np.zeros(shape, dtype=bool)
+        for s, key in enumerate(keys):
+            for period, c, u in self.states[key].history:
+                m = column[period]
+                complaints[s, m], units[s, m], present[s, m] = c, u, True
+        return SeriesGrid(self.by, keys, periods, complaints, units, present)
+
+    def to_json(self):
+        return {
+            "format": STATE_FORMAT,
+            "by": list(self.by),
+            "rules": list(self.rules),
+            "series": [{"key": list(key), **state.to_json()} for key, state in sorted(self.states.items())],
+        }
+
+    def save(self, path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_json(), ensure_ascii=False))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != STATE_FORMAT:
+            raise TrendStateError(f"{path}: not a {STATE_FORMAT} file")
+        store = cls(data["by"], data["rules"])
+        store.states = {tuple(entry["key"]): TrendState.from_json(entry) for entry in data["series"]}
+        return store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fold new months of a data pack into a persisted trend state")
+    parser.add_argument("pack", help="Pack directory containing normalized/complaints.csv and normalized/sales.csv")
+    parser.add_argument("--state", required=True, help="Trend state JSON file (created if missing, then rewritten)")
+    parser.add_argument("--by", default=",".join(DEFAULT_BY),
+                        help="Comma-separated grouping columns for a new state (default: %(default)s)")
+    parser.add_argument("--nelson", action="store_true", help="Alert on Nelson rules 5–8 as well (new state only)")
+    parser.add_argument("--out", help="Write [{key, trend}] TrendResults for every series to this JSON file")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.state):
+        store = TrendStore.load(args.state)
+    else:
+        store = TrendStore(tuple(c for c in args.by.split(",") if c), NELSON if args.nelson else WESTERN_ELECTRIC)
+
+    started = time.perf_counter()
+    grid = build_series(*read_pack(args.pack, store.by), by=store.by)
+    try:
+        alerts = store.fold_grid(grid)
+    except TrendStateError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    store.save(args.state)
+    elapsed = time.perf_counter() - started
+
+    for period, fired in alerts.items():
+        rules = sorted({v["rule"] for _, violations in fired for v in violations})
+        print(f"  {period}: {len(fired):,} series alerting" + (f" ({', '.join(rules)})" if rules else ""))
+    if args.out:
+        exact = store.grid()
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump([{"key": exact.key_dict(s), "trend": exact.trend_result(s)} for s in range(len(exact))],
+                      f, indent=2, ensure_ascii=False)
+    print(f"Folded {len(alerts):,} new month(s) into {len(store.states):,} series in {elapsed:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
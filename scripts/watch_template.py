@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Watch template.py and regenerate template.json and the template pack on every save.
+
+The interpreter, the generator modules and the executed template.py
+namespace stay warm between edits. template.py is split into its prelude
+(helpers, $defs, cover page) and one chunk per `@section("<key>")`
+builder; on a change only the chunks whose text changed are re-executed
+in the kept namespace. Re-registering a builder drops its memoized
+subschema, so `build_schema()` rebuilds just those sections. A change to
+the prelude, or a section added/removed, falls back to a full
+re-execution.
+
+Artifacts are staged and renamed into place together (see
+write_artifacts), and only files whose content changed are rewritten. A
+template.py that fails to execute leaves the last good outputs in place;
+the error is printed and watching continues.
+
+Changes are picked up with inotify when the optional `inotify_simple`
+package is installed, otherwise by polling the file's mtime and size.
+Editing the generator scripts themselves needs a restart.
+
+Usage:
+    python scripts/watch_template.py
+    python scripts/watch_template.py --dist --poll 0.05
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import traceback
+
+from generate_template_json import (
+    TEMPLATE_SOURCE,
+    _read_cache,
+    _write_cache,
+    build_artifacts,
+    build_template,
+    compute_cache_key,
+    write_artifacts,
+)
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # optional: fall back to polling
+    INotify = None
+
+SECTION_BUILDER = re.compile(r'^@section\("(\w+)"\)', re.MULTILINE)
+
+
+def split_source(source):
+    """(prelude, {section key: (first line, chunk)}) for template.py."""
+    starts = [(m.start(), m.group(1)) for m in SECTION_BUILDER.finditer(source)]
+    if not starts:
+        return source, {}
+    chunks = {}
+    for i, (start, key) in enumerate(starts):
+        end = starts[i + 1][0] if i + 1 < len(starts) else len(source)
+        chunks[key] = (source.count("\n", 0, start), source[start:end])
+    return source[:starts[0][0]], chunks
+
+
+class TemplateBuilder:
+    """Keeps the executed template.py namespace and rebuilds incrementally."""
+
+    def __init__(self, source_path=TEMPLATE_SOURCE, dist=False):
+        self.source_path = source_path
+        self.dist = dist
+        self.namespace = None
+        self.prelude = None
+        self.chunks = {}
+        self.digests = _read_cache().get("outputs") or {}
+
+    def _exec(self, text, first_line=0):
+        # Pad so tracebacks point at the right line of template.py.
+        code = compile("\n" * first_line + text, self.source_path, "exec")
+        exec(code, self.namespace)
+
+    def _load(self, source):
+        """Execute what changed; return the section keys re-executed (None for a full run)."""
+        prelude, chunks = split_source(source)
+        if self.namespace is not None and prelude == self.prelude and chunks.keys() == self.chunks.keys():
+            changed = [key for key in chunks if chunks[key][1] != self.chunks[key][1]]
+            for key in changed:
+                self._exec(chunks[key][1], chunks[key][0])
+            self.chunks = chunks
+            return changed
+        self.namespace = {"__name__": "template"}
+        self._exec(prelude)
+        for first_line, chunk in chunks.values():
+            self._exec(chunk, first_line)
+        self.prelude, self.chunks = prelude, chunks
+        return None
+
+    def rebuild(self):
+        """Rebuild from the current template.py; return (re-executed sections or None, files written)."""
+        # The cache key must hash the exact text executed: template.py may be
+        # saved again before the build finishes.
+        with open(self.source_path, "rb") as f:
+            source_bytes = f.read()
+        source = source_bytes.decode("utf-8")
+        try:
+            changed = self._load(source)
+        except BaseException:
+            # A half-applied namespace cannot be trusted: re-execute everything next time.
+            self.namespace = None
+            raise
+        template = build_template(self.namespace["build_schema"]())
+        previous = self.digests
+        self.digests = write_artifacts(build_artifacts(template, dist=self.dist), unchanged=previous)
+        _write_cache(compute_cache_key(self.source_path, dist=self.dist, source_bytes=source_bytes), self.digests)
+        written = [p for p, d in self.digests.items() if previous.get(p) != d]
+        return changed, written
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _poll(path, interval):
+    last = _stat(path)
+    while True:
+        time.sleep(interval)
+        current = _stat(path)
+        if current != last and current is not None:
+            last = current
+            yield
+
+
+def _inotify(path):
+    # Watch the directory: editors often save by writing a new file and renaming it over.
+    directory, name = os.path.split(os.path.abspath(path))
+    watcher = INotify()
+    watcher.add_watch(directory, flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE)
+    while True:
+        if any(event.name == name for event in watcher.read()):
+            yield
+
+
+def watch(builder, poll=None):
+    events = _poll(builder.source_path, poll) if poll else _inotify(builder.source_path)
+    for _ in events:
+        started = time.perf_counter()
+        try:
+            changed, written = builder.rebuild()
+        except Exception:
+            traceback.print_exc()
+            print("Build failed; keeping the previous outputs", flush=True)
+            continue
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        scope = "full rebuild" if changed is None else f"sections: {', '.join(changed) or 'none'}"
+        print(f"Rebuilt in {elapsed_ms:.1f} ms ({scope}; {len(written)} file(s) written)", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate template.json whenever template.py changes")
+    parser.add_argument("--dist", action="store_true", help="Also keep template_pack/dist/ up to date")
+    parser.add_argument("--poll", type=float, metavar="SECONDS",
+                        help="Poll at this interval instead of using inotify")
+    args = parser.parse_args(argv)
+
+    builder = TemplateBuilder(dist=args.dist)
+    started = time.perf_counter()
+    _, written = builder.rebuild()
+    print(f"Initial build in {(time.perf_counter() - started) * 1000:.1f} ms ({len(written)} file(s) written)")
+    poll = args.poll or (None if INotify is not None else 0.1)
+    mode = f"polling every {poll} s" if poll else "inotify"
+    print(f"Watching {builder.source_path} ({mode}); Ctrl-C to stop", flush=True)
+    try:
+        watch(builder, poll)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
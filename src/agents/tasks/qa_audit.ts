@@ -207,23 +207,83 @@ const ANNEX_II_REQUIREMENTS: AnnexIIRequirement[] = [
   },
 ];
 
-// ── Section Field Counts (from template.json schema) ────────────────
-
-const SECTION_FIELD_COUNTS: Record<string, { fields: number; tables: number }> = {
-  A_executive_summary: { fields: 9, tables: 0 },
-  B_scope_and_device_description: { fields: 22, tables: 3 },
-  C_volume_of_sales_and_population_exposure: { fields: 10, tables: 2 },
-  D_information_on_serious_incidents: { fields: 1, tables: 3 },
-  E_customer_feedback: { fields: 1, tables: 1 },
-  F_product_complaint_types_counts_and_rates: { fields: 3, tables: 2 },
-  G_information_from_trend_reporting: { fields: 4, tables: 0 },
-  H_information_from_fsca: { fields: 1, tables: 1 },
-  I_corrective_and_preventive_actions: { fields: 1, tables: 1 },
-  J_scientific_literature_review: { fields: 8, tables: 0 },
-  K_review_of_external_databases_and_registries: { fields: 1, tables: 1 },
-  L_pmcf: { fields: 1, tables: 1 },
-  M_findings_and_conclusions: { fields: 6, tables: 0 },
-};
+// ── Section Field Counts (from template_pack/field_index.json) ──────
+
+export interface SectionFieldCounts {
+  /** Leaf fields required by every ancestor up to the section root (field_index.py `required_leaves`). */
+  fields: number;
+  tables: number;
+}
+
+type SchemaNode = Record<string, any>;
+
+function resolveSchemaRef(node: SchemaNode, root: SchemaNode): SchemaNode {
+  while (typeof node.$ref === "string") {
+    let target: SchemaNode = root;
+    for (const token of node.$ref.replace(/^#\//, "").split("/")) target = target[token];
+    const { $ref: _ref, ...siblings } = node;
+    node = { ...target, ...siblings };
+  }
+  return node;
+}
+
+/** Required leaves and tables under `node`, with field_index.py's definitions of both. */
+function countSchemaFields(
+  node: SchemaNode,
+  uiEntry: SchemaNode | undefined,
+  requiredPath: boolean,
+  root: SchemaNode,
+  counts: SectionFieldCounts,
+): void {
+  node = resolveSchemaRef(node, root);
+  if (node.properties) {
+    const required: string[] = [...(node.required ?? [])];
+    // `if: {required: [...]}` over already-required fields always holds; its `then` is folded in.
+    for (const clause of node.allOf ?? []) {
+      const cond = clause.if;
+      if (!cond || Object.keys(cond).join() !== "required") continue;
+      if (!cond.required.every((name: string) => required.includes(name))) continue;
+      for (const name of clause.then?.required ?? []) if (!required.includes(name)) required.push(name);
+    }
+    for (const [name, child] of Object.entries<SchemaNode>(node.properties)) {
+      const childUi = uiEntry?.[name];
+      const childRequired = requiredPath && required.includes(name);
+      countSchemaFields(child, typeof childUi === "object" ? childUi : undefined, childRequired, root, counts);
+    }
+  } else if (node.type === "array") {
+    const widget = uiEntry?.["ui:widget"] ?? node.ui?.widget ?? (node.ui ? "table" : "array");
+    if (widget !== "table") return;
+    counts.tables++;
+    countSchemaFields(node.items ?? {}, undefined, requiredPath, root, counts);
+  } else if (requiredPath) {
+    counts.fields++;
+  }
+}
+
+/**
+ * Expected field / table counts per section. Read from the precomputed
+ * `sections` summary of the field index when the loader attached one; a
+ * missing or stale template pack falls back to the same count over
+ * templateJson.schema.
+ */
+export function sectionFieldCounts(templateJson: TemplateJson): Record<string, SectionFieldCounts> {
+  const counts: Record<string, SectionFieldCounts> = {};
+  if (templateJson.fieldIndex) {
+    for (const [sectionKey, summary] of Object.entries(templateJson.fieldIndex.sections)) {
+      counts[sectionKey] = { fields: summary.required_leaves, tables: summary.tables };
+    }
+    return counts;
+  }
+
+  const schema = templateJson.schema as SchemaNode;
+  const uiSections = ((templateJson.uiSchema as SchemaNode)?.sections ?? {}) as SchemaNode;
+  const sections = resolveSchemaRef(schema.properties?.sections ?? {}, schema);
+  for (const [sectionKey, node] of Object.entries<SchemaNode>(sections.properties ?? {})) {
+    counts[sectionKey] = { fields: 0, tables: 0 };
+    countSchemaFields(node, uiSections[sectionKey], true, schema, counts[sectionKey]);
+  }
+  return counts;
+}
 
 // ── Scoring Engine ──────────────────────────────────────────────────
 
@@ -262,14 +322,15 @@ function gradeFromScore(score: number): string {
 
 // ── Main Audit Function ─────────────────────────────────────────────
 
-export function runQAAudit(mapped: MappedPSUR): QAAuditReport {
+export function runQAAudit(mapped: MappedPSUR, templateJson?: TemplateJson): QAAuditReport {
   const reportId = uuidv4();
+  const expectedCounts = templateJson?.schema ? sectionFieldCounts(templateJson) : {};
   const findings: AuditFinding[] = [];
   const sectionScores: SectionScore[] = [];
 
   // ── Phase 1: Section-level population scoring ───────────
   for (const section of mapped.sections) {
-    const expected = SECTION_FIELD_COUNTS[section.sectionKey] ?? { fields: 1, tables: 0 };
+    const expected = expectedCounts[section.sectionKey] ?? { fields: 1, tables: 0 };
     const populated = countPopulatedFields(section);
     const tablesRendered = Object.keys(section.tables).length;
     const total = expected.fields + expected.tables;
@@ -499,7 +560,7 @@ export async function handleQAAudit(
       ? mapOutputToTemplate(psurOutput, templateJson)
       : mapOutputToTemplate(psurOutput, {} as any);
 
-    const report = runQAAudit(mapped);
+    const report = runQAAudit(mapped, templateJson);
 
     // Store the audit report using the standard ref kind
     const ref = store.set("qa_audit_report", config.caseId, report);
@@ -7,7 +7,7 @@ import {
 /**
  * Input shape for a fully-resolved complaint record.
  */
-interface FullComplaintInput {
+export interface FullComplaintInput {
   complaint_id: string;
   date_received: string;
   country?: string;
@@ -18,6 +18,110 @@ interface FullComplaintInput {
   root_cause_category?: string;
 }
 
+/**
+ * Incremental form of `computeComplaintAnalytics`: complaints can be added
+ * in any number of batches, and only the per-key counts are retained.
+ * Map insertion order is first-seen order, so ties sort exactly as they do
+ * over the full array.
+ */
+export class ComplaintAnalyticsAccumulator {
+  private totalComplaints = 0;
+  private seriousCount = 0;
+  private reportableCount = 0;
+  private readonly monthMap = new Map<string, number>();
+  private readonly countryMap = new Map<string, number>();
+  private readonly problemMap = new Map<string, { count: number; seriousCount: number }>();
+  private readonly harmMap = new Map<string, number>();
+  private readonly rootCauseMap = new Map<string, number>();
+  private readonly matrixMap = new Map<string, number>();
+
+  add(complaints: Iterable<FullComplaintInput>): void {
+    for (const c of complaints) {
+      this.totalComplaints++;
+      if (c.serious === true) this.seriousCount++;
+      if (c.reportable === true) this.reportableCount++;
+
+      const period = c.date_received.substring(0, 7); // YYYY-MM
+      this.monthMap.set(period, (this.monthMap.get(period) ?? 0) + 1);
+
+      const country = c.country ?? "Unknown";
+      this.countryMap.set(country, (this.countryMap.get(country) ?? 0) + 1);
+
+      const entry = this.problemMap.get(c.problem_code) ?? {
+        count: 0,
+        seriousCount: 0,
+      };
+      entry.count++;
+      if (c.serious === true) entry.seriousCount++;
+      this.problemMap.set(c.problem_code, entry);
+
+      this.harmMap.set(c.harm_code, (this.harmMap.get(c.harm_code) ?? 0) + 1);
+
+      const category = c.root_cause_category ?? "Unclassified";
+      this.rootCauseMap.set(category, (this.rootCauseMap.get(category) ?? 0) + 1);
+
+      const key = `${c.problem_code}||${c.harm_code}`;
+      this.matrixMap.set(key, (this.matrixMap.get(key) ?? 0) + 1);
+    }
+  }
+
+  build(): ComplaintAnalytics {
+    // ── By month ─────────────────────────────────────────────────────
+    const byMonth = [...this.monthMap.entries()]
+      .sort(([a], [b]) => a.localeCompare(b))
+      .map(([period, count]) => ({ period, count }));
+
+    // ── By country ───────────────────────────────────────────────────
+    const byCountry = [...this.countryMap.entries()]
+      .sort(([, a], [, b]) => b - a)
+      .map(([country, count]) => ({ country, count }));
+
+    // ── By problem code ──────────────────────────────────────────────
+    const byProblemCode = [...this.problemMap.entries()]
+      .sort(([, a], [, b]) => b.count - a.count)
+      .map(([code, { count, seriousCount: sc }]) => ({
+        code,
+        description: getProblemCodeDescription(code) ?? code,
+        count,
+        seriousCount: sc,
+      }));
+
+    // ── By harm code ─────────────────────────────────────────────────
+    const byHarmCode = [...this.harmMap.entries()]
+      .sort(([, a], [, b]) => b - a)
+      .map(([code, count]) => ({
+        code,
+        description: getHarmCodeDescription(code) ?? code,
+        count,
+      }));
+
+    // ── By root cause category ───────────────────────────────────────
+    const byRootCause = [...this.rootCauseMap.entries()]
+      .sort(([, a], [, b]) => b - a)
+      .map(([category, count]) => ({ category, count }));
+
+    // ── Problem-Harm matrix ──────────────────────────────────────────
+    const problemHarmMatrix = [...this.matrixMap.entries()]
+      .sort(([, a], [, b]) => b - a)
+      .map(([key, count]) => {
+        const [problemCode, harmCode] = key.split("||");
+        return { problemCode, harmCode, count };
+      });
+
+    return {
+      totalComplaints: this.totalComplaints,
+      seriousCount: this.seriousCount,
+      reportableCount: this.reportableCount,
+      byMonth,
+      byCountry,
+      byProblemCode,
+      byHarmCode,
+      byRootCause,
+      problemHarmMatrix,
+    };
+  }
+}
+
 /**
  * Compute complaint analytics: counts, breakdowns by month / country /
  * problem code / harm code / root cause, and a problem-harm matrix.
@@ -25,95 +129,7 @@ interface FullComplaintInput {
 export function computeComplaintAnalytics(
   complaints: FullComplaintInput[]
 ): ComplaintAnalytics {
-  const totalComplaints = complaints.length;
-  const seriousCount = complaints.filter((c) => c.serious === true).length;
-  const reportableCount = complaints.filter((c) => c.reportable === true).length;
-
-  // ── By month ───────────────────────────────────────────────────────
-  const monthMap = new Map<string, number>();
-  for (const c of complaints) {
-    const period = c.date_received.substring(0, 7); // YYYY-MM
-    monthMap.set(period, (monthMap.get(period) ?? 0) + 1);
-  }
-  const byMonth = [...monthMap.entries()]
-    .sort(([a], [b]) => a.localeCompare(b))
-    .map(([period, count]) => ({ period, count }));
-
-  // ── By country ─────────────────────────────────────────────────────
-  const countryMap = new Map<string, number>();
-  for (const c of complaints) {
-    const country = c.country ?? "Unknown";
-    countryMap.set(country, (countryMap.get(country) ?? 0) + 1);
-  }
-  const byCountry = [...countryMap.entries()]
-    .sort(([, a], [, b]) => b - a)
-    .map(([country, count]) => ({ country, count }));
-
-  // ── By problem code ────────────────────────────────────────────────
-  const problemMap = new Map<string, { count: number; seriousCount: number }>();
-  for (const c of complaints) {
-    const entry = problemMap.get(c.problem_code) ?? {
-      count: 0,
-      seriousCount: 0,
-    };
-    entry.count++;
-    if (c.serious === true) entry.seriousCount++;
-    problemMap.set(c.problem_code, entry);
-  }
-  const byProblemCode = [...problemMap.entries()]
-    .sort(([, a], [, b]) => b.count - a.count)
-    .map(([code, { count, seriousCount: sc }]) => ({
-      code,
-      description: getProblemCodeDescription(code) ?? code,
-      count,
-      seriousCount: sc,
-    }));
-
-  // ── By harm code ───────────────────────────────────────────────────
-  const harmMap = new Map<string, number>();
-  for (const c of complaints) {
-    harmMap.set(c.harm_code, (harmMap.get(c.harm_code) ?? 0) + 1);
-  }
-  const byHarmCode = [...harmMap.entries()]
-    .sort(([, a], [, b]) => b - a)
-    .map(([code, count]) => ({
-      code,
-      description: getHarmCodeDescription(code) ?? code,
-      count,
-    }));
-
-  // ── By root cause category ─────────────────────────────────────────
-  const rootCauseMap = new Map<string, number>();
-  for (const c of complaints) {
-    const category = c.root_cause_category ?? "Unclassified";
-    rootCauseMap.set(category, (rootCauseMap.get(category) ?? 0) + 1);
-  }
-  const byRootCause = [...rootCauseMap.entries()]
-    .sort(([, a], [, b]) => b - a)
-    .map(([category, count]) => ({ category, count }));
-
-  // ── Problem-Harm matrix ────────────────────────────────────────────
-  const matrixMap = new Map<string, number>();
-  for (const c of complaints) {
-    const key = `${c.problem_code}||${c.harm_code}`;
-    matrixMap.set(key, (matrixMap.get(key) ?? 0) + 1);
-  }
-  const problemHarmMatrix = [...matrixMap.entries()]
-    .sort(([, a], [, b]) => b - a)
-    .map(([key, count]) => {
-      const [problemCode, harmCode] = key.split("||");
-      return { problemCode, harmCode, count };
-    });
-
-  return {
-    totalComplaints,
-    seriousCount,
-    reportableCount,
-    byMonth,
-    byCountry,
-    byProblemCode,
-    byHarmCode,
-    byRootCause,
-    problemHarmMatrix,
-  };
+  const analytics = new ComplaintAnalyticsAccumulator();
+  analytics.add(complaints);
+  return analytics.build();
 }
@@ -2,40 +2,56 @@ import type { ExposureRecord } from "../evidence/schemas.js";
 import type { ExposureAnalytics } from "../psur/context.js";
 
 /**
- * Compute exposure analytics from sales/distribution records.
- * Groups units by month and country, computes percentage share.
+ * Incremental form of `computeExposureAnalytics`: records can be added in
+ * any number of batches, and only the per-month / per-country totals are
+ * retained.
  */
-export function computeExposureAnalytics(
-  salesRecords: ExposureRecord[]
-): ExposureAnalytics {
-  // Total units across all records
-  const totalUnits = salesRecords.reduce((sum, r) => sum + r.units_sold, 0);
+export class ExposureAnalyticsAccumulator {
+  private totalUnits = 0;
+  private readonly monthMap = new Map<string, number>();
+  private readonly countryMap = new Map<string, number>();
 
-  // Group by period (YYYY-MM)
-  const monthMap = new Map<string, number>();
-  for (const r of salesRecords) {
-    monthMap.set(r.period, (monthMap.get(r.period) ?? 0) + r.units_sold);
+  add(salesRecords: Iterable<ExposureRecord>): void {
+    for (const r of salesRecords) {
+      this.totalUnits += r.units_sold;
+      this.monthMap.set(r.period, (this.monthMap.get(r.period) ?? 0) + r.units_sold);
+      const country = r.country ?? "Unknown";
+      this.countryMap.set(country, (this.countryMap.get(country) ?? 0) + r.units_sold);
+    }
   }
-  const byMonth = [...monthMap.entries()]
-    .sort(([a], [b]) => a.localeCompare(b))
-    .map(([period, units]) => ({ period, units }));
 
-  // Group by country
-  const countryMap = new Map<string, number>();
-  for (const r of salesRecords) {
-    const country = r.country ?? "Unknown";
-    countryMap.set(country, (countryMap.get(country) ?? 0) + r.units_sold);
+  build(): ExposureAnalytics {
+    const totalUnits = this.totalUnits;
+
+    // Group by period (YYYY-MM)
+    const byMonth = [...this.monthMap.entries()]
+      .sort(([a], [b]) => a.localeCompare(b))
+      .map(([period, units]) => ({ period, units }));
+
+    // Group by country
+    const byCountry = [...this.countryMap.entries()]
+      .sort(([, a], [, b]) => b - a)
+      .map(([country, units]) => ({
+        country,
+        units,
+        pct:
+          totalUnits > 0
+            ? Math.round((units / totalUnits) * 1000) / 10
+            : 0,
+      }));
+
+    return { totalUnits, byMonth, byCountry };
   }
-  const byCountry = [...countryMap.entries()]
-    .sort(([, a], [, b]) => b - a)
-    .map(([country, units]) => ({
-      country,
-      units,
-      pct:
-        totalUnits > 0
-          ? Math.round((units / totalUnits) * 1000) / 10
-          : 0,
-    }));
+}
 
-  return { totalUnits, byMonth, byCountry };
+/**
+ * Compute exposure analytics from sales/distribution records.
+ * Groups units by month and country, computes percentage share.
+ */
+export function computeExposureAnalytics(
+  salesRecords: ExposureRecord[]
+): ExposureAnalytics {
+  const exposure = new ExposureAnalyticsAccumulator();
+  exposure.add(salesRecords);
+  return exposure.build();
 }
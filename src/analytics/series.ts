@@ -1,6 +1,53 @@
 import type { ComplaintRecord, ExposureRecord } from "../evidence/schemas.js";
 import type { MonthlyDataPoint } from "../shared/types.js";
 
+/**
+ * Incremental form of `buildMonthlySeries`: records can be added in any
+ * number of batches, and only the per-month totals are retained.
+ */
+export class MonthlySeriesAccumulator {
+  // period → total units
+  private readonly exposureMap = new Map<string, number>();
+  // period → complaint count
+  private readonly complaintMap = new Map<string, number>();
+
+  addExposure(exposure: Iterable<ExposureRecord>): void {
+    for (const exp of exposure) {
+      const current = this.exposureMap.get(exp.period) ?? 0;
+      this.exposureMap.set(exp.period, current + exp.units_sold);
+    }
+  }
+
+  addComplaints(complaints: Iterable<Pick<ComplaintRecord, "date_received">>): void {
+    for (const c of complaints) {
+      const period = c.date_received.substring(0, 7); // YYYY-MM
+      this.complaintMap.set(period, (this.complaintMap.get(period) ?? 0) + 1);
+    }
+  }
+
+  build(): MonthlyDataPoint[] {
+    // Gather all unique periods, sorted
+    const allPeriods = new Set<string>([
+      ...this.exposureMap.keys(),
+      ...this.complaintMap.keys(),
+    ]);
+    const sortedPeriods = [...allPeriods].sort();
+
+    return sortedPeriods.map((period) => {
+      const complaintCount = this.complaintMap.get(period) ?? 0;
+      const unitsSold = this.exposureMap.get(period) ?? 0;
+      const rate = unitsSold > 0 ? (complaintCount / unitsSold) * 1000 : 0;
+
+      return {
+        period,
+        complaints: complaintCount,
+        unitsSold,
+        rate,
+      };
+    });
+  }
+}
+
 /**
  * Build monthly time series from complaints + exposure data.
  * Aggregates complaints by month and joins with sales/exposure data.
@@ -10,38 +57,8 @@ export function buildMonthlySeries(
   complaints: ComplaintRecord[],
   exposure: ExposureRecord[]
 ): MonthlyDataPoint[] {
-  // Build exposure lookup: period → total units
-  const exposureMap = new Map<string, number>();
-  for (const exp of exposure) {
-    const current = exposureMap.get(exp.period) ?? 0;
-    exposureMap.set(exp.period, current + exp.units_sold);
-  }
-
-  // Aggregate complaints by month
-  const complaintMap = new Map<string, number>();
-  for (const c of complaints) {
-    const period = c.date_received.substring(0, 7); // YYYY-MM
-    complaintMap.set(period, (complaintMap.get(period) ?? 0) + 1);
-  }
-
-  // Gather all unique periods, sorted
-  const allPeriods = new Set<string>([
-    ...exposureMap.keys(),
-    ...complaintMap.keys(),
-  ]);
-  const sortedPeriods = [...allPeriods].sort();
-
-  // Build series
-  return sortedPeriods.map((period) => {
-    const complaintCount = complaintMap.get(period) ?? 0;
-    const unitsSold = exposureMap.get(period) ?? 0;
-    const rate = unitsSold > 0 ? (complaintCount / unitsSold) * 1000 : 0;
-
-    return {
-      period,
-      complaints: complaintCount,
-      unitsSold,
-      rate,
-    };
-  });
+  const series = new MonthlySeriesAccumulator();
+  series.addExposure(exposure);
+  series.addComplaints(complaints);
+  return series.build();
 }
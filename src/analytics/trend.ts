@@ -1,5 +1,5 @@
 import type { ComplaintRecord, ExposureRecord } from "../evidence/schemas.js";
-import type { TrendResult, TrendDetermination } from "../shared/types.js";
+import type { TrendResult, TrendDetermination, MonthlyDataPoint } from "../shared/types.js";
 import { buildMonthlySeries } from "./series.js";
 import { mean, stdDev, ucl3Sigma, round } from "./stats.js";
 import { evaluateWesternElectric } from "./western-electric.js";
@@ -11,7 +11,14 @@ export function computeTrend(
   complaints: ComplaintRecord[],
   exposure: ExposureRecord[]
 ): TrendResult {
-  const monthlySeries = buildMonthlySeries(complaints, exposure);
+  return computeTrendFromSeries(buildMonthlySeries(complaints, exposure));
+}
+
+/**
+ * Trend analysis of an already aggregated monthly series
+ * (e.g. from a `MonthlySeriesAccumulator` fed while streaming).
+ */
+export function computeTrendFromSeries(monthlySeries: MonthlyDataPoint[]): TrendResult {
   const rates = monthlySeries.map((dp) => dp.rate);
   const periods = monthlySeries.map((dp) => dp.period);
 
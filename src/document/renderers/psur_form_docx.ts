@@ -28,6 +28,7 @@ import {
   AlignmentType,
   BorderStyle,
   TableOfContents,
+  TableLayoutType,
   PageBreak,
 } from "docx";
 
@@ -37,7 +38,7 @@ import type {
   MappedTable,
   MappedCoverPage,
 } from "../../templates/output_to_template_mapper.js";
-import type { TemplateJson, TableLayout, ThemeConfig } from "../../templates/template_schema.js";
+import type { TemplateJson, TableLayout, TablePlan, ThemeConfig } from "../../templates/template_schema.js";
 import { tryLoadGuidance, buildFieldLabelMap } from "../../templates/guidance_loader.js";
 import { sanitizeNarrative } from "../../templates/narrative_sanitizer.js";
 
@@ -110,9 +111,10 @@ function cellBorders() {
   };
 }
 
-function headerCell(text: string, theme: DocxTheme, columnSpan?: number): TableCell {
+function headerCell(text: string, theme: DocxTheme, columnSpan?: number, widthTwips?: number): TableCell {
   return new TableCell({
     columnSpan,
+    width: widthTwips != null ? { size: widthTwips, type: WidthType.DXA } : undefined,
     borders: cellBorders(),
     shading: { fill: "D9E2F3", color: "auto" },
     children: [
@@ -729,6 +731,69 @@ function buildMergedHeaderTable(
   return elements;
 }
 
+/**
+ * Stamp out a table from its precomputed plan (template_pack/table_plans.json):
+ * header grid, merge spans and column widths are already resolved.
+ */
+function buildPlannedTable(
+  mapped: MappedTable,
+  plan: TablePlan,
+  theme: DocxTheme,
+): (Paragraph | Table)[] {
+  const elements: (Paragraph | Table)[] = [
+    new Paragraph({
+      heading: HeadingLevel.HEADING_3,
+      spacing: { before: 240, after: 120 },
+      children: [
+        new TextRun({
+          text: mapped.title,
+          bold: true,
+          size: theme.h3Size,
+          font: theme.font,
+        }),
+      ],
+    }),
+  ];
+
+  if (mapped.rows.length === 0) {
+    elements.push(bodyParagraph("No data available for this table during the reporting period.", theme));
+    return elements;
+  }
+
+  const headerRows = plan.headerRows.map(
+    (cells) =>
+      new TableRow({
+        tableHeader: plan.repeatHeader,
+        children: cells.map((cell) =>
+          headerCell(cell.text, theme, cell.span > 1 ? cell.span : undefined, cell.widthTwips),
+        ),
+      }),
+  );
+
+  const dataRows = mapped.rows.map((row) => {
+    const rowObj = row as Record<string, unknown>;
+    const rowValues = Object.values(rowObj);
+    return new TableRow({
+      children: plan.columnKeys.map((key, idx) => {
+        const keyedValue = rowObj[key];
+        const value = keyedValue != null && keyedValue !== "" ? keyedValue : rowValues[idx] ?? "";
+        return dataCell(String(value), theme);
+      }),
+    });
+  });
+
+  elements.push(
+    new Table({
+      width: { size: plan.totalWidthTwips, type: WidthType.DXA },
+      columnWidths: plan.columnWidthsTwips,
+      layout: TableLayoutType.FIXED,
+      rows: [...headerRows, ...dataRows],
+    }),
+  );
+
+  return elements;
+}
+
 function buildHierarchicalTable(
   mapped: MappedTable,
   layout: TableLayout | undefined,
@@ -798,10 +863,14 @@ function buildTableElement(
   layout: TableLayout | undefined,
   isHierarchical: boolean,
   theme: DocxTheme,
+  plan?: TablePlan,
 ): (Paragraph | Table)[] {
   if (isHierarchical) {
     return buildHierarchicalTable(mapped, layout, theme);
   }
+  if (plan && plan.columnKeys.length > 0) {
+    return buildPlannedTable(mapped, plan, theme);
+  }
   if (layout?.merged_cells && layout.merged_cells.length > 0) {
     return buildMergedHeaderTable(mapped, layout, theme);
   }
@@ -991,6 +1060,10 @@ function getSectionSchema(
   sectionKey: string,
   templateJson: TemplateJson,
 ): Record<string, unknown> | undefined {
+  // Pre-resolved variant: $refs inlined and widgets precomputed, so a plain lookup suffices.
+  const flatSection = templateJson.flat?.sections[sectionKey];
+  if (flatSection) return flatSection;
+
   const defs = (templateJson.schema as Record<string, unknown>).$defs as
     | Record<string, unknown>
     | undefined;
@@ -1115,7 +1188,8 @@ function buildFormSection(
       tableKey.includes("table_7") ||
       checkHierarchical(section.sectionKey, tableKey, templateJson);
 
-    elements.push(...buildTableElement(mapped, layout, isHierarchical, theme));
+    const plan = templateJson.tablePlans?.tables[tableKey];
+    elements.push(...buildTableElement(mapped, layout, isHierarchical, theme, plan));
   }
 
   // Trend chart in Section G
@@ -0,0 +1,89 @@
+/**
+ * Streaming CSV ingest — hash, parse and (optionally) normalize a file in
+ * chunks without holding it in memory.
+ *
+ * Every byte read is fed to an incremental SHA-256, giving the same digest
+ * `sha256Bytes` computes over the whole buffer, and to a csv-parse stream
+ * with the options the in-memory ingest uses. Parsed records are handed to
+ * the consumer in batches of `chunkRows` and are not retained, so memory is
+ * bounded by one chunk plus whatever the consumer aggregates.
+ */
+import { createReadStream } from "fs";
+import { Transform } from "stream";
+import { pipeline } from "stream/promises";
+import { parse } from "csv-parse";
+
+import { sha256Incremental } from "../shared/hash.js";
+
+/** csv-parse options shared with the `csv-parse/sync` ingest paths. */
+export const CSV_PARSE_OPTIONS = {
+  columns: true,
+  skip_empty_lines: true,
+  trim: true,
+  relax_column_count: true,
+} as const;
+
+export const DEFAULT_CHUNK_ROWS = 10_000;
+
+export type CsvRecord = Record<string, string>;
+
+export interface StreamCsvOptions {
+  /** Records per chunk handed to the consumer (default 10,000). */
+  chunkRows?: number;
+  /** Applied to each record before it is batched, e.g. a pack mapping profile. */
+  normalize?: (record: CsvRecord) => CsvRecord;
+}
+
+export interface StreamCsvResult {
+  /** SHA-256 of the file bytes, identical to `sha256Bytes(readFileSync(filePath))`. */
+  sha256: string;
+  bytes: number;
+  records: number;
+}
+
+/**
+ * Read `filePath` once, calling `onChunk` with each batch of parsed records.
+ * `onChunk` may be async; the stream waits for it before reading on.
+ */
+export async function streamCsv(
+  filePath: string,
+  onChunk: (records: CsvRecord[]) => void | Promise<void>,
+  options: StreamCsvOptions = {}
+): Promise<StreamCsvResult> {
+  const chunkRows = Math.max(1, options.chunkRows ?? DEFAULT_CHUNK_ROWS);
+  const normalize = options.normalize;
+  const digest = sha256Incremental();
+  let bytes = 0;
+  let records = 0;
+
+  const hashTap = new Transform({
+    transform(chunk: Buffer, _encoding, callback) {
+      digest.update(chunk);
+      bytes += chunk.length;
+      callback(null, chunk);
+    },
+  });
+
+  await pipeline(
+    createReadStream(filePath),
+    hashTap,
+    parse(CSV_PARSE_OPTIONS),
+    async (rows: AsyncIterable<CsvRecord>) => {
+      let batch: CsvRecord[] = [];
+      for await (const row of rows) {
+        batch.push(normalize ? normalize(row) : row);
+        if (batch.length >= chunkRows) {
+          records += batch.length;
+          await onChunk(batch);
+          batch = [];
+        }
+      }
+      if (batch.length > 0) {
+        records += batch.length;
+        await onChunk(batch);
+      }
+    }
+  );
+
+  return { sha256: digest.digest(), bytes, records };
+}
@@ -11,6 +11,10 @@ export interface ValidationContext {
   caseEnd: Date;
   complaints?: ComplaintRecord[];
   exposure?: ExposureRecord[];
+  /** Pre-aggregated alternative to `complaints` (used by streaming ingest). */
+  complaintSummary?: ComplaintSummary;
+  /** Pre-aggregated alternative to `exposure` (used by streaming ingest). */
+  exposureSummary?: ExposureSummary;
   capa?: CAPARecord[];
   riskSummary?: RiskSummary;
   trendResult?: TrendResult;
@@ -19,16 +23,92 @@ export interface ValidationContext {
   derivedInputIds?: string[];
 }
 
+/** What the complaint rules need from the complaint records. */
+export interface ComplaintSummary {
+  count: number;
+  /** Earliest / latest `date_received` in epoch ms (NaN if any date is invalid). */
+  earliest: number;
+  latest: number;
+  missingCountry: number;
+  missingModel: number;
+  missingProblemCode: number;
+}
+
+/** What the exposure rules need from the exposure records. */
+export interface ExposureSummary {
+  count: number;
+  totalUnits: number;
+}
+
+/**
+ * Builds a ComplaintSummary / ExposureSummary from records added in any
+ * number of batches.
+ */
+export class ValidationSummaryAccumulator {
+  private readonly complaints: ComplaintSummary = {
+    count: 0,
+    earliest: Infinity,
+    latest: -Infinity,
+    missingCountry: 0,
+    missingModel: 0,
+    missingProblemCode: 0,
+  };
+  private readonly exposure: ExposureSummary = { count: 0, totalUnits: 0 };
+
+  addComplaints(records: Iterable<Partial<ComplaintRecord> & Pick<ComplaintRecord, "date_received">>): void {
+    const summary = this.complaints;
+    for (const c of records) {
+      summary.count++;
+      // Math.min / Math.max semantics: one NaN makes the result NaN
+      const time = new Date(c.date_received).getTime();
+      summary.earliest = Math.min(summary.earliest, time);
+      summary.latest = Math.max(summary.latest, time);
+      if (!c.country) summary.missingCountry++;
+      if (!c.device_model) summary.missingModel++;
+      if (!c.problem_code) summary.missingProblemCode++;
+    }
+  }
+
+  addExposure(records: Iterable<Pick<ExposureRecord, "units_sold">>): void {
+    for (const e of records) {
+      this.exposure.count++;
+      this.exposure.totalUnits += e.units_sold;
+    }
+  }
+
+  complaintSummary(): ComplaintSummary {
+    return { ...this.complaints };
+  }
+
+  exposureSummary(): ExposureSummary {
+    return { ...this.exposure };
+  }
+}
+
+function summarize(ctx: ValidationContext): {
+  complaints?: ComplaintSummary;
+  exposure?: ExposureSummary;
+} {
+  const summaries = new ValidationSummaryAccumulator();
+  if (ctx.complaints && !ctx.complaintSummary) summaries.addComplaints(ctx.complaints);
+  if (ctx.exposure && !ctx.exposureSummary) summaries.addExposure(ctx.exposure);
+  return {
+    complaints: ctx.complaintSummary ?? (ctx.complaints ? summaries.complaintSummary() : undefined),
+    exposure: ctx.exposureSummary ?? (ctx.exposure ? summaries.exposureSummary() : undefined),
+  };
+}
+
 /**
  * Run all validation rules (critical / major / minor) against the case context.
  */
 export function runValidation(ctx: ValidationContext): ValidationResult[] {
   const results: ValidationResult[] = [];
+  const { complaints, exposure } = summarize(ctx);
 
   // ── Critical Rules ──────────────────────────────────────────────
 
   // Missing denominator
-  if (!ctx.exposure || ctx.exposure.length === 0) {
+  if (!exposure || exposure.count === 0) {
     results.push({
       ruleKey: "denominator_present",
       severity: "critical",
@@ -45,8 +125,8 @@ export function runValidation(ctx: ValidationContext): ValidationResult[] {
   }
 
   // Denominator == 0
-  if (ctx.exposure && ctx.exposure.length > 0) {
-    const totalUnits = ctx.exposure.reduce((sum, e) => sum + e.units_sold, 0);
+  if (exposure && exposure.count > 0) {
+    const totalUnits = exposure.totalUnits;
     if (totalUnits === 0) {
       results.push({
         ruleKey: "denominator_nonzero",
@@ -65,10 +145,9 @@ export function runValidation(ctx: ValidationContext): ValidationResult[] {
   }
 
   // Surveillance period coverage
-  if (ctx.complaints && ctx.complaints.length > 0 && ctx.exposure && ctx.exposure.length > 0) {
-    const complaintDates = ctx.complaints.map((c) => new Date(c.date_received));
-    const earliest = new Date(Math.min(...complaintDates.map((d) => d.getTime())));
-    const latest = new Date(Math.max(...complaintDates.map((d) => d.getTime())));
+  if (complaints && complaints.count > 0 && exposure && exposure.count > 0) {
+    const earliest = new Date(complaints.earliest);
+    const latest = new Date(complaints.latest);
 
     if (earliest < ctx.caseStart || latest > ctx.caseEnd) {
       results.push({
@@ -208,17 +287,15 @@ export function runValidation(ctx: ValidationContext): ValidationResult[] {
   // ── Minor Rules ─────────────────────────────────────────────────
 
   // Check optional fields in complaints
-  if (ctx.complaints && ctx.complaints.length > 0) {
-    const missingCountry = ctx.complaints.filter((c) => !c.country).length;
-    const missingModel = ctx.complaints.filter((c) => !c.device_model).length;
-    const missingProbCode = ctx.complaints.filter((c) => !c.problem_code).length;
+  if (complaints && complaints.count > 0) {
+    const { missingCountry, missingModel, missingProblemCode: missingProbCode } = complaints;
 
     if (missingCountry > 0 || missingModel > 0 || missingProbCode > 0) {
       results.push({
         ruleKey: "optional_fields_present",
         severity: "minor",
         status: "warn",
-        message: `Optional fields missing — country: ${missingCountry}, device_model: ${missingModel}, problem_code: ${missingProbCode} of ${ctx.complaints.length} records.`,
+        message: `Optional fields missing — country: ${missingCountry}, device_model: ${missingModel}, problem_code: ${missingProbCode} of ${complaints.count} records.`,
       });
     } else {
       results.push({
@@ -102,14 +102,13 @@ function computeDerivedField(value: string, rule: DerivedFieldRule): string {
 // ── Main Normalization ───────────────────────────────────────────────
 
 /**
- * Normalize a single CSV record according to the mapping profile.
+ * Build a normalizer for one file's mapping profile. The rule lookup maps
+ * are built once, so applying it chunk by chunk costs the same per record
+ * as a single pass.
  */
-export function normalizeRecord(
-  rawRecord: Record<string, string>,
+export function createRecordNormalizer(
   profile: FileMappingProfile
-): Record<string, string> {
-  const result: Record<string, string> = {};
-
+): (rawRecord: Record<string, string>) => Record<string, string> {
   // Build lookup maps
   const dateRuleMap = new Map<string, DateParsingRule>();
   for (const rule of profile.dateParsingRules) {
@@ -128,44 +127,58 @@ export function normalizeRecord(
     cleanRuleMap.set(rule.column, rule);
   }
 
-  // Apply column mappings
-  for (const mapping of profile.columnMappings) {
-    let value = rawRecord[mapping.sourceColumn] ?? "";
-
-    // Step 1: Clean value
-    const cleanRule = cleanRuleMap.get(mapping.targetColumn);
-    if (cleanRule) {
-      value = cleanValue(value, cleanRule);
-    }
-
-    // Step 2: Parse dates
-    const dateRule = dateRuleMap.get(mapping.targetColumn);
-    if (dateRule && value) {
-      value = parseDate(value, dateRule.format);
+  return (rawRecord) => {
+    const result: Record<string, string> = {};
+
+    // Apply column mappings
+    for (const mapping of profile.columnMappings) {
+      let value = rawRecord[mapping.sourceColumn] ?? "";
+
+      // Step 1: Clean value
+      const cleanRule = cleanRuleMap.get(mapping.targetColumn);
+      if (cleanRule) {
+        value = cleanValue(value, cleanRule);
+      }
+
+      // Step 2: Parse dates
+      const dateRule = dateRuleMap.get(mapping.targetColumn);
+      if (dateRule && value) {
+        value = parseDate(value, dateRule.format);
+      }
+
+      // Step 3: Normalize booleans
+      const boolRule = boolRuleMap.get(mapping.targetColumn);
+      if (boolRule && value) {
+        value = normalizeBoolean(value, boolRule);
+      }
+
+      // Step 4: Apply code mapping dictionaries
+      const codeDict = codeDictMap.get(mapping.targetColumn);
+      if (codeDict && value && codeDict.mappings[value]) {
+        value = codeDict.mappings[value];
+      }
+
+      result[mapping.targetColumn] = value;
     }
 
-    // Step 3: Normalize booleans
-    const boolRule = boolRuleMap.get(mapping.targetColumn);
-    if (boolRule && value) {
-      value = normalizeBoolean(value, boolRule);
+    // Step 5: Compute derived fields
+    for (const rule of profile.derivedFieldRules) {
+      const sourceValue = result[rule.sourceColumn] ?? "";
+      result[rule.targetColumn] = computeDerivedField(sourceValue, rule);
     }
 
-    // Step 4: Apply code mapping dictionaries
-    const codeDict = codeDictMap.get(mapping.targetColumn);
-    if (codeDict && value && codeDict.mappings[value]) {
-      value = codeDict.mappings[value];
-    }
-
-    result[mapping.targetColumn] = value;
-  }
-
-  // Step 5: Compute derived fields
-  for (const rule of profile.derivedFieldRules) {
-    const sourceValue = result[rule.sourceColumn] ?? "";
-    result[rule.targetColumn] = computeDerivedField(sourceValue, rule);
-  }
+    return result;
+  };
+}
 
-  return result;
+/**
+ * Normalize a single CSV record according to the mapping profile.
+ */
+export function normalizeRecord(
+  rawRecord: Record<string, string>,
+  profile: FileMappingProfile
+): Record<string, string> {
+  return createRecordNormalizer(profile)(rawRecord);
 }
 
 /**
@@ -175,7 +188,8 @@ export function normalizeRecords(
   rawRecords: Record<string, string>[],
   profile: FileMappingProfile
 ): Record<string, string>[] {
-  return rawRecords.map((r) => normalizeRecord(r, profile));
+  const normalize = createRecordNormalizer(profile);
+  return rawRecords.map((r) => normalize(r));
 }
 
 /**
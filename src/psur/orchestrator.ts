@@ -10,9 +10,12 @@ import { v4 as uuidv4 } from "uuid";
 import { parse } from "csv-parse/sync";
 
 import { sha256Bytes } from "../shared/hash.js";
-import { computeTrend } from "../analytics/trend.js";
-import { computeExposureAnalytics } from "../analytics/exposure.js";
-import { computeComplaintAnalytics } from "../analytics/complaints_analytics.js";
+import { streamCsv, CSV_PARSE_OPTIONS } from "../evidence/csv_stream.js";
+import { createRecordNormalizer, normalizeJsonObject } from "../packs/normalizer.js";
+import { MonthlySeriesAccumulator } from "../analytics/series.js";
+import { computeTrendFromSeries } from "../analytics/trend.js";
+import { ExposureAnalyticsAccumulator } from "../analytics/exposure.js";
+import { ComplaintAnalyticsAccumulator } from "../analytics/complaints_analytics.js";
 import { computeIncidentAnalytics } from "../analytics/incidents.js";
 import { computeCAPAAnalytics } from "../analytics/capa_analytics.js";
 import { computeFSCAAnalytics } from "../analytics/fsca_analytics.js";
@@ -22,7 +25,7 @@ import { computeRiskAnalytics } from "../analytics/risk_analytics.js";
 import { buildAllAnnexTables } from "./annex/registry.js";
 import { generateAllSections } from "./sections/generators/index.js";
 import { DTRRecorder } from "../trace/dtr.js";
-import { runValidation } from "../grkb/validator.js";
+import { runValidation, ValidationSummaryAccumulator } from "../grkb/validator.js";
 
 import type {
   PsurComputationContext,
@@ -32,10 +35,26 @@ import type {
   SectionResult,
 } from "./context.js";
 import type { ValidationResult } from "../shared/types.js";
+import type { PackProfile } from "../packs/types.js";
 
 export interface OrchestratorInput {
   samplesDir: string;
   caseId?: string;
+  /**
+   * Stream the high-volume CSVs (complaints, sales) chunk by chunk into the
+   * aggregations instead of reading them whole. Results are identical; peak
+   * memory is set by the aggregate state rather than the file size.
+   */
+  streaming?: boolean;
+  /** Records per chunk in streaming mode (default 10,000). */
+  chunkRows?: number;
+  /**
+   * Mapping profile (pack.profile.json) to normalize raw files with, matched
+   * by filename: CSV records as in `normalizeRecords`, JSON files (device
+   * master, risk summary) as in `normalizeJsonObject`. Omit when
+   * `samplesDir` already holds normalized files.
+   */
+  profile?: PackProfile;
 }
 
 export interface OrchestratorOutput {
@@ -63,6 +82,27 @@ const FILES: FileSpec[] = [
   { name: "distribution.csv", type: "distribution", format: "csv" },
 ];
 
+/** Files whose records are folded into aggregates rather than kept in `rawData`. */
+const STREAMABLE_TYPES = new Set(["complaints", "sales"]);
+
+// Coerce CSV boolean fields
+function toComplaint(c: any) {
+  return {
+    ...c,
+    serious: c.serious === "true" || c.serious === true,
+    reportable: c.reportable === "true" || c.reportable === true,
+  };
+}
+
+function toExposure(s: any) {
+  return {
+    period: s.period,
+    units_sold: Number(s.units_sold),
+    country: s.country,
+    device_model: s.device_model,
+  };
+}
+
 export async function runPsurPipeline(input: OrchestratorInput): Promise<OrchestratorOutput> {
   const caseId = input.caseId ?? uuidv4();
   const recorder = new DTRRecorder(caseId);
@@ -73,26 +113,67 @@ export async function runPsurPipeline(input: OrchestratorInput): Promise<Orchest
   const evidenceAtoms: EvidenceAtomRef[] = [];
   const rawData: Record<string, any> = {};
 
+  // Complaints and sales are folded into these as they are read, so the
+  // records themselves are never needed after ingestion.
+  const exposureAccumulator = new ExposureAnalyticsAccumulator();
+  const complaintAccumulator = new ComplaintAnalyticsAccumulator();
+  const seriesAccumulator = new MonthlySeriesAccumulator();
+  const validationSummaries = new ValidationSummaryAccumulator();
+  const ingestChunk: Record<string, (records: any[]) => void> = {
+    complaints: (records) => {
+      const complaints = records.map(toComplaint);
+      complaintAccumulator.add(complaints);
+      const complaintRecords = complaints.map((c: any) => ({
+        complaint_id: c.complaint_id,
+        date_received: c.date_received,
+      }));
+      seriesAccumulator.addComplaints(complaintRecords);
+      validationSummaries.addComplaints(complaintRecords);
+    },
+    sales: (records) => {
+      const exposure = records.map(toExposure);
+      exposureAccumulator.add(exposure);
+      seriesAccumulator.addExposure(exposure);
+      validationSummaries.addExposure(exposure);
+    },
+  };
+
   for (const file of FILES) {
     const t0 = new Date();
     const filePath = path.join(input.samplesDir, file.name);
-    const buffer = readFileSync(filePath);
-    const hash = sha256Bytes(buffer);
     const atomId = uuidv4();
-
-    let parsed: any;
-    if (file.format === "json") {
-      parsed = JSON.parse(buffer.toString("utf-8"));
-    } else {
-      parsed = parse(buffer.toString("utf-8"), {
-        columns: true,
-        skip_empty_lines: true,
-        trim: true,
-        relax_column_count: true,
+    const fileProfile = input.profile?.fileMappings.find((m) => m.filename === file.name);
+    const normalize =
+      fileProfile && file.format === "csv" ? createRecordNormalizer(fileProfile) : undefined;
+
+    let hash: string;
+    let recordCount: number;
+    if (input.streaming && STREAMABLE_TYPES.has(file.type)) {
+      const streamed = await streamCsv(filePath, ingestChunk[file.type], {
+        chunkRows: input.chunkRows,
+        normalize,
       });
+      hash = streamed.sha256;
+      recordCount = streamed.records;
+    } else {
+      const buffer = readFileSync(filePath);
+      hash = sha256Bytes(buffer);
+      let parsed: any;
+      if (file.format === "json") {
+        parsed = JSON.parse(buffer.toString("utf-8"));
+        if (fileProfile) parsed = normalizeJsonObject(parsed, fileProfile);
+      } else {
+        parsed = parse(buffer.toString("utf-8"), CSV_PARSE_OPTIONS);
+        if (normalize) parsed = parsed.map((r: Record<string, string>) => normalize(r));
+      }
+      recordCount = Array.isArray(parsed) ? parsed.length : 1;
+      if (STREAMABLE_TYPES.has(file.type)) {
+        ingestChunk[file.type](parsed);
+      } else {
+        rawData[file.type] = parsed;
+      }
     }
 
-    rawData[file.type] = parsed;
     evidenceAtoms.push({
       id: atomId,
       type: file.type,
@@ -112,10 +193,10 @@ export async function runPsurPipeline(input: OrchestratorInput): Promise<Orchest
         steps: [
           { stepNumber: 1, action: "ingest", detail: `File: ${file.name}` },
           { stepNumber: 2, action: "hash", detail: `SHA-256: ${hash.slice(0, 16)}...` },
-          { stepNumber: 3, action: "parse", detail: `Format: ${file.format}, records: ${Array.isArray(parsed) ? parsed.length : 1}` },
+          { stepNumber: 3, action: "parse", detail: `Format: ${file.format}, records: ${recordCount}` },
         ],
       },
-      outputContent: { atomId, type: file.type, recordCount: Array.isArray(parsed) ? parsed.length : 1 },
+      outputContent: { atomId, type: file.type, recordCount },
       validationResults: { pass: true, messages: [] },
     });
   }
@@ -129,13 +210,6 @@ export async function runPsurPipeline(input: OrchestratorInput): Promise<Orchest
   const periodStart = deviceMaster.psur_period_start;
   const periodEnd = deviceMaster.psur_period_end;
 
-  // Coerce CSV boolean fields
-  const complaints = (rawData.complaints as any[]).map((c: any) => ({
-    ...c,
-    serious: c.serious === "true" || c.serious === true,
-    reportable: c.reportable === "true" || c.reportable === true,
-  }));
-  const sales = rawData.sales as any[];
   const incidents = rawData.serious_incidents as any[];
   const capas = (rawData.capa as any[]).map((c: any) => ({
     ...c,
@@ -153,18 +227,12 @@ export async function runPsurPipeline(input: OrchestratorInput): Promise<Orchest
 
   // Exposure
   const t1 = new Date();
-  const exposureSales = sales.map((s: any) => ({
-    period: s.period,
-    units_sold: Number(s.units_sold),
-    country: s.country,
-    device_model: s.device_model,
-  }));
-  const exposureAnalytics = computeExposureAnalytics(exposureSales);
+  const exposureAnalytics = exposureAccumulator.build();
   const expDerivedId = uuidv4();
   derivedInputs.push({ id: expDerivedId, type: "EXPOSURE_ANALYTICS", formula: "sum_group_by", codeHash: sha256Bytes(Buffer.from("computeExposureAnalytics_v1")) });
 
   // Complaints
-  const complaintAnalytics = computeComplaintAnalytics(complaints);
+  const complaintAnalytics = complaintAccumulator.build();
   const cmpDerivedId = uuidv4();
   derivedInputs.push({ id: cmpDerivedId, type: "COMPLAINT_ANALYTICS", formula: "group_count", codeHash: sha256Bytes(Buffer.from("computeComplaintAnalytics_v1")) });
 
@@ -174,12 +242,7 @@ export async function runPsurPipeline(input: OrchestratorInput): Promise<Orchest
   derivedInputs.push({ id: incDerivedId, type: "INCIDENT_ANALYTICS", formula: "count_rate", codeHash: sha256Bytes(Buffer.from("computeIncidentAnalytics_v1")) });
 
   // Trend (reuse existing engine)
-  const complaintRecords = complaints.map((c: any) => ({
-    complaint_id: c.complaint_id,
-    date_received: c.date_received,
-  }));
-  const exposureRecords = exposureSales;
-  const trendResult = computeTrend(complaintRecords, exposureRecords);
+  const trendResult = computeTrendFromSeries(seriesAccumulator.build());
   const trendDerivedId = uuidv4();
   derivedInputs.push({ id: trendDerivedId, type: "TREND_ANALYSIS", formula: "SPC_3SIGMA_WESTERN_ELECTRIC", codeHash: sha256Bytes(Buffer.from("computeTrend_v1")) });
 
@@ -349,8 +412,8 @@ export async function runPsurPipeline(input: OrchestratorInput): Promise<Orchest
   const baseValidation = runValidation({
     caseStart: new Date(periodStart),
     caseEnd: new Date(periodEnd),
-    complaints: complaintRecords,
-    exposure: exposureRecords,
+    complaintSummary: validationSummaries.complaintSummary(),
+    exposureSummary: validationSummaries.exposureSummary(),
     capa: capas,
     riskSummary,
     trendResult,
@@ -5,6 +5,18 @@ export function sha256Bytes(data: Buffer): string {
   return createHash("sha256").update(data).digest("hex");
 }
 
+/**
+ * Incremental SHA-256 over a sequence of byte chunks (e.g. stream reads).
+ * `digest()` equals `sha256Bytes` of the concatenated chunks.
+ */
+export function sha256Incremental(): { update(chunk: Buffer): void; digest(): string } {
+  const hash = createHash("sha256");
+  return {
+    update: (chunk) => void hash.update(chunk),
+    digest: () => hash.digest("hex"),
+  };
+}
+
 /** SHA-256 of a UTF-8 string. */
 export function sha256String(data: string): string {
   return createHash("sha256").update(data, "utf8").digest("hex");
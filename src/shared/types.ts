@@ -1,8 +1,13 @@
 /** Trend determination outcomes */
 export type TrendDetermination = "NO_TREND" | "TREND_DETECTED" | "INCONCLUSIVE";
 
-/** Western Electric rule identifiers (Rules 1–4) */
-export type WesternElectricRule = "RULE_1" | "RULE_2" | "RULE_3" | "RULE_4";
+/**
+ * Western Electric rule identifiers (Rules 1–4). RULE_5–RULE_8 are the
+ * Nelson rules reported by the batch evaluator (scripts/spc_rules.py).
+ */
+export type WesternElectricRule =
+  | "RULE_1" | "RULE_2" | "RULE_3" | "RULE_4"
+  | "RULE_5" | "RULE_6" | "RULE_7" | "RULE_8";
 
 /** Validation severity levels */
 export type ValidationSeverity = "critical" | "major" | "minor";
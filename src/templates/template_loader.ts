@@ -5,8 +5,19 @@
  * schema-based DOCX renderer.
  */
 
-import { readFileSync, existsSync } from "fs";
-import type { TemplateJson } from "./template_schema.js";
+import { createHash } from "crypto";
+import { readFileSync, existsSync, statSync } from "fs";
+import path from "path";
+import type {
+  DecisionCase,
+  DecisionTables,
+  FieldIndex,
+  FlatTemplateJson,
+  SectionPackManifest,
+  SectionPackSection,
+  TablePlans,
+  TemplateJson,
+} from "./template_schema.js";
 
 /**
  * Load and parse a template.json file.
@@ -17,8 +28,8 @@ export function loadTemplateJson(filePath: string): TemplateJson {
     throw new Error(`Template JSON not found: ${filePath}`);
   }
 
-  const raw = readFileSync(filePath, "utf-8");
-  const parsed = JSON.parse(raw) as TemplateJson;
+  const raw = readFileSync(filePath);
+  const parsed = JSON.parse(raw.toString("utf-8")) as TemplateJson;
 
   // Basic structural validation
   if (!parsed.meta || !parsed.schema || !parsed.layout || !parsed.theme) {
@@ -35,5 +46,183 @@ export function loadTemplateJson(filePath: string): TemplateJson {
     throw new Error(`Invalid template.json: theme.word_form_fidelity is missing`);
   }
 
+  // Derived files are attached only when generated from these exact bytes;
+  // editing template.json without regenerating the pack leaves them stale
+  // even though meta.id / meta.revision are unchanged. They are parsed on
+  // first access, so a render that never reads e.g. decisionTables does not
+  // pay for it.
+  const sourceSha256 = createHash("sha256").update(raw).digest("hex");
+  for (const key of Object.keys(DERIVED_FILES) as DerivedKey[]) {
+    const attach = (value: unknown) =>
+      Object.defineProperty(parsed, key, { value, writable: true, enumerable: true, configurable: true });
+    Object.defineProperty(parsed, key, {
+      get: () => {
+        const value = loadCurrentDerived(filePath, key, sourceSha256);
+        attach(value);
+        return value;
+      },
+      set: attach,
+      enumerable: true,
+      configurable: true,
+    });
+  }
+
+  return parsed;
+}
+
+type DerivedKey = "flat" | "fieldIndex" | "tablePlans" | "decisionTables";
+
+const DERIVED_FILES: Record<DerivedKey, { file: string; load: (templateJsonPath: string) => TemplateJson[DerivedKey] }> = {
+  flat: { file: "template.flat.json", load: loadFlatTemplateJson },
+  fieldIndex: { file: "field_index.json", load: loadFieldIndex },
+  tablePlans: { file: "table_plans.json", load: loadTablePlans },
+  decisionTables: { file: "decision_tables.json", load: loadDecisionTables },
+};
+
+/** Parsed derived files by absolute path, reused while the file and its template.json are unchanged. */
+const derivedCache = new Map<string, { stamp: string; value: unknown }>();
+
+/**
+ * A template_pack file generated from the template.json with hash
+ * `sourceSha256`, or undefined. Missing, stale, unreadable and invalid
+ * files are all treated alike: the caller falls back to template.json.
+ */
+function loadCurrentDerived(
+  templateJsonPath: string,
+  key: DerivedKey,
+  sourceSha256: string,
+): TemplateJson[DerivedKey] {
+  const { file, load } = DERIVED_FILES[key];
+  const derivedPath = path.resolve(path.dirname(templateJsonPath), "template_pack", file);
+  let stamp: string;
+  try {
+    const stat = statSync(derivedPath);
+    stamp = `${sourceSha256}:${stat.mtimeMs}:${stat.size}`;
+  } catch {
+    return undefined;
+  }
+
+  const cached = derivedCache.get(derivedPath);
+  if (cached?.stamp === stamp) return cached.value as TemplateJson[DerivedKey];
+
+  let value: TemplateJson[DerivedKey];
+  try {
+    const derived = load(templateJsonPath);
+    value = derived?.meta?.sourceSha256 === sourceSha256 ? derived : undefined;
+  } catch {
+    value = undefined;
+  }
+  derivedCache.set(derivedPath, { stamp, value });
+  return value;
+}
+
+/**
+ * Load the pre-resolved variant emitted by scripts/generate_template_json.py
+ * at template_pack/template.flat.json next to template.json, if present.
+ */
+export function loadFlatTemplateJson(templateJsonPath: string): FlatTemplateJson | undefined {
+  const flatPath = path.join(path.dirname(templateJsonPath), "template_pack", "template.flat.json");
+  if (!existsSync(flatPath)) return undefined;
+
+  const parsed = JSON.parse(readFileSync(flatPath, "utf-8")) as FlatTemplateJson;
+  if (parsed.meta?.variant !== "flat" || !parsed.sections) {
+    throw new Error(`Invalid template.flat.json: ${flatPath}`);
+  }
+  return parsed;
+}
+
+/**
+ * Load the JSON-pointer field index emitted at template_pack/field_index.json
+ * next to template.json, if present.
+ */
+export function loadFieldIndex(templateJsonPath: string): FieldIndex | undefined {
+  const indexPath = path.join(path.dirname(templateJsonPath), "template_pack", "field_index.json");
+  if (!existsSync(indexPath)) return undefined;
+
+  const parsed = JSON.parse(readFileSync(indexPath, "utf-8")) as FieldIndex;
+  if (!parsed.fields || !parsed.sections) {
+    throw new Error(`Invalid field_index.json: ${indexPath}`);
+  }
+  return parsed;
+}
+
+/**
+ * Load the precomputed table layout plans emitted at
+ * template_pack/table_plans.json next to template.json, if present.
+ */
+export function loadTablePlans(templateJsonPath: string): TablePlans | undefined {
+  const plansPath = path.join(path.dirname(templateJsonPath), "template_pack", "table_plans.json");
+  if (!existsSync(plansPath)) return undefined;
+
+  const parsed = JSON.parse(readFileSync(plansPath, "utf-8")) as TablePlans;
+  if (!parsed.tables || !parsed.page) {
+    throw new Error(`Invalid table_plans.json: ${plansPath}`);
+  }
   return parsed;
 }
+
+/**
+ * Load the compiled conditional decision tables emitted at
+ * template_pack/decision_tables.json next to template.json, if present.
+ */
+export function loadDecisionTables(templateJsonPath: string): DecisionTables | undefined {
+  const tablesPath = path.join(path.dirname(templateJsonPath), "template_pack", "decision_tables.json");
+  if (!existsSync(tablesPath)) return undefined;
+
+  const parsed = JSON.parse(readFileSync(tablesPath, "utf-8")) as DecisionTables;
+  if (!parsed.tables || !parsed.byDiscriminator) {
+    throw new Error(`Invalid decision_tables.json: ${tablesPath}`);
+  }
+  return parsed;
+}
+
+/**
+ * The active case of the conditional at `pointer` for a discriminator value,
+ * or undefined when the value selects no case. One lookup, no schema walk.
+ */
+export function selectDecisionCase(
+  decisionTables: DecisionTables,
+  pointer: string,
+  value: unknown,
+): DecisionCase | undefined {
+  if (value === undefined || value === null) return undefined;
+  const key = typeof value === "string" ? value : JSON.stringify(value);
+  return decisionTables.tables[pointer]?.cases[key];
+}
+
+/**
+ * Load the per-section pack manifest emitted at
+ * template_pack/sections/manifest.json next to template.json, if present.
+ */
+export function loadSectionPackManifest(templateJsonPath: string): SectionPackManifest | undefined {
+  const manifestPath = path.join(path.dirname(templateJsonPath), "template_pack", "sections", "manifest.json");
+  if (!existsSync(manifestPath)) return undefined;
+
+  const parsed = JSON.parse(readFileSync(manifestPath, "utf-8")) as SectionPackManifest;
+  if (!parsed.sections || !parsed.uiOrder || !parsed.rootSchema) {
+    throw new Error(`Invalid section pack manifest: ${manifestPath}`);
+  }
+  return parsed;
+}
+
+/**
+ * Load one section file of the split pack, checking it against the
+ * manifest hash so a stale or partially written file is never used.
+ */
+export function loadSectionPackSection(
+  templateJsonPath: string,
+  manifest: SectionPackManifest,
+  sectionKey: string,
+): SectionPackSection {
+  const entry = manifest.sections[sectionKey];
+  if (!entry) {
+    throw new Error(`Section ${sectionKey} is not in the section pack manifest`);
+  }
+  const sectionPath = path.join(path.dirname(templateJsonPath), "template_pack", "sections", entry.file);
+  const raw = readFileSync(sectionPath);
+  const digest = createHash("sha256").update(raw).digest("hex");
+  if (digest !== entry.sha256) {
+    throw new Error(`Section pack file ${entry.file} does not match its manifest hash`);
+  }
+  return JSON.parse(raw.toString("utf-8")) as SectionPackSection;
+}
@@ -108,6 +108,163 @@ export interface UISchemaEntry {
   [key: string]: unknown;
 }
 
+// ── Flat Variant (template_pack/template.flat.json) ─────────────────
+
+/** One case of an expanded if/then conditional: the full required list when it applies. */
+export interface FlatBranchCase {
+  required: string[];
+  /** Subtrees that become required in this case (e.g. "annual_format"). */
+  active: string[];
+}
+
+export interface FlatBranches {
+  discriminator: string;
+  /** Keyed by discriminator value; non-string values are JSON-encoded ("true"). */
+  cases: Record<string, FlatBranchCase>;
+}
+
+/** Schema node with $refs inlined, conditionals expanded and ui hints merged. */
+export interface FlatSchemaNode {
+  type?: string | string[];
+  properties?: Record<string, FlatSchemaNode>;
+  items?: FlatSchemaNode;
+  required?: string[];
+  enum?: unknown[];
+  ui: { widget: string; [key: string]: unknown };
+  "x-branches"?: FlatBranches;
+  [key: string]: unknown;
+}
+
+/** `meta` of a file derived from template.json by scripts/generate_template_json.py. */
+export interface DerivedMeta {
+  id: string;
+  revision: string;
+  source: string;
+  /** SHA-256 of the template.json bytes the file was generated from. */
+  sourceSha256: string;
+}
+
+export interface FlatTemplateJson {
+  meta: TemplateMeta & DerivedMeta & { variant: "flat" };
+  sectionOrder: string[];
+  globalOptions: Record<string, unknown>;
+  form: FlatSchemaNode;
+  psur_cover_page: FlatSchemaNode;
+  sections: Record<string, FlatSchemaNode>;
+}
+
+// ── Field Index (template_pack/field_index.json) ───────────────────
+
+export interface FieldIndexEntry {
+  type: string | string[] | null;
+  kind: "leaf" | "object" | "table" | "array";
+  /** Required by the parent object. */
+  required: boolean;
+  /** Required at every level from the section (or cover page) root. */
+  required_path: boolean;
+  widget: string;
+  enum: unknown[] | null;
+  const: unknown;
+  bounds: Partial<Record<"minimum" | "maximum" | "minLength" | "minItems" | "maxItems", number>> | null;
+  /** JSON pointer of the enclosing table, for row fields. */
+  table: string | null;
+}
+
+export interface FieldIndex {
+  meta: DerivedMeta & { fieldCount: number };
+  /** Keyed by JSON pointer; "*" stands for any row index. */
+  fields: Record<string, FieldIndexEntry>;
+  sections: Record<string, { required_leaves: number; optional_leaves: number; tables: number }>;
+}
+
+// ── Table Layout Plans (template_pack/table_plans.json) ─────────────
+
+export interface TablePlanCell {
+  text: string;
+  colStart: number;
+  span: number;
+  widthTwips: number;
+}
+
+export interface TablePlan {
+  columnKeys: string[];
+  columnWidthsTwips: number[];
+  totalWidthTwips: number;
+  /** Resolved header grid, one array of cells per header row. */
+  headerRows: TablePlanCell[][];
+  repeatHeader: boolean;
+}
+
+export interface TablePlans {
+  meta: DerivedMeta;
+  page: { model: string; widthTwips: number; heightTwips: number; marginTwips: number; contentWidthTwips: number };
+  /** Keyed like layout.tables. */
+  tables: Record<string, TablePlan>;
+}
+
+// ── Decision Tables (template_pack/decision_tables.json) ────────────
+
+export interface DecisionLayoutTable {
+  layoutKey: string;
+  columns: string[];
+}
+
+export interface DecisionCase {
+  required: string[];
+  /** Subtrees switched on by this case. */
+  active: string[];
+  /** Subtrees switched on only by other cases. */
+  inactive: string[];
+  /** Row keys of every table under the active subtrees, keyed by table JSON pointer. */
+  activeColumns: Record<string, string[]>;
+  /** layout.tables entries that render the active subtrees. */
+  layoutTables: DecisionLayoutTable[];
+}
+
+export interface DecisionTable {
+  discriminator: string;
+  discriminatorPointer: string;
+  caseKeys: string[];
+  defaultCase: string | null;
+  /** Keyed by discriminator value; non-string values are JSON-encoded ("true"). */
+  cases: Record<string, DecisionCase>;
+}
+
+export interface DecisionTables {
+  meta: DerivedMeta;
+  /** Keyed by the JSON pointer of the conditional object. */
+  tables: Record<string, DecisionTable>;
+  /** Discriminator field pointer → conditional object pointer. */
+  byDiscriminator: Record<string, string>;
+}
+
+// ── Section Pack (template_pack/sections/) ──────────────────────────
+
+export interface SectionPackEntry {
+  file: string;
+  bytes: number;
+  sha256: string;
+  etag: string;
+}
+
+export interface SectionPackManifest {
+  meta: { id: string; revision: string; source: string; renderer_targets: string[] };
+  uiOrder: string[];
+  globalOptions: Record<string, unknown>;
+  /** Root schema without `sections` (form header and cover page), with the $defs it references. */
+  rootSchema: Record<string, unknown>;
+  sections: Record<string, SectionPackEntry>;
+}
+
+export interface SectionPackSection {
+  meta: { id: string; revision: string; source: string; section: string };
+  required: boolean;
+  /** Standalone section schema: referenced $defs are copied in. */
+  schema: Record<string, unknown>;
+  uiSchema: Record<string, unknown>;
+  layoutTables: Record<string, TableLayout>;
+}
+
 // ── Full Template JSON ──────────────────────────────────────────────
 
 export interface TemplateJson {
@@ -116,6 +273,14 @@ export interface TemplateJson {
   uiSchema: Record<string, unknown>;
   layout: LayoutConfig;
   theme: ThemeConfig;
+  /** Pre-resolved variant, attached by the loader when it is emitted next to template.json. */
+  flat?: FlatTemplateJson;
+  /** JSON-pointer field index, attached by the loader alongside `flat`. */
+  fieldIndex?: FieldIndex;
+  /** Precomputed table layout plans, attached by the loader alongside `flat`. */
+  tablePlans?: TablePlans;
+  /** Compiled if/then decision tables, attached by the loader alongside `flat`. */
+  decisionTables?: DecisionTables;
 }
 
 /**
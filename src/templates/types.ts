@@ -80,6 +80,12 @@ export interface ClientConfig {
   clientId: string;
   name: string;
   defaultTemplateId: string;
+  /** Per-client template.json overrides applied by scripts/build_client_templates.py. */
+  templateOverrides?: {
+    theme?: Record<string, unknown>;
+    typography_lock?: { fontFamily?: string; fontSizePt?: number; lineHeight?: number };
+    prefill_rows?: Record<string, string[]>;
+  };
 }
 
 // ── Template Validation Result ──────────────────────────────────────
@@ -0,0 +1,213 @@
+/**
+ * Streaming ingest — Unit Tests
+ *
+ * Tests:
+ *   - runPsurPipeline() gives the same analytics, trend and validation with
+ *     `streaming: true` (small chunks) as with whole-file ingest
+ *   - a pack profile normalizes the raw CSV and JSON files in both modes
+ *   - compute* functions equal their *Accumulator forms fed in several batches
+ */
+
+import { describe, it, expect, beforeAll, afterAll } from "vitest";
+import { copyFileSync, existsSync, mkdirSync, readdirSync, readFileSync, rmSync, writeFileSync } from "fs";
+import path from "path";
+import { fileURLToPath } from "url";
+import { parse } from "csv-parse/sync";
+
+import { runPsurPipeline, type OrchestratorOutput } from "../../src/psur/orchestrator.js";
+import { CSV_PARSE_OPTIONS } from "../../src/evidence/csv_stream.js";
+import {
+  computeComplaintAnalytics,
+  ComplaintAnalyticsAccumulator,
+} from "../../src/analytics/complaints_analytics.js";
+import { computeExposureAnalytics, ExposureAnalyticsAccumulator } from "../../src/analytics/exposure.js";
+import { buildMonthlySeries, MonthlySeriesAccumulator } from "../../src/analytics/series.js";
+import { computeTrend, computeTrendFromSeries } from "../../src/analytics/trend.js";
+import { runValidation, ValidationSummaryAccumulator } from "../../src/grkb/validator.js";
+import type { PackProfile } from "../../src/packs/types.js";
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const PACK_DIR = path.resolve(__dirname, "..", "..", "packs", "demo_cardio_2023");
+const NORMALIZED_DIR = path.join(PACK_DIR, "normalized");
+const RAW_DIR = path.join(PACK_DIR, "raw");
+const TEMP_ROOT = path.resolve(__dirname, "..", ".tmp_streaming_test");
+
+// Deliberately uneven so batches straddle months and countries.
+const CHUNK_ROWS = 7;
+
+function readCsv(name: string): Record<string, string>[] {
+  return parse(readFileSync(path.join(NORMALIZED_DIR, name), "utf-8"), CSV_PARSE_OPTIONS);
+}
+
+function batches<T>(records: T[], size: number): T[][] {
+  const out: T[][] = [];
+  for (let i = 0; i < records.length; i += size) out.push(records.slice(i, i + size));
+  return out;
+}
+
+/** The parts of a pipeline run that must not depend on the ingest mode. */
+function comparable(output: OrchestratorOutput) {
+  const ctx = output.context;
+  return {
+    evidence: ctx.evidenceAtoms.map((a) => ({ fileName: a.fileName, sha256: a.sha256 })),
+    deviceMaster: ctx.deviceMaster,
+    exposureAnalytics: ctx.exposureAnalytics,
+    complaintAnalytics: ctx.complaintAnalytics,
+    incidentAnalytics: ctx.incidentAnalytics,
+    trendResult: ctx.trendResult,
+    riskAnalytics: ctx.riskAnalytics,
+    annexTables: ctx.annexTables,
+    validationResults: output.validationResults,
+  };
+}
+
+describe("runPsurPipeline (streaming vs whole-file ingest)", () => {
+  let whole: OrchestratorOutput;
+  let streamed: OrchestratorOutput;
+
+  beforeAll(async () => {
+    whole = await runPsurPipeline({ samplesDir: NORMALIZED_DIR, caseId: "STREAM-001", streaming: false });
+    streamed = await runPsurPipeline({
+      samplesDir: NORMALIZED_DIR,
+      caseId: "STREAM-001",
+      streaming: true,
+      chunkRows: CHUNK_ROWS,
+    });
+  });
+
+  it("hashes the evidence files identically", () => {
+    expect(streamed.context.evidenceAtoms.map((a) => a.sha256)).toEqual(
+      whole.context.evidenceAtoms.map((a) => a.sha256)
+    );
+  });
+
+  it("produces identical analytics, trend and validation output", () => {
+    expect(whole.context.complaintAnalytics.totalComplaints).toBeGreaterThan(CHUNK_ROWS);
+    expect(comparable(streamed)).toEqual(comparable(whole));
+  });
+
+  it("does not depend on the chunk size", async () => {
+    const single = await runPsurPipeline({
+      samplesDir: NORMALIZED_DIR,
+      caseId: "STREAM-001",
+      streaming: true,
+      chunkRows: 1,
+    });
+    expect(comparable(single)).toEqual(comparable(whole));
+  });
+});
+
+describe("runPsurPipeline (pack profile)", () => {
+  let profile: PackProfile;
+
+  beforeAll(() => {
+    profile = JSON.parse(readFileSync(path.join(PACK_DIR, "pack.profile.json"), "utf-8"));
+  });
+
+  afterAll(() => {
+    if (existsSync(TEMP_ROOT)) {
+      rmSync(TEMP_ROOT, { recursive: true, force: true });
+    }
+  });
+
+  it("normalizes raw files the same way in both modes", async () => {
+    const whole = await runPsurPipeline({ samplesDir: RAW_DIR, caseId: "STREAM-002", profile });
+    const streamed = await runPsurPipeline({
+      samplesDir: RAW_DIR,
+      caseId: "STREAM-002",
+      profile,
+      streaming: true,
+      chunkRows: CHUNK_ROWS,
+    });
+    expect(comparable(streamed)).toEqual(comparable(whole));
+  });
+
+  it("applies the profile to JSON files", async () => {
+    // A raw device master whose period keys need renaming.
+    const dir = path.join(TEMP_ROOT, "renamed_keys");
+    mkdirSync(dir, { recursive: true });
+    for (const name of readdirSync(RAW_DIR)) copyFileSync(path.join(RAW_DIR, name), path.join(dir, name));
+    const { psur_period_start, psur_period_end, ...rest } = JSON.parse(
+      readFileSync(path.join(RAW_DIR, "device_master.json"), "utf-8")
+    );
+    writeFileSync(
+      path.join(dir, "device_master.json"),
+      JSON.stringify({ ...rest, "Period Start": psur_period_start, "Period End": psur_period_end })
+    );
+    const renamed: PackProfile = {
+      ...profile,
+      fileMappings: profile.fileMappings.map((m) =>
+        m.filename === "device_master.json"
+          ? {
+              ...m,
+              columnMappings: [
+                { sourceColumn: "Period Start", targetColumn: "psur_period_start", confidence: 1 },
+                { sourceColumn: "Period End", targetColumn: "psur_period_end", confidence: 1 },
+              ],
+            }
+          : m
+      ),
+    };
+
+    const output = await runPsurPipeline({ samplesDir: dir, caseId: "STREAM-003", profile: renamed });
+    const normalizedMaster = JSON.parse(readFileSync(path.join(NORMALIZED_DIR, "device_master.json"), "utf-8"));
+    expect(output.context.deviceMaster).toEqual(normalizedMaster);
+    expect(output.context.periodStart).toBe(psur_period_start);
+    expect(output.context.periodEnd).toBe(psur_period_end);
+  });
+});
+
+describe("Accumulators", () => {
+  const complaints = readCsv("complaints.csv").map((c) => ({
+    ...c,
+    serious: c.serious === "true",
+    reportable: c.reportable === "true",
+  })) as any[];
+  const exposure = readCsv("sales.csv").map((s) => ({
+    period: s.period,
+    units_sold: Number(s.units_sold),
+    country: s.country,
+    device_model: s.device_model,
+  })) as any[];
+
+  it("ComplaintAnalyticsAccumulator equals computeComplaintAnalytics", () => {
+    const accumulator = new ComplaintAnalyticsAccumulator();
+    for (const batch of batches(complaints, CHUNK_ROWS)) accumulator.add(batch);
+    expect(accumulator.build()).toEqual(computeComplaintAnalytics(complaints));
+  });
+
+  it("ExposureAnalyticsAccumulator equals computeExposureAnalytics", () => {
+    const accumulator = new ExposureAnalyticsAccumulator();
+    for (const batch of batches(exposure, CHUNK_ROWS)) accumulator.add(batch);
+    expect(accumulator.build()).toEqual(computeExposureAnalytics(exposure));
+  });
+
+  it("MonthlySeriesAccumulator equals buildMonthlySeries, interleaved batches included", () => {
+    const accumulator = new MonthlySeriesAccumulator();
+    const exposureBatches = batches(exposure, CHUNK_ROWS);
+    const complaintBatches = batches(complaints, CHUNK_ROWS);
+    for (let i = 0; i < Math.max(exposureBatches.length, complaintBatches.length); i++) {
+      if (complaintBatches[i]) accumulator.addComplaints(complaintBatches[i]);
+      if (exposureBatches[i]) accumulator.addExposure(exposureBatches[i]);
+    }
+    const series = accumulator.build();
+    expect(series).toEqual(buildMonthlySeries(complaints, exposure));
+    expect(computeTrendFromSeries(series)).toEqual(computeTrend(complaints, exposure));
+  });
+
+  it("ValidationSummaryAccumulator gives the same validation as the record arrays", () => {
+    const accumulator = new ValidationSummaryAccumulator();
+    for (const batch of batches(complaints, CHUNK_ROWS)) accumulator.addComplaints(batch);
+    for (const batch of batches(exposure, CHUNK_ROWS)) accumulator.addExposure(batch);
+    const caseStart = new Date("2023-01-01");
+    const caseEnd = new Date("2023-12-31");
+    expect(
+      runValidation({
+        caseStart,
+        caseEnd,
+        complaintSummary: accumulator.complaintSummary(),
+        exposureSummary: accumulator.exposureSummary(),
+      })
+    ).toEqual(runValidation({ caseStart, caseEnd, complaints, exposure }));
+  });
+});
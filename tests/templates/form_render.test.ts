@@ -7,6 +7,7 @@
  *   - Checkboxes, enum selects, and textarea fields render correctly
  *   - All 13 sections A-M are rendered
  *   - Cover page includes form-style labeled fields
+ *   - Planned tables render merged headers and fall back to row order
  *   - Integration: renderWithTemplate routes to form renderer
  */
 
@@ -14,6 +15,7 @@ import { describe, it, expect } from "vitest";
 import path from "path";
 import { fileURLToPath } from "url";
 import { existsSync } from "fs";
+import PizZip from "pizzip";
 
 import { renderFormDocx } from "../../src/document/renderers/psur_form_docx.js";
 import { loadTemplateJson } from "../../src/templates/template_loader.js";
@@ -296,6 +298,90 @@ describe("mapOutputToTemplate (form fields)", () => {
   });
 });
 
+// ── Planned tables (template_pack/table_plans.json) ────────────────
+
+/** Text of every run in word/document.xml, in document order. */
+function documentTexts(buffer: Buffer): { xml: string; texts: string[] } {
+  const xml = new PizZip(buffer).file("word/document.xml")!.asText();
+  const texts = [...xml.matchAll(/<w:t(?:\s[^>]*)?>([^<]*)<\/w:t>/g)].map((m) => m[1]);
+  return { xml, texts };
+}
+
+describe("renderFormDocx (planned tables)", () => {
+  const output = makeMockPSUROutput();
+  const SECTION_KEY = "C_volume_of_sales_and_population_exposure";
+  const LAYOUT_KEY = "C.table_1_annual_sales";
+
+  async function renderTable1(rows: Record<string, unknown>[]) {
+    const templateJson = loadTemplateJson(TEMPLATE_JSON_PATH);
+    expect(templateJson.tablePlans?.tables[LAYOUT_KEY]).toBeDefined();
+    const mapped = mapOutputToTemplate(output, templateJson, { psurCadence: "Annually" });
+    const section = mapped.sections.find((s) => s.sectionKey === SECTION_KEY)!;
+    section.tables[LAYOUT_KEY] = { layoutKey: LAYOUT_KEY, title: "Table 1 \u2014 Annual Sales", rows };
+    return documentTexts(await renderFormDocx(mapped, templateJson));
+  }
+
+  it("renders the merged header rows of the plan", async () => {
+    if (!existsSync(TEMPLATE_JSON_PATH)) return;
+    const { xml, texts } = await renderTable1([
+      {
+        region: "EEA+TR+XI",
+        preceding_period_1: "1010",
+        preceding_period_2: "1020",
+        preceding_period_3: "1030",
+        current_data_collection_period: "1040",
+        percent_of_global_sales: "61%",
+      },
+    ]);
+
+    // "Preceding 12-Month Periods" spans the three preceding-period columns.
+    const spanned = xml.indexOf("Preceding 12-Month Periods");
+    expect(spanned).toBeGreaterThan(-1);
+    const cellStart = xml.lastIndexOf("<w:tc>", spanned);
+    expect(xml.slice(cellStart, spanned)).toContain('<w:gridSpan w:val="3"/>');
+    expect(xml).toContain("<w:tblHeader/>");
+
+    const header = texts.indexOf("Preceding 12-Month Periods");
+    expect(texts.slice(header - 1, header + 3)).toEqual([
+      "Region",
+      "Preceding 12-Month Periods",
+      "Current Data Collection Period",
+      "% of Global Sales",
+    ]);
+    const row = texts.indexOf("EEA+TR+XI");
+    expect(row).toBeGreaterThan(header);
+    expect(texts.slice(row, row + 6)).toEqual(["EEA+TR+XI", "1010", "1020", "1030", "1040", "61%"]);
+  });
+
+  it("falls back to row order when row keys do not match the plan's columns", async () => {
+    if (!existsSync(TEMPLATE_JSON_PATH)) return;
+    const { texts } = await renderTable1([
+      { Region: "Worldwide", "Period 1": "2010", "Period 2": "2020", "Period 3": "2030", Current: "2040", Share: "39%" },
+    ]);
+
+    const row = texts.indexOf("Worldwide");
+    expect(row).toBeGreaterThan(-1);
+    expect(texts.slice(row, row + 6)).toEqual(["Worldwide", "2010", "2020", "2030", "2040", "39%"]);
+  });
+
+  it("prefers keyed values over position when both are present", async () => {
+    if (!existsSync(TEMPLATE_JSON_PATH)) return;
+    const { texts } = await renderTable1([
+      {
+        percent_of_global_sales: "12%",
+        region: "Japan",
+        current_data_collection_period: "3040",
+        preceding_period_3: "3030",
+        preceding_period_2: "3020",
+        preceding_period_1: "3010",
+      },
+    ]);
+
+    const row = texts.indexOf("Japan");
+    expect(texts.slice(row, row + 6)).toEqual(["Japan", "3010", "3020", "3030", "3040", "12%"]);
+  });
+});
+
 // ── Integration: renderWithTemplate schema dispatch ─────────────────
 
 describe("renderWithTemplate (form dispatch)", () => {
@@ -2,7 +2,11 @@
  * Template Schema Rendering — Unit Tests
  *
  * Tests:
- *   - template_loader.ts: loadTemplateJson parses valid JSON, rejects invalid
+ *   - template_loader.ts: loadTemplateJson parses valid JSON, rejects invalid,
+ *     attaches template_pack files only when generated from the same bytes,
+ *     ignores invalid ones and parses each once across loads
+ *   - qa_audit.ts: sectionFieldCounts reads the field index summary, with a
+ *     schema-derived fallback that gives the same counts
  *   - output_to_template_mapper.ts: maps PSUROutput → MappedPSUR correctly
  *   - psur_schema_docx.ts: renders MappedPSUR to valid DOCX buffer
  *   - renderer.ts: renderWithTemplate dispatches to schema path when templateJsonPath set
@@ -11,9 +15,10 @@
 import { describe, it, expect, vi } from "vitest";
 import path from "path";
 import { fileURLToPath } from "url";
-import { existsSync } from "fs";
+import { cpSync, existsSync, mkdirSync, readFileSync, rmSync, writeFileSync } from "fs";
 
 import { loadTemplateJson } from "../../src/templates/template_loader.js";
+import { sectionFieldCounts } from "../../src/agents/tasks/qa_audit.js";
 import { mapOutputToTemplate } from "../../src/templates/output_to_template_mapper.js";
 import { renderSchemaDocx } from "../../src/document/renderers/psur_schema_docx.js";
 import { TEMPLATE_SECTION_ORDER } from "../../src/templates/template_schema.js";
@@ -23,6 +28,7 @@ import type { TemplateJson } from "../../src/templates/template_schema.js";
 const __dirname = path.dirname(fileURLToPath(import.meta.url));
 const ROOT_DIR = path.resolve(__dirname, "..", "..");
 const TEMPLATE_JSON_PATH = path.join(ROOT_DIR, "template.json");
+const TEMP_ROOT = path.resolve(__dirname, "..", ".tmp_schema_render_test");
 
 // ── Test Data ───────────────────────────────────────────────────────
 
@@ -153,6 +159,84 @@ describe("loadTemplateJson", () => {
     expect(table.merged_cells!.length).toBeGreaterThanOrEqual(2);
     expect(table.merged_cells![0].label).toBe("Preceding 12-Month Periods");
   });
+
+  it("attaches the template_pack files generated from this template.json", () => {
+    if (!existsSync(TEMPLATE_JSON_PATH)) return;
+    const result = loadTemplateJson(TEMPLATE_JSON_PATH);
+    expect(result.flat).toBeDefined();
+    expect(result.fieldIndex).toBeDefined();
+    expect(result.tablePlans).toBeDefined();
+    expect(result.decisionTables).toBeDefined();
+  });
+
+  it("ignores template_pack files when template.json changed but meta did not", () => {
+    if (!existsSync(TEMPLATE_JSON_PATH)) return;
+    const dir = path.join(TEMP_ROOT, "edited");
+    mkdirSync(dir, { recursive: true });
+    cpSync(path.join(ROOT_DIR, "template_pack"), path.join(dir, "template_pack"), { recursive: true });
+    const edited = JSON.parse(readFileSync(TEMPLATE_JSON_PATH, "utf-8"));
+    edited.layout.tables["C.table_1_annual_sales"].header_rows = 2;
+    writeFileSync(path.join(dir, "template.json"), JSON.stringify(edited, null, 2));
+
+    try {
+      const result = loadTemplateJson(path.join(dir, "template.json"));
+      expect(result.meta.revision).toBe("C");
+      expect(result.flat).toBeUndefined();
+      expect(result.fieldIndex).toBeUndefined();
+      expect(result.tablePlans).toBeUndefined();
+      expect(result.decisionTables).toBeUndefined();
+    } finally {
+      rmSync(TEMP_ROOT, { recursive: true, force: true });
+    }
+  });
+
+  it("ignores a structurally invalid template_pack file instead of throwing", () => {
+    if (!existsSync(TEMPLATE_JSON_PATH)) return;
+    const dir = path.join(TEMP_ROOT, "invalid");
+    mkdirSync(dir, { recursive: true });
+    cpSync(path.join(ROOT_DIR, "template_pack"), path.join(dir, "template_pack"), { recursive: true });
+    cpSync(TEMPLATE_JSON_PATH, path.join(dir, "template.json"));
+    writeFileSync(path.join(dir, "template_pack", "field_index.json"), "{}");
+    writeFileSync(path.join(dir, "template_pack", "table_plans.json"), "{not json");
+
+    try {
+      const result = loadTemplateJson(path.join(dir, "template.json"));
+      expect(result.fieldIndex).toBeUndefined();
+      expect(result.tablePlans).toBeUndefined();
+      expect(result.flat).toBeDefined();
+    } finally {
+      rmSync(TEMP_ROOT, { recursive: true, force: true });
+    }
+  });
+
+  it("parses each template_pack file once across loads", () => {
+    if (!existsSync(TEMPLATE_JSON_PATH)) return;
+    const first = loadTemplateJson(TEMPLATE_JSON_PATH);
+    const second = loadTemplateJson(TEMPLATE_JSON_PATH);
+    expect(second.flat).toBeDefined();
+    expect(second.flat).toBe(first.flat);
+    expect(second.tablePlans).toBe(first.tablePlans);
+  });
+});
+
+describe("sectionFieldCounts", () => {
+  it("reads required leaves and tables from the field index summary", () => {
+    if (!existsSync(TEMPLATE_JSON_PATH)) return;
+    const templateJson = loadTemplateJson(TEMPLATE_JSON_PATH);
+    const counts = sectionFieldCounts(templateJson);
+    expect(Object.keys(counts)).toEqual([...TEMPLATE_SECTION_ORDER]);
+    expect(counts.B_scope_and_device_description).toEqual({ fields: 27, tables: 3 });
+    expect(counts.C_volume_of_sales_and_population_exposure).toEqual({ fields: 7, tables: 2 });
+    expect(counts.G_information_from_trend_reporting).toEqual({ fields: 5, tables: 1 });
+    expect(counts.M_findings_and_conclusions).toEqual({ fields: 3, tables: 0 });
+  });
+
+  it("derives the same counts from the schema when the field index is missing", () => {
+    if (!existsSync(TEMPLATE_JSON_PATH)) return;
+    const templateJson = loadTemplateJson(TEMPLATE_JSON_PATH);
+    const { fieldIndex: _fieldIndex, ...withoutIndex } = templateJson;
+    expect(sectionFieldCounts(withoutIndex as TemplateJson)).toEqual(sectionFieldCounts(templateJson));
+  });
 });
 
 // ── Output → Template Mapper Tests ──────────────────────────────────